@@ -6,7 +6,6 @@ Handles document analysis and field extraction using AWS Textract
 import json
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import os
 import boto3
 from botocore.exceptions import ClientError
 import trp.trp2 as t2
@@ -16,7 +15,7 @@ from models.document import Document
 from services.database_service import DatabaseService
 from services.storage_service import StorageService
 from services.textract_service import TextractService
-from config.document_config import DocumentConfig
+from config.document_config import get_document_config
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -35,7 +34,7 @@ class DataExtractionAgent:
         self.db_service = DatabaseService()
         self.storage_service = StorageService()
         self.textract_service = TextractService()
-        self.document_config = DocumentConfig()
+        self.document_config = get_document_config()
         
     async def extract_document_data(
         self, 
@@ -70,6 +69,14 @@ class DataExtractionAgent:
             if not document:
                 raise Exception(f"Document not found: {document_id}")
             
+            # Reuse the extraction of a byte-identical upload instead of calling Textract
+            if document.get("content_sha256"):
+                cloned_count = await self.db_service.clone_extracted_data_by_hash(document_id)
+                if cloned_count:
+                    return await self._complete_reused_extraction(
+                        document_id, application_id, cloned_count, start_time
+                    )
+            
             # Step 2: Get document from local storage
             file_result = await self.storage_service.get_local_file(document["storage_path"])
             if not file_result["success"]:
@@ -172,7 +179,7 @@ class DataExtractionAgent:
                 "failed", 
                 error_msg,
                 processing_time_ms=int(processing_time),
-                error_details={"exception": str(e)}
+                error_details={"code": type(e).__name__, "exception": str(e)}
             )
             
             await self.db_service.update_document_status(
@@ -188,6 +195,55 @@ class DataExtractionAgent:
                 "document_id": document_id
             }
     
+    async def _refresh_field_summary(self, application_id: str):
+        """Rebuild the application's field summary; on failure drop it so the next status read rebuilds it"""
+        try:
+            await self.db_service.refresh_field_summary(application_id)
+        except Exception as e:
+            logger.warning(f"Field summary refresh failed for {application_id}: {str(e)}")
+            try:
+                await self.db_service.invalidate_field_summary(application_id)
+            except Exception as invalidate_error:
+                logger.error(f"Failed to invalidate field summary for {application_id}: {str(invalidate_error)}")
+    
+    async def _complete_reused_extraction(
+        self, 
+        document_id: str, 
+        application_id: str, 
+        cloned_count: int, 
+        start_time: datetime
+    ) -> Dict[str, Any]:
+        """Finish a document whose extracted data was cloned from an identical upload"""
+        logger.info(f"Reused extraction for duplicate document {document_id} ({cloned_count} records)")
+        
+        await self._refresh_field_summary(application_id)
+        
+        await self.db_service.create_document_job({
+            "application_id": application_id,
+            "document_id": document_id,
+            "job_type": "validation",
+            "status": "pending",
+            "priority": 3
+        })
+        
+        processing_time = (datetime.now() - start_time).total_seconds() * 1000
+        await self._log_processing_step(
+            application_id, 
+            document_id,
+            "document_analysis", 
+            "completed", 
+            f"Reused extraction of an identical upload ({cloned_count} records)",
+            processing_time_ms=int(processing_time)
+        )
+        
+        return {
+            "success": True,
+            "document_id": document_id,
+            "extracted_fields_count": cloned_count,
+            "reused_extraction": True,
+            "processing_time_ms": int(processing_time)
+        }
+    
     async def _analyze_document_with_textract(
         self, 
         file_content: bytes, 
@@ -198,19 +254,11 @@ class DataExtractionAgent:
     ) -> Dict[str, Any]:
         """Analyze document with AWS Textract using temporary S3 upload"""
         try:
-            # Step 1: Create temporary file and upload to S3 for Textract
-            import tempfile
-            with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{filename}") as temp_file:
-                temp_file.write(file_content)
-                temp_file_path = temp_file.name
-            
-            s3_upload_result = await self.storage_service.upload_to_s3_temporary(
-                temp_file_path, filename
+            # Step 1: Upload the content we already hold to S3 for Textract
+            s3_upload_result = await self.storage_service.upload_bytes_to_s3_temporary(
+                file_content, self.storage_service.temporary_s3_key(filename)
             )
             
-            # Clean up temporary file
-            os.unlink(temp_file_path)
-            
             if not s3_upload_result["success"]:
                 return {
                     "success": False,
@@ -611,29 +659,41 @@ class DataExtractionAgent:
             
             logger.info(f"=== STORE DEBUG: Document found: {document} ===")
             
-            # Calculate statistics
-            field_count = len(extracted_fields)
-            confidences = [field.get("confidence", 0.0) for field in extracted_fields]
-            average_confidence = sum(confidences) / len(confidences) if confidences else 0.0
-            
-            # Create a single record with all fields stored as JSONB
-            extracted_data_record = {
-                "document_id": document_id,
-                "application_id": application_id,
-                "document_type": document["document_type"],
-                "extracted_fields": extracted_fields,  # Store as JSONB
-                "field_count": field_count,
-                "average_confidence": average_confidence,
-                "extraction_method": "textract_form",
-                "raw_response": raw_response,  # Store as JSONB
-                "page_number": 1,  # Default for non-mortgage applications
-                "agent_version": "1.0"
-            }
-            
-            logger.info(f"=== STORE DEBUG: About to create extracted data record: {extracted_data_record} ===")
-            result = await self.db_service.create_extracted_data(extracted_data_record)
-            logger.info(f"=== STORE DEBUG: Stored {field_count} extracted fields for document {document_id}, result: {result} ===")
-            return [{"id": result, "field_count": field_count}]
+            if isinstance(raw_response, list):
+                # Page-by-page results: one record per page, written in a single insert
+                records = [
+                    self._build_extracted_data_record(
+                        document_id,
+                        application_id,
+                        document["document_type"],
+                        [field for field in extracted_fields if field.get("page_number") == page["page_number"]],
+                        [page],
+                        page["page_number"]
+                    )
+                    for page in raw_response
+                ]
+                logger.info(f"=== STORE DEBUG: About to create {len(records)} page extracted data records ===")
+                record_ids = await self.db_service.create_extracted_data_bulk(records)
+            else:
+                records = [
+                    self._build_extracted_data_record(
+                        document_id,
+                        application_id,
+                        document["document_type"],
+                        extracted_fields,
+                        raw_response,
+                        1  # Default for non-mortgage applications
+                    )
+                ]
+                logger.info(f"=== STORE DEBUG: About to create extracted data record: {records[0]} ===")
+                record_ids = [await self.db_service.create_extracted_data(records[0])]
+            
+            await self._refresh_field_summary(application_id)
+            logger.info(f"=== STORE DEBUG: Stored {len(extracted_fields)} extracted fields for document {document_id}, result: {record_ids} ===")
+            return [
+                {"id": record_id, "field_count": record["field_count"]}
+                for record_id, record in zip(record_ids, records)
+            ]
             
         except Exception as e:
             logger.error(f"=== STORE DEBUG: Error storing extracted data: {str(e)} ===")
@@ -641,6 +701,30 @@ class DataExtractionAgent:
             logger.error(f"=== STORE DEBUG: Traceback: {traceback.format_exc()} ===")
             return []
     
+    @staticmethod
+    def _build_extracted_data_record(
+        document_id: str,
+        application_id: str,
+        document_type: str,
+        extracted_fields: List[Dict[str, Any]],
+        raw_response: Any,
+        page_number: int
+    ) -> Dict[str, Any]:
+        """Build an extracted_data record with all fields stored as JSONB"""
+        confidences = [field.get("confidence", 0.0) for field in extracted_fields]
+        return {
+            "document_id": document_id,
+            "application_id": application_id,
+            "document_type": document_type,
+            "extracted_fields": extracted_fields,  # Store as JSONB
+            "field_count": len(extracted_fields),
+            "average_confidence": sum(confidences) / len(confidences) if confidences else 0.0,
+            "extraction_method": "textract_form",
+            "raw_response": raw_response,  # Store as JSONB
+            "page_number": page_number,
+            "agent_version": "1.0"
+        }
+    
     async def _log_processing_step(
         self, 
         application_id: str, 
@@ -8,6 +8,7 @@ from decimal import Decimal
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from difflib import SequenceMatcher
+import orjson
 
 from models.validation_result import ValidationResult
 from models.extracted_data import ExtractedData
@@ -166,7 +167,7 @@ class DataValidationAgent:
                 "failed", 
                 error_msg,
                 processing_time_ms=int(processing_time),
-                error_details={"exception": str(e)}
+                error_details={"code": type(e).__name__, "exception": str(e)}
             )
             
             logger.error(f"Data validation error: {error_msg}")
@@ -183,9 +184,8 @@ class DataValidationAgent:
         for data in extracted_data:
             # Parse the extracted_fields JSON array
             if 'extracted_fields' in data and data['extracted_fields']:
-                import json
                 if isinstance(data['extracted_fields'], str):
-                    fields = json.loads(data['extracted_fields'])
+                    fields = orjson.loads(data['extracted_fields'])
                 else:
                     fields = data['extracted_fields']
                 
@@ -3,7 +3,9 @@ Document Ingestion Agent
 Handles document upload, validation, and initial processing setup
 """
 
+import os
 import uuid
+import hashlib
 import mimetypes
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
@@ -17,11 +19,14 @@ from models.document_job import DocumentJob
 from services.database_service import DatabaseService
 from services.storage_service import StorageService
 from services.textract_service import TextractService
-from config.document_config import DocumentConfig
+from config.document_config import get_document_config
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Upper bound on documents ingested at once across all batches in this process
+INGEST_CONCURRENCY = int(os.getenv("INGEST_CONCURRENCY", "8"))
+
 class DocumentIngestionAgent:
     """
     Agent responsible for:
@@ -36,9 +41,10 @@ class DocumentIngestionAgent:
         self.db_service = DatabaseService()
         self.storage_service = StorageService()
         self.textract_service = TextractService()
-        self.document_config = DocumentConfig()
+        self.document_config = get_document_config()
         self.supported_formats = ['.pdf', '.png', '.jpg', '.jpeg', '.tiff', '.tif']
         self.max_file_size = 50 * 1024 * 1024  # 50MB
+        self._ingestion_semaphore = asyncio.Semaphore(INGEST_CONCURRENCY)
         
     async def process_document_upload(
         self, 
@@ -122,6 +128,7 @@ class DocumentIngestionAgent:
                 "file_size": len(file_content),
                 "mime_type": mimetypes.guess_type(filename)[0],
                 "storage_path": storage_path,
+                "content_sha256": hashlib.sha256(file_content).hexdigest(),
                 "upload_status": "uploaded",
                 "processing_status": "pending",
                 "meta_data": {
@@ -131,26 +138,29 @@ class DocumentIngestionAgent:
                 }
             }
             
-            logger.info(f"About to create document with data: {document_data}")
-            document_record_id = await self.db_service.create_document(document_data)
-            logger.info(f"Document created successfully with ID: {document_record_id}")
-            
-            # Step 6: Create extraction job
-            job_data = {
-                "application_id": application_id,
-                "document_id": document_record_id,
-                "job_type": "extraction",
-                "status": "pending",
-                "priority": self._get_job_priority(document_type)
-            }
-            
-            await self.db_service.create_document_job(job_data)
-            
-            # Step 7: Update application status
-            await self.db_service.update_application_status(
-                application_id, 
-                "processing"
-            )
+            # Steps 5-7 share one transaction so a failed step leaves no orphaned rows
+            async with self.db_service.transaction() as session:
+                logger.info(f"About to create document with data: {document_data}")
+                document_record_id = await self.db_service.create_document(document_data, session=session)
+                logger.info(f"Document created successfully with ID: {document_record_id}")
+                
+                # Step 6: Create extraction job
+                job_data = {
+                    "application_id": application_id,
+                    "document_id": document_record_id,
+                    "job_type": "extraction",
+                    "status": "pending",
+                    "priority": self._get_job_priority(document_type)
+                }
+                
+                await self.db_service.create_document_job(job_data, session=session)
+                
+                # Step 7: Update application status
+                await self.db_service.update_application_status(
+                    application_id, 
+                    "processing",
+                    session=session
+                )
             
             processing_time = (datetime.now() - start_time).total_seconds() * 1000
             
@@ -180,7 +190,7 @@ class DocumentIngestionAgent:
                 "failed", 
                 error_msg,
                 processing_time_ms=int(processing_time),
-                error_details={"exception": str(e)}
+                error_details={"code": type(e).__name__, "exception": str(e)}
             )
             
             logger.error(f"Document ingestion error: {error_msg}")
@@ -217,25 +227,38 @@ class DocumentIngestionAgent:
                 f"Processing {len(files)} documents"
             )
             
-            results = []
             successful_uploads = 0
             failed_uploads = 0
             
-            # Process files concurrently (with limit)
-            semaphore = asyncio.Semaphore(5)  # Max 5 concurrent uploads
-            
-            async def process_single_file(file_data):
-                async with semaphore:
-                    file_content, filename = file_data
-                    logger.info(f"Processing single file: {filename}")
-                    result = await self.process_document_upload(
-                        file_content, filename, application_id, applicant_type
-                    )
-                    logger.info(f"File {filename} processing result: {result}")
-                    return result
-            
-            tasks = [process_single_file(file_data) for file_data in files]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            # A fixed set of workers drains the queue so later files start as soon
+            # as a slot frees up; the shared semaphore caps ingestion process-wide
+            queue: asyncio.Queue = asyncio.Queue()
+            for index, file_data in enumerate(files):
+                queue.put_nowait((index, file_data))
+            results: List[Any] = [None] * len(files)
+            
+            async def worker():
+                while True:
+                    index, (file_content, filename) = await queue.get()
+                    try:
+                        async with self._ingestion_semaphore:
+                            logger.info(f"Processing single file: {filename}")
+                            results[index] = await self.process_document_upload(
+                                file_content, filename, application_id, applicant_type
+                            )
+                            logger.info(f"File {filename} processing result: {results[index]}")
+                    except Exception as e:
+                        results[index] = e
+                    finally:
+                        queue.task_done()
+            
+            workers = [asyncio.create_task(worker()) for _ in range(min(INGEST_CONCURRENCY, len(files)))]
+            try:
+                await queue.join()
+            finally:
+                for worker_task in workers:
+                    worker_task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
             
             # Process results
             for result in results:
@@ -276,7 +299,7 @@ class DocumentIngestionAgent:
                 "failed", 
                 error_msg,
                 processing_time_ms=int(processing_time),
-                error_details={"exception": str(e)}
+                error_details={"code": type(e).__name__, "exception": str(e)}
             )
             
             logger.error(f"Batch ingestion error: {error_msg}")
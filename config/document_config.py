@@ -4,9 +4,105 @@ Defines document types, queries, and field mappings for AWS Textract
 Uses YAML configuration for easy maintenance
 """
 
-from typing import Dict, List, Any
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Any, FrozenSet, Mapping, Optional, Tuple
 from .yaml_config import YAMLConfigLoader
 
+_CONFIG_FILES = (
+    Path(__file__).parent / "documents.yaml",
+    Path(__file__).parent / "field_mapping.yaml"
+)
+
+
+@dataclass(frozen=True)
+class CompiledDocumentConfig:
+    """Application-independent structures derived once from the document YAML config"""
+    config_hash: str
+    all_possible_fields: FrozenSet[str]
+    field_to_documents: Mapping[str, Tuple[Dict[str, Any], ...]]
+    required_template: Tuple[Dict[str, Any], ...]
+    mandatory_types: FrozenSet[str]
+
+
+_compiled_config: Optional[CompiledDocumentConfig] = None
+_compiled_config_mtimes: Optional[Tuple[int, ...]] = None
+
+
+def _config_mtimes() -> Tuple[int, ...]:
+    """Get modification times of the YAML config files (0 for a missing file)"""
+    return tuple(path.stat().st_mtime_ns if path.exists() else 0 for path in _CONFIG_FILES)
+
+
+def _config_hash() -> str:
+    """Fingerprint the YAML config files by content"""
+    digest = hashlib.md5()
+    for path in _CONFIG_FILES:
+        if path.exists():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _compile_document_config(config_hash: str) -> CompiledDocumentConfig:
+    """Parse the YAML config and precompute the field/document lookup structures"""
+    document_types = YAMLConfigLoader().get_document_types()
+    
+    field_to_documents: Dict[str, List[Dict[str, Any]]] = {}
+    required_template = []
+    mandatory_types = set()
+    
+    for doc_type, config in document_types.items():
+        display_name = config.get('display_name', doc_type)
+        is_mandatory = config.get('mandatory_for_applicant', False)
+        queries = config.get('field_extraction', {}).get('queries', [])
+        available_fields = [query.get('alias') for query in queries if query.get('alias')]
+        
+        for field_name in available_fields:
+            field_to_documents.setdefault(field_name, []).append({
+                'document_type': doc_type,
+                'display_name': display_name,
+                'priority': 'high' if is_mandatory else 'medium'
+            })
+        
+        if is_mandatory:
+            mandatory_types.add(doc_type)
+            required_template.append({
+                "document_type": doc_type,
+                "display_name": display_name,
+                "available_fields": available_fields,
+                "description": config.get('description', ''),
+                "file_types": config.get('accepted_file_types', ['.pdf', '.jpg', '.png'])
+            })
+    
+    return CompiledDocumentConfig(
+        config_hash=config_hash,
+        all_possible_fields=frozenset(field_to_documents),
+        # High-priority documents first so callers can check docs[0] instead of scanning
+        field_to_documents={
+            name: tuple(sorted(docs, key=lambda doc: doc['priority'] != 'high'))
+            for name, docs in field_to_documents.items()
+        },
+        required_template=tuple(required_template),
+        mandatory_types=frozenset(mandatory_types)
+    )
+
+
+def get_compiled_document_config() -> CompiledDocumentConfig:
+    """Get the compiled document config, re-parsing only when the YAML content changes"""
+    global _compiled_config, _compiled_config_mtimes
+    
+    mtimes = _config_mtimes()
+    if _compiled_config is not None and mtimes == _compiled_config_mtimes:
+        return _compiled_config
+    
+    config_hash = _config_hash()
+    if _compiled_config is None or config_hash != _compiled_config.config_hash:
+        _compiled_config = _compile_document_config(config_hash)
+    _compiled_config_mtimes = mtimes
+    return _compiled_config
+
+
 class DocumentConfig:
     """Configuration for document processing"""
     
@@ -133,4 +229,19 @@ class DocumentConfig:
     
     def reload_config(self):
         """Reload configuration from YAML file"""
-        self.yaml_loader.reload_config()
\ No newline at end of file
+        self.yaml_loader.reload_config()
+
+
+_document_config: Optional[DocumentConfig] = None
+_document_config_hash: Optional[str] = None
+
+
+def get_document_config() -> DocumentConfig:
+    """Get the shared DocumentConfig, rebuilt only when the YAML content changes"""
+    global _document_config, _document_config_hash
+    
+    config_hash = get_compiled_document_config().config_hash
+    if _document_config is None or config_hash != _document_config_hash:
+        _document_config = DocumentConfig()
+        _document_config_hash = config_hash
+    return _document_config
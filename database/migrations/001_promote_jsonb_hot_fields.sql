@@ -0,0 +1,52 @@
+-- =====================================================
+-- 001: PROMOTE HOT JSONB SUBFIELDS TO TYPED COLUMNS
+-- =====================================================
+--
+-- Adds scalar columns for the values that are read on every row so
+-- readers no longer have to fetch and decompress raw_response /
+-- error_details. Safe to re-run.
+--
+-- =====================================================
+
+ALTER TABLE extracted_data
+    ADD COLUMN IF NOT EXISTS raw_response_block_count INTEGER,
+    ADD COLUMN IF NOT EXISTS raw_response_page_count INTEGER;
+
+ALTER TABLE processing_logs
+    ADD COLUMN IF NOT EXISTS error_code VARCHAR(64),
+    ADD COLUMN IF NOT EXISTS error_stack_hash CHAR(16);
+
+-- Backfill extracted_data. Single-document responses are a Textract object;
+-- page-by-page mortgage responses are an array of {page_number, results}.
+UPDATE extracted_data
+SET raw_response_block_count = jsonb_array_length(raw_response -> 'Blocks'),
+    raw_response_page_count = jsonb_extract_path_text(raw_response, 'DocumentMetadata', 'Pages')::integer
+WHERE raw_response_block_count IS NULL
+  AND jsonb_typeof(raw_response) = 'object'
+  AND jsonb_typeof(raw_response -> 'Blocks') = 'array';
+
+UPDATE extracted_data ed
+SET raw_response_block_count = pages.block_count,
+    raw_response_page_count = pages.page_count
+FROM (
+    SELECT e.id,
+           SUM(jsonb_array_length(COALESCE(p -> 'results' -> 'Blocks', '[]'::jsonb))) AS block_count,
+           COUNT(*) AS page_count
+    FROM extracted_data e
+    CROSS JOIN LATERAL jsonb_array_elements(e.raw_response) p
+    WHERE jsonb_typeof(e.raw_response) = 'array'
+    GROUP BY e.id
+) pages
+WHERE ed.id = pages.id
+  AND ed.raw_response_block_count IS NULL;
+
+-- Backfill processing_logs and strip the promoted key from the JSONB remainder
+UPDATE processing_logs
+SET error_code = jsonb_extract_path_text(error_details, 'code'),
+    error_stack_hash = substr(md5(
+        COALESCE(jsonb_extract_path_text(error_details, 'code'), '') || ':' ||
+        COALESCE(jsonb_extract_path_text(error_details, 'exception'), '')
+    ), 1, 16),
+    error_details = error_details - 'code'
+WHERE error_details IS NOT NULL
+  AND error_stack_hash IS NULL;
@@ -0,0 +1,20 @@
+-- =====================================================
+-- 002: PARTIAL INDEXES FOR HOT FILTER PREDICATES
+-- =====================================================
+--
+-- Replaces full-column status/flag indexes with partial indexes that
+-- only cover the rows the queue poller and review dashboards read.
+-- Safe to re-run.
+--
+-- =====================================================
+
+-- Job queue poll: WHERE status = 'pending' ORDER BY priority, created_at
+CREATE INDEX IF NOT EXISTS idx_document_jobs_pending ON document_jobs(priority, created_at) WHERE status = 'pending';
+DROP INDEX IF EXISTS idx_document_jobs_status;
+
+-- Review dashboard: flagged validation results per application
+CREATE INDEX IF NOT EXISTS idx_validation_results_flagged ON validation_results(application_id) WHERE flag_for_review = TRUE;
+DROP INDEX IF EXISTS idx_validation_results_flag_review;
+
+-- Failure triage: failed log entries per application
+CREATE INDEX IF NOT EXISTS idx_processing_logs_failed ON processing_logs(application_id, created_at) WHERE status = 'failed';
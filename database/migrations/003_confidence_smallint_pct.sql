@@ -0,0 +1,28 @@
+-- =====================================================
+-- 003: STORE CONFIDENCE AS SMALLINT PERCENT (0-100)
+-- =====================================================
+--
+-- Confidence values are bounded 0-1 at two-digit resolution, so they
+-- are stored as fixed-width SMALLINT percentages instead of NUMERIC.
+-- Safe to re-run.
+--
+-- =====================================================
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_name = 'documents' AND column_name = 'confidence') THEN
+        ALTER TABLE documents RENAME COLUMN confidence TO confidence_pct;
+        ALTER TABLE documents ALTER COLUMN confidence_pct DROP DEFAULT;
+        ALTER TABLE documents ALTER COLUMN confidence_pct TYPE SMALLINT USING round(confidence_pct * 100)::smallint;
+        ALTER TABLE documents ALTER COLUMN confidence_pct SET DEFAULT 0;
+    END IF;
+
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_name = 'extracted_data' AND column_name = 'average_confidence') THEN
+        ALTER TABLE extracted_data RENAME COLUMN average_confidence TO average_confidence_pct;
+        ALTER TABLE extracted_data ALTER COLUMN average_confidence_pct DROP DEFAULT;
+        ALTER TABLE extracted_data ALTER COLUMN average_confidence_pct TYPE SMALLINT USING round(average_confidence_pct * 100)::smallint;
+        ALTER TABLE extracted_data ALTER COLUMN average_confidence_pct SET DEFAULT 0;
+    END IF;
+END $$;
@@ -0,0 +1,27 @@
+-- =====================================================
+-- 004: SINGLE-CHARACTER DOCUMENT JOB STATUS CODES
+-- =====================================================
+--
+-- document_jobs.status becomes CHAR(1): 'P'ending, p'R'ocessing,
+-- 'C'ompleted, 'F'ailed. DatabaseService translates to and from the
+-- status names at the query boundary. Safe to re-run.
+--
+-- =====================================================
+
+DROP INDEX IF EXISTS idx_document_jobs_pending;
+
+ALTER TABLE document_jobs ALTER COLUMN status DROP DEFAULT;
+
+ALTER TABLE document_jobs ALTER COLUMN status TYPE CHAR(1) USING (
+    CASE status
+        WHEN 'pending' THEN 'P'
+        WHEN 'processing' THEN 'R'
+        WHEN 'completed' THEN 'C'
+        WHEN 'failed' THEN 'F'
+        ELSE left(status, 1)
+    END
+);
+
+ALTER TABLE document_jobs ALTER COLUMN status SET DEFAULT 'P';
+
+CREATE INDEX IF NOT EXISTS idx_document_jobs_pending ON document_jobs(priority, created_at) WHERE status = 'P';
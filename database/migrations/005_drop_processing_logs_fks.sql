@@ -0,0 +1,14 @@
+-- =====================================================
+-- 005: DROP FOREIGN KEYS ON PROCESSING_LOGS
+-- =====================================================
+--
+-- processing_logs is an append-only audit table; its foreign keys add
+-- a referential check to every insert and can fail a processing step
+-- just for logging it. Integrity is kept by the writing agents.
+-- Safe to re-run.
+--
+-- =====================================================
+
+ALTER TABLE processing_logs
+    DROP CONSTRAINT IF EXISTS processing_logs_application_id_fkey,
+    DROP CONSTRAINT IF EXISTS processing_logs_document_id_fkey;
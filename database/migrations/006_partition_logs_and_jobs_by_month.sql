@@ -0,0 +1,122 @@
+-- =====================================================
+-- 006: PARTITION PROCESSING_LOGS AND DOCUMENT_JOBS BY MONTH
+-- =====================================================
+--
+-- Rebuilds both tables as RANGE (created_at) partitioned tables with
+-- one partition per month plus a DEFAULT partition, so indexes stay at
+-- working-set size and old months can be detached for archival.
+-- Existing rows are copied into per-month partitions. Safe to re-run.
+--
+-- =====================================================
+
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(parent_table TEXT, months_ahead INTEGER DEFAULT 2)
+RETURNS VOID AS $$
+DECLARE
+    month_start DATE := date_trunc('month', NOW())::date;
+BEGIN
+    FOR i IN 0..months_ahead LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            parent_table || '_' || to_char(month_start, 'YYYY_MM'),
+            parent_table,
+            month_start,
+            (month_start + INTERVAL '1 month')::date
+        );
+        month_start := (month_start + INTERVAL '1 month')::date;
+    END LOOP;
+END;
+$$ language 'plpgsql';
+
+-- One-off helper: swap an unpartitioned table for a partitioned copy
+CREATE OR REPLACE FUNCTION migrate_to_monthly_partitions(parent_table TEXT)
+RETURNS VOID AS $$
+DECLARE
+    old_table TEXT := parent_table || '_unpartitioned';
+    month_start DATE;
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_partitioned_table pt
+               JOIN pg_class c ON c.oid = pt.partrelid
+               WHERE c.relname = parent_table) THEN
+        RETURN;
+    END IF;
+
+    EXECUTE format('ALTER TABLE %I RENAME TO %I', parent_table, old_table);
+    EXECUTE format('UPDATE %I SET created_at = NOW() WHERE created_at IS NULL', old_table);
+    EXECUTE format(
+        'CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS) PARTITION BY RANGE (created_at)',
+        parent_table, old_table
+    );
+    EXECUTE format('ALTER TABLE %I ALTER COLUMN created_at SET NOT NULL', parent_table);
+    EXECUTE format('ALTER TABLE %I ADD PRIMARY KEY (id, created_at)', parent_table);
+    EXECUTE format('CREATE TABLE %I PARTITION OF %I DEFAULT', parent_table || '_default', parent_table);
+
+    FOR month_start IN EXECUTE format(
+        'SELECT DISTINCT date_trunc(''month'', created_at)::date FROM %I WHERE created_at < date_trunc(''month'', NOW())',
+        old_table
+    ) LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            parent_table || '_' || to_char(month_start, 'YYYY_MM'),
+            parent_table,
+            month_start,
+            (month_start + INTERVAL '1 month')::date
+        );
+    END LOOP;
+    PERFORM ensure_monthly_partitions(parent_table);
+
+    EXECUTE format('INSERT INTO %I SELECT * FROM %I', parent_table, old_table);
+END;
+$$ language 'plpgsql';
+
+-- document_processing_pipeline reads processing_logs; rebuilt below
+DROP VIEW IF EXISTS document_processing_pipeline;
+
+SELECT migrate_to_monthly_partitions('processing_logs');
+SELECT migrate_to_monthly_partitions('document_jobs');
+
+DROP TABLE IF EXISTS processing_logs_unpartitioned;
+DROP TABLE IF EXISTS document_jobs_unpartitioned;
+DROP FUNCTION migrate_to_monthly_partitions(TEXT);
+
+-- LIKE does not copy foreign keys; restore the ones document_jobs had
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'document_jobs_application_id_fkey') THEN
+        ALTER TABLE document_jobs ADD CONSTRAINT document_jobs_application_id_fkey
+            FOREIGN KEY (application_id) REFERENCES applications(application_id);
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'document_jobs_document_id_fkey') THEN
+        ALTER TABLE document_jobs ADD CONSTRAINT document_jobs_document_id_fkey
+            FOREIGN KEY (document_id) REFERENCES documents(id);
+    END IF;
+END $$;
+
+-- Re-create indexes on the partitioned parents (cascades to every partition)
+CREATE INDEX IF NOT EXISTS idx_processing_logs_application_id ON processing_logs(application_id);
+CREATE INDEX IF NOT EXISTS idx_processing_logs_document_id ON processing_logs(document_id);
+CREATE INDEX IF NOT EXISTS idx_processing_logs_agent_name ON processing_logs(agent_name);
+CREATE INDEX IF NOT EXISTS idx_processing_logs_created_at ON processing_logs(created_at);
+CREATE INDEX IF NOT EXISTS idx_processing_logs_failed ON processing_logs(application_id, created_at) WHERE status = 'failed';
+
+CREATE INDEX IF NOT EXISTS idx_document_jobs_application_id ON document_jobs(application_id);
+CREATE INDEX IF NOT EXISTS idx_document_jobs_document_id ON document_jobs(document_id);
+CREATE INDEX IF NOT EXISTS idx_document_jobs_pending ON document_jobs(priority, created_at) WHERE status = 'P';
+CREATE INDEX IF NOT EXISTS idx_document_jobs_priority ON document_jobs(priority);
+
+CREATE OR REPLACE VIEW document_processing_pipeline AS
+SELECT 
+    d.id as document_id,
+    d.application_id,
+    d.filename,
+    d.document_type,
+    d.processing_status,
+    COALESCE(SUM(ed.field_count), 0) as extracted_fields_count,
+    COUNT(DISTINCT vr.id) as validation_results_count,
+    COUNT(DISTINCT gd.id) as golden_data_count,
+    MAX(pl.created_at) as last_processing_activity
+FROM documents d
+LEFT JOIN extracted_data ed ON d.id = ed.document_id
+LEFT JOIN validation_results vr ON d.application_id = vr.application_id
+LEFT JOIN golden_data gd ON d.application_id = gd.application_id
+LEFT JOIN processing_logs pl ON d.id = pl.document_id
+GROUP BY d.id, d.application_id, d.filename, d.document_type, d.processing_status;
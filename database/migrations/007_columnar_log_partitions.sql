@@ -0,0 +1,44 @@
+-- =====================================================
+-- 007: COLUMNAR STORAGE FOR CLOSED PROCESSING_LOGS MONTHS
+-- =====================================================
+--
+-- processing_logs is write-once and then scanned by agent/day for
+-- dashboards. With the Citus extension installed (CREATE EXTENSION
+-- citus), closed monthly partitions are moved to the columnar access
+-- method; without it the function below does nothing. DatabaseService
+-- calls it from the daily partition maintenance. Safe to re-run.
+--
+-- =====================================================
+
+-- Convert closed processing_logs months to columnar storage for analytic scans.
+-- Needs the Citus columnar access method; a no-op on plain PostgreSQL.
+-- Logs are append-only, so closed months never see UPDATE/DELETE.
+CREATE OR REPLACE FUNCTION compress_old_log_partitions(older_than INTERVAL DEFAULT INTERVAL '7 days')
+RETURNS INTEGER AS $$
+DECLARE
+    partition_name TEXT;
+    converted INTEGER := 0;
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_am WHERE amname = 'columnar') THEN
+        RETURN 0;
+    END IF;
+
+    FOR partition_name IN
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        JOIN pg_am am ON am.oid = c.relam
+        WHERE p.relname = 'processing_logs'
+          AND am.amname <> 'columnar'
+          AND c.relname ~ '^processing_logs_[0-9]{4}_[0-9]{2}$'
+          AND to_date(right(c.relname, 7), 'YYYY_MM') + INTERVAL '1 month' < NOW() - older_than
+    LOOP
+        EXECUTE format('ALTER TABLE %I SET ACCESS METHOD columnar', partition_name);
+        converted := converted + 1;
+    END LOOP;
+    RETURN converted;
+END;
+$$ language 'plpgsql';
+
+SELECT compress_old_log_partitions();
@@ -0,0 +1,15 @@
+-- =====================================================
+-- 008: CONTENT HASH ON DOCUMENTS
+-- =====================================================
+--
+-- Stores the SHA-256 of each uploaded file so a byte-identical re-upload
+-- can reuse the earlier extraction instead of calling Textract again.
+-- The index is not unique: the same file may legitimately belong to
+-- several applications. Safe to re-run.
+--
+-- =====================================================
+
+ALTER TABLE documents
+    ADD COLUMN IF NOT EXISTS content_sha256 CHAR(64);
+
+CREATE INDEX IF NOT EXISTS idx_documents_content_sha256 ON documents(content_sha256) WHERE content_sha256 IS NOT NULL;
@@ -0,0 +1,17 @@
+-- =====================================================
+-- 009: MATERIALIZED APPLICATION FIELD SUMMARY
+-- =====================================================
+--
+-- One row per application holding the latest value and source of every
+-- extracted field. The extraction agent rebuilds it after each write so
+-- field status polls no longer flatten extracted_data. Safe to re-run.
+--
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS application_field_summary (
+    application_id VARCHAR(255) PRIMARY KEY REFERENCES applications(application_id),
+    extracted_fields JSONB NOT NULL DEFAULT '{}'::jsonb,
+    field_sources JSONB NOT NULL DEFAULT '{}'::jsonb,
+    total_extracted INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
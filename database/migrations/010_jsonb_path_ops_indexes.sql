@@ -0,0 +1,27 @@
+-- =====================================================
+-- 010: JSONB_PATH_OPS GIN INDEXES FOR CONTAINMENT FILTERS
+-- =====================================================
+--
+-- Replaces the default jsonb_ops GIN indexes on extracted_fields and
+-- golden_fields (each was created twice) with jsonb_path_ops indexes,
+-- and indexes applications/documents meta_data the same way. Any
+-- WHERE col @> '...' filter on these columns can use the index.
+-- jsonb_path_ops only serves @> (not ?, ?| or ?&); nothing queries
+-- key existence. raw_response is left unindexed: it is never filtered
+-- and is the largest value written per extraction.
+--
+-- CONCURRENTLY cannot run inside a transaction block, so apply this
+-- file with autocommit (plain psql -f, not -1). Safe to re-run.
+--
+-- =====================================================
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_extracted_data_fields_path_gin ON extracted_data USING GIN (extracted_fields jsonb_path_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_golden_data_fields_path_gin ON golden_data USING GIN (golden_fields jsonb_path_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_applications_meta_data_path_gin ON applications USING GIN (meta_data jsonb_path_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_documents_meta_data_path_gin ON documents USING GIN (meta_data jsonb_path_ops);
+
+-- The jsonb_ops indexes above are superseded
+DROP INDEX CONCURRENTLY IF EXISTS idx_extracted_data_extracted_fields;
+DROP INDEX CONCURRENTLY IF EXISTS idx_extracted_data_fields_gin;
+DROP INDEX CONCURRENTLY IF EXISTS idx_golden_data_golden_fields;
+DROP INDEX CONCURRENTLY IF EXISTS idx_golden_data_fields_gin;
@@ -0,0 +1,31 @@
+-- =====================================================
+-- 011: COMPOSITE (application_id, <sort column>) INDEXES
+-- =====================================================
+--
+-- The per-application getters filter on application_id and sort on a
+-- timestamp. Widening the single-column application_id indexes to
+-- include that timestamp lets the planner return rows in index order
+-- instead of fetching and sorting them. The old indexes are prefixes
+-- of the new ones and are dropped.
+--
+-- CONCURRENTLY cannot run inside a transaction block, so apply this
+-- file with autocommit (plain psql -f, not -1). document_jobs is
+-- partitioned, and partitioned indexes cannot be built concurrently,
+-- so its index is built normally. Safe to re-run.
+--
+-- =====================================================
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_documents_application_uploaded ON documents(application_id, uploaded_at);
+DROP INDEX CONCURRENTLY IF EXISTS idx_documents_application_id;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_extracted_data_application_extracted ON extracted_data(application_id, extracted_at);
+DROP INDEX CONCURRENTLY IF EXISTS idx_extracted_data_application_id;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_validation_results_application_validated ON validation_results(application_id, validated_at);
+DROP INDEX CONCURRENTLY IF EXISTS idx_validation_results_application_id;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_golden_data_application_created ON golden_data(application_id, created_at);
+DROP INDEX CONCURRENTLY IF EXISTS idx_golden_data_application_id;
+
+CREATE INDEX IF NOT EXISTS idx_document_jobs_application_created ON document_jobs(application_id, created_at);
+DROP INDEX IF EXISTS idx_document_jobs_application_id;
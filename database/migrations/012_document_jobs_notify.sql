@@ -0,0 +1,24 @@
+-- =====================================================
+-- 012: NOTIFY JOB PROCESSORS OF NEW DOCUMENT JOBS
+-- =====================================================
+--
+-- Sends NOTIFY new_job once per INSERT statement on document_jobs so
+-- job processors LISTENing on the channel wake up immediately instead
+-- of waiting for their next poll. Notifications are delivered on
+-- commit, so a processor never wakes before the jobs are visible.
+-- Safe to re-run.
+--
+-- =====================================================
+
+CREATE OR REPLACE FUNCTION notify_new_document_job()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('new_job', '');
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS notify_document_jobs_insert ON document_jobs;
+CREATE TRIGGER notify_document_jobs_insert
+    AFTER INSERT ON document_jobs
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_new_document_job();
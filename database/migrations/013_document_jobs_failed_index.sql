@@ -0,0 +1,13 @@
+-- =====================================================
+-- 013: PARTIAL INDEX FOR FAILED DOCUMENT JOBS
+-- =====================================================
+--
+-- Retry and triage read failed jobs, optionally for one application.
+-- Failed jobs are a small slice of the table, so a partial index keeps
+-- those reads off a scan of every partition. document_jobs is
+-- partitioned, so the index cannot be built CONCURRENTLY.
+-- Safe to re-run.
+--
+-- =====================================================
+
+CREATE INDEX IF NOT EXISTS idx_document_jobs_failed ON document_jobs(application_id, created_at) WHERE status = 'F';
@@ -41,9 +41,10 @@ CREATE TABLE IF NOT EXISTS documents (
     file_size BIGINT,
     mime_type VARCHAR(100),
     storage_path VARCHAR(500),
+    content_sha256 CHAR(64), -- SHA-256 of the uploaded bytes, used to reuse extractions
     upload_status VARCHAR(50) DEFAULT 'uploaded',
     processing_status VARCHAR(50) DEFAULT 'pending',
-    confidence DECIMAL(3,2) DEFAULT 0.0,
+    confidence_pct SMALLINT DEFAULT 0, -- Confidence as 0-100
     uploaded_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     processed_at TIMESTAMP WITH TIME ZONE,
     meta_data JSONB DEFAULT '{}'::jsonb
@@ -60,9 +61,11 @@ CREATE TABLE IF NOT EXISTS extracted_data (
     document_type VARCHAR(100) NOT NULL,
     extracted_fields JSONB NOT NULL DEFAULT '{}'::jsonb, -- All fields as JSON
     field_count INTEGER DEFAULT 0,
-    average_confidence DECIMAL(3,2) DEFAULT 0.0,
+    average_confidence_pct SMALLINT DEFAULT 0, -- Average field confidence as 0-100
     extraction_method VARCHAR(50) DEFAULT 'textract',
     raw_response JSONB, -- Full Textract response
+    raw_response_block_count INTEGER, -- Promoted from raw_response so reads skip the JSONB blob
+    raw_response_page_count INTEGER, -- Promoted from raw_response.DocumentMetadata.Pages
     page_number INTEGER, -- For mortgage applications
     extracted_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     agent_version VARCHAR(20) DEFAULT '1.0'
@@ -116,35 +119,59 @@ CREATE TABLE IF NOT EXISTS golden_data (
 -- =====================================================
 
 CREATE TABLE IF NOT EXISTS processing_logs (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    application_id VARCHAR(255) NOT NULL REFERENCES applications(application_id),
-    document_id UUID REFERENCES documents(id),
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    -- No foreign keys: append-only audit rows, integrity is enforced by the agents that write them
+    application_id VARCHAR(255) NOT NULL,
+    document_id UUID,
     agent_name VARCHAR(50) NOT NULL, -- 'ingestion', 'extraction', 'validation'
     step_name VARCHAR(100) NOT NULL,
     status VARCHAR(20) NOT NULL, -- 'started', 'completed', 'failed', 'skipped'
     message TEXT,
-    error_details JSONB,
+    error_code VARCHAR(64), -- Promoted from error_details.code
+    error_stack_hash CHAR(16), -- Fingerprint of error_code + message for grouping failures
+    error_details JSONB, -- Remaining free-form error context
     processing_time_ms INTEGER,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-);
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- Catch-all for rows outside the monthly partitions created by ensure_monthly_partitions()
+CREATE TABLE IF NOT EXISTS processing_logs_default PARTITION OF processing_logs DEFAULT;
 
 -- =====================================================
 -- 7. DOCUMENT_JOBS TABLE (Queue Management)
 -- =====================================================
 
 CREATE TABLE IF NOT EXISTS document_jobs (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     application_id VARCHAR(255) NOT NULL REFERENCES applications(application_id),
     document_id UUID REFERENCES documents(id),
     job_type VARCHAR(50) NOT NULL, -- 'ingestion', 'extraction', 'validation'
-    status VARCHAR(20) DEFAULT 'pending', -- 'pending', 'processing', 'completed', 'failed'
+    status CHAR(1) DEFAULT 'P', -- 'P'ending, p'R'ocessing, 'C'ompleted, 'F'ailed
     priority INTEGER DEFAULT 5,
     retry_count INTEGER DEFAULT 0,
     max_retries INTEGER DEFAULT 3,
     error_message TEXT,
     started_at TIMESTAMP WITH TIME ZONE,
     completed_at TIMESTAMP WITH TIME ZONE,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE IF NOT EXISTS document_jobs_default PARTITION OF document_jobs DEFAULT;
+
+-- =====================================================
+-- 7b. APPLICATION_FIELD_SUMMARY TABLE (Materialized field status)
+-- =====================================================
+
+-- Latest value and source of every extracted field, rebuilt when extracted_data
+-- is written so status polls read a single row
+CREATE TABLE IF NOT EXISTS application_field_summary (
+    application_id VARCHAR(255) PRIMARY KEY REFERENCES applications(application_id),
+    extracted_fields JSONB NOT NULL DEFAULT '{}'::jsonb, -- field_name -> field data
+    field_sources JSONB NOT NULL DEFAULT '{}'::jsonb, -- field_name -> source document
+    total_extracted INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
 -- =====================================================
@@ -155,37 +182,40 @@ CREATE TABLE IF NOT EXISTS document_jobs (
 CREATE INDEX IF NOT EXISTS idx_applications_application_id ON applications(application_id);
 CREATE INDEX IF NOT EXISTS idx_applications_status ON applications(status);
 CREATE INDEX IF NOT EXISTS idx_applications_created_at ON applications(created_at);
+CREATE INDEX IF NOT EXISTS idx_applications_meta_data_path_gin ON applications USING GIN (meta_data jsonb_path_ops);
 
 -- Documents indexes
-CREATE INDEX IF NOT EXISTS idx_documents_application_id ON documents(application_id);
+CREATE INDEX IF NOT EXISTS idx_documents_application_uploaded ON documents(application_id, uploaded_at);
 CREATE INDEX IF NOT EXISTS idx_documents_document_id ON documents(document_id);
 CREATE INDEX IF NOT EXISTS idx_documents_type_applicant ON documents(document_type, applicant_type);
 CREATE INDEX IF NOT EXISTS idx_documents_processing_status ON documents(processing_status);
+CREATE INDEX IF NOT EXISTS idx_documents_content_sha256 ON documents(content_sha256) WHERE content_sha256 IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_documents_meta_data_path_gin ON documents USING GIN (meta_data jsonb_path_ops);
 
 -- Extracted data indexes
 CREATE INDEX IF NOT EXISTS idx_extracted_data_document_id ON extracted_data(document_id);
-CREATE INDEX IF NOT EXISTS idx_extracted_data_application_id ON extracted_data(application_id);
-CREATE INDEX IF NOT EXISTS idx_extracted_data_extracted_fields ON extracted_data USING GIN (extracted_fields);
+CREATE INDEX IF NOT EXISTS idx_extracted_data_application_extracted ON extracted_data(application_id, extracted_at);
 
 -- Validation results indexes
-CREATE INDEX IF NOT EXISTS idx_validation_results_application_id ON validation_results(application_id);
+CREATE INDEX IF NOT EXISTS idx_validation_results_application_validated ON validation_results(application_id, validated_at);
 CREATE INDEX IF NOT EXISTS idx_validation_results_validation_summary ON validation_results USING GIN (validation_summary);
-CREATE INDEX IF NOT EXISTS idx_validation_results_flag_review ON validation_results(flag_for_review);
+CREATE INDEX IF NOT EXISTS idx_validation_results_flagged ON validation_results(application_id) WHERE flag_for_review = TRUE;
 
 -- Golden data indexes
-CREATE INDEX IF NOT EXISTS idx_golden_data_application_id ON golden_data(application_id);
-CREATE INDEX IF NOT EXISTS idx_golden_data_golden_fields ON golden_data USING GIN (golden_fields);
+CREATE INDEX IF NOT EXISTS idx_golden_data_application_created ON golden_data(application_id, created_at);
 
 -- Processing logs indexes
 CREATE INDEX IF NOT EXISTS idx_processing_logs_application_id ON processing_logs(application_id);
 CREATE INDEX IF NOT EXISTS idx_processing_logs_document_id ON processing_logs(document_id);
 CREATE INDEX IF NOT EXISTS idx_processing_logs_agent_name ON processing_logs(agent_name);
 CREATE INDEX IF NOT EXISTS idx_processing_logs_created_at ON processing_logs(created_at);
+CREATE INDEX IF NOT EXISTS idx_processing_logs_failed ON processing_logs(application_id, created_at) WHERE status = 'failed';
 
 -- Document jobs indexes
-CREATE INDEX IF NOT EXISTS idx_document_jobs_application_id ON document_jobs(application_id);
+CREATE INDEX IF NOT EXISTS idx_document_jobs_application_created ON document_jobs(application_id, created_at);
 CREATE INDEX IF NOT EXISTS idx_document_jobs_document_id ON document_jobs(document_id);
-CREATE INDEX IF NOT EXISTS idx_document_jobs_status ON document_jobs(status);
+CREATE INDEX IF NOT EXISTS idx_document_jobs_pending ON document_jobs(priority, created_at) WHERE status = 'P';
+CREATE INDEX IF NOT EXISTS idx_document_jobs_failed ON document_jobs(application_id, created_at) WHERE status = 'F';
 CREATE INDEX IF NOT EXISTS idx_document_jobs_priority ON document_jobs(priority);
 
 -- =====================================================
@@ -209,12 +239,25 @@ CREATE TRIGGER update_golden_data_updated_at
     BEFORE UPDATE ON golden_data 
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- Wake LISTENing job processors when jobs are queued (delivered on commit)
+CREATE OR REPLACE FUNCTION notify_new_document_job()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('new_job', '');
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER notify_document_jobs_insert
+    AFTER INSERT ON document_jobs
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_new_document_job();
+
 -- =====================================================
 -- 9. JSON INDEXES FOR PERFORMANCE
 -- =====================================================
 
--- Indexes for extracted_data JSONB fields
-CREATE INDEX IF NOT EXISTS idx_extracted_data_fields_gin ON extracted_data USING GIN (extracted_fields);
+-- Indexes for extracted_data JSONB fields (jsonb_path_ops: serves @> containment only)
+CREATE INDEX IF NOT EXISTS idx_extracted_data_fields_path_gin ON extracted_data USING GIN (extracted_fields jsonb_path_ops);
 CREATE INDEX IF NOT EXISTS idx_extracted_data_document_type ON extracted_data (document_type);
 CREATE INDEX IF NOT EXISTS idx_extracted_data_page_number ON extracted_data (page_number);
 
@@ -222,7 +265,7 @@ CREATE INDEX IF NOT EXISTS idx_extracted_data_page_number ON extracted_data (pag
 CREATE INDEX IF NOT EXISTS idx_validation_results_summary_gin ON validation_results USING GIN (validation_summary);
 
 -- Indexes for golden_data JSONB fields
-CREATE INDEX IF NOT EXISTS idx_golden_data_fields_gin ON golden_data USING GIN (golden_fields);
+CREATE INDEX IF NOT EXISTS idx_golden_data_fields_path_gin ON golden_data USING GIN (golden_fields jsonb_path_ops);
 CREATE INDEX IF NOT EXISTS idx_golden_data_sources_gin ON golden_data USING GIN (data_sources);
 CREATE INDEX IF NOT EXISTS idx_golden_data_validation_gin ON golden_data USING GIN (validation_summary);
 
@@ -267,3 +310,61 @@ LEFT JOIN validation_results vr ON d.application_id = vr.application_id
 LEFT JOIN golden_data gd ON d.application_id = gd.application_id
 LEFT JOIN processing_logs pl ON d.id = pl.document_id
 GROUP BY d.id, d.application_id, d.filename, d.document_type, d.processing_status;
+
+-- =====================================================
+-- 11. MONTHLY PARTITION MAINTENANCE
+-- =====================================================
+
+-- Create monthly partitions <parent>_YYYY_MM from the current month up to
+-- months_ahead months out. Called at startup and daily by DatabaseService.
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(parent_table TEXT, months_ahead INTEGER DEFAULT 2)
+RETURNS VOID AS $$
+DECLARE
+    month_start DATE := date_trunc('month', NOW())::date;
+BEGIN
+    FOR i IN 0..months_ahead LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            parent_table || '_' || to_char(month_start, 'YYYY_MM'),
+            parent_table,
+            month_start,
+            (month_start + INTERVAL '1 month')::date
+        );
+        month_start := (month_start + INTERVAL '1 month')::date;
+    END LOOP;
+END;
+$$ language 'plpgsql';
+
+-- Convert closed processing_logs months to columnar storage for analytic scans.
+-- Needs the Citus columnar access method; a no-op on plain PostgreSQL.
+-- Logs are append-only, so closed months never see UPDATE/DELETE.
+CREATE OR REPLACE FUNCTION compress_old_log_partitions(older_than INTERVAL DEFAULT INTERVAL '7 days')
+RETURNS INTEGER AS $$
+DECLARE
+    partition_name TEXT;
+    converted INTEGER := 0;
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_am WHERE amname = 'columnar') THEN
+        RETURN 0;
+    END IF;
+
+    FOR partition_name IN
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        JOIN pg_am am ON am.oid = c.relam
+        WHERE p.relname = 'processing_logs'
+          AND am.amname <> 'columnar'
+          AND c.relname ~ '^processing_logs_[0-9]{4}_[0-9]{2}$'
+          AND to_date(right(c.relname, 7), 'YYYY_MM') + INTERVAL '1 month' < NOW() - older_than
+    LOOP
+        EXECUTE format('ALTER TABLE %I SET ACCESS METHOD columnar', partition_name);
+        converted := converted + 1;
+    END LOOP;
+    RETURN converted;
+END;
+$$ language 'plpgsql';
+
+SELECT ensure_monthly_partitions('processing_logs');
+SELECT ensure_monthly_partitions('document_jobs');
@@ -5,15 +5,21 @@ This file contains only the necessary endpoints for production use.
 
 import asyncio
 import logging
+import uuid
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from difflib import SequenceMatcher
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
+import orjson
 import uvicorn
 
 # Import orchestrator
 from orchestrator import DocumentProcessingOrchestrator
+from agents.file_validation_agent import FileValidationAgent
+from config.document_config import get_document_config
+from utils.request_cache import request_cache_scope
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -151,15 +157,24 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Failed to start job processor: {str(e)}")
         
+        # Keep monthly partitions for processing_logs/document_jobs created ahead
+        app.state.partition_maintenance_task = asyncio.create_task(
+            orchestrator.db_service.run_partition_maintenance()
+        )
+        
         logger.info("Clean Document Processor started successfully")
         
         yield
         
-        # Cleanup
-        if hasattr(app.state, 'job_processor_task'):
-            app.state.job_processor_task.cancel()
+        # Cleanup: let in-flight jobs drain before cancelling the background tasks
+        await orchestrator.stop_job_processor()
+        for task_name in ('job_processor_task', 'partition_maintenance_task'):
+            task = getattr(app.state, task_name, None)
+            if task is None:
+                continue
+            task.cancel()
             try:
-                await app.state.job_processor_task
+                await task
             except asyncio.CancelledError:
                 pass
         
@@ -185,6 +200,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def request_cache_middleware(request, call_next):
+    """Give each request its own cache for repeated application/document/golden data reads"""
+    with request_cache_scope():
+        return await call_next(request)
+
 # Helper functions
 def _values_match(value1: str, value2: str) -> bool:
     """Check if two values match (with normalization)"""
@@ -206,7 +227,6 @@ def _values_match(value1: str, value2: str) -> bool:
             return True
         
         # Check similarity for names
-        from difflib import SequenceMatcher
         similarity = SequenceMatcher(None, v1, v2).ratio()
         if similarity > 0.8:  # 80% similarity threshold
             return True
@@ -244,12 +264,16 @@ async def health_check():
         ]
     }
 
+@app.get("/debug/pool")
+async def debug_pool():
+    """Database connection pool status"""
+    return orchestrator.db_service.get_pool_status()
+
 @app.post("/api/v1/create-application")
 async def create_application(request: ApplicationCreateRequest):
     """Create a new mortgage application"""
     try:
         # Generate unique application ID
-        import uuid
         application_id = f"APP_{uuid.uuid4().hex[:8].upper()}"
         
         application_data = {
@@ -277,12 +301,7 @@ async def process_documents(
     """Upload and process multiple documents for an application"""
     try:
         # Step 1: File Validation
-        from agents.file_validation_agent import FileValidationAgent
-        from config.yaml_config import YAMLConfigLoader
-        
-        # Initialize file validation agent
-        config_loader = YAMLConfigLoader()
-        file_validator = FileValidationAgent(config_loader)
+        file_validator = FileValidationAgent(get_document_config().yaml_loader)
         
         logger.info(f"=== FILE UPLOAD DEBUG ===")
         logger.info(f"Received {len(files) if files else 0} files for application {application_id}")
@@ -426,9 +445,8 @@ async def validate_fields(application_id: str):
         
         for data in extracted_data:
             if data.get('extracted_fields'):
-                import json
                 if isinstance(data['extracted_fields'], str):
-                    fields = json.loads(data['extracted_fields'])
+                    fields = orjson.loads(data['extracted_fields'])
                 else:
                     fields = data['extracted_fields']
                 
@@ -611,9 +629,8 @@ async def get_validated_fields(application_id: str):
         
         for data in extracted_data:
             if data.get('extracted_fields'):
-                import json
                 if isinstance(data['extracted_fields'], str):
-                    fields = json.loads(data['extracted_fields'])
+                    fields = orjson.loads(data['extracted_fields'])
                 else:
                     fields = data['extracted_fields']
                 
@@ -709,27 +726,29 @@ async def get_golden_data(application_id: str):
         return {"error": str(e), "traceback": traceback.format_exc()}
 
 
+@app.get("/api/v1/processing-logs/{application_id}")
+async def get_processing_logs(application_id: str):
+    """Get processing logs for an application"""
+    try:
+        logs_json = await orchestrator.db_service.get_processing_logs_json(application_id)
+        return Response(content=logs_json, media_type="application/json")
+    except Exception as e:
+        logger.error(f"Error getting processing logs: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/api/v1/extracted-fields/{application_id}")
 async def get_extracted_fields(application_id: str):
     """Get all extracted fields for an application"""
     try:
-        extracted_data = await orchestrator.db_service.get_extracted_data_by_application(application_id)
-        
-        if not extracted_data:
-            return {
-                "application_id": application_id,
-                "extracted_fields": [],
-                "total_fields": 0,
-                "message": "No extracted data found"
-            }
-        
-        # Combine all extracted fields
+        # Combine all extracted fields, streaming rows as they arrive
         all_fields = []
-        for data in extracted_data:
+        row_count = 0
+        async for data in orchestrator.db_service.iter_extracted_data_by_application(application_id):
+            row_count += 1
             if data.get('extracted_fields'):
-                import json
                 if isinstance(data['extracted_fields'], str):
-                    fields = json.loads(data['extracted_fields'])
+                    fields = orjson.loads(data['extracted_fields'])
                 else:
                     fields = data['extracted_fields']
                 
@@ -738,6 +757,14 @@ async def get_extracted_fields(application_id: str):
                     field['extracted_at'] = data.get('extracted_at')
                     all_fields.append(field)
         
+        if not row_count:
+            return {
+                "application_id": application_id,
+                "extracted_fields": [],
+                "total_fields": 0,
+                "message": "No extracted data found"
+            }
+        
         return {
             "application_id": application_id,
             "extracted_fields": all_fields,
@@ -754,30 +781,28 @@ async def get_extracted_fields(application_id: str):
 async def simple_missing_fields(application_id: str):
     """Get missing fields from the entire application - fields that should be extracted from all documents combined"""
     try:
-        # Get extracted data directly from database
-        extracted_data = await orchestrator.db_service.get_extracted_data_by_application(application_id)
-        
-        if not extracted_data:
-            return {
-                "application_id": application_id,
-                "missing_fields": [],
-                "total_missing": 0,
-                "message": "No extracted data found"
-            }
-        
-        # Collect ALL extracted field names
+        # Collect ALL extracted field names, streaming rows from the database
         extracted_field_names = set()
-        for data in extracted_data:
+        row_count = 0
+        async for data in orchestrator.db_service.iter_extracted_data_by_application(application_id):
+            row_count += 1
             if data.get('extracted_fields'):
-                import json
                 if isinstance(data['extracted_fields'], str):
-                    fields = json.loads(data['extracted_fields'])
+                    fields = orjson.loads(data['extracted_fields'])
                 else:
                     fields = data['extracted_fields']
                 for field in fields:
                     if field.get('field_name'):
                         extracted_field_names.add(field['field_name'])
         
+        if not row_count:
+            return {
+                "application_id": application_id,
+                "missing_fields": [],
+                "total_missing": 0,
+                "message": "No extracted data found"
+            }
+        
         # Get uploaded documents
         documents = await orchestrator.db_service.get_documents_by_application(application_id)
         uploaded_doc_types = set()
@@ -786,8 +811,7 @@ async def simple_missing_fields(application_id: str):
         
         # Build master field list from all document types (like simple-missing-fields)
         master_field_list = set()
-        from config.document_config import DocumentConfig
-        doc_config = DocumentConfig()
+        doc_config = get_document_config()
         all_doc_types = doc_config.yaml_loader.get_document_types()
         
         for doc_type in all_doc_types.keys():
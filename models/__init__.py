@@ -3,6 +3,7 @@ Document Processor Models
 Clean data models for the four-agent document processing system
 """
 
+from .base import Base
 from .application import Application
 from .document import Document
 from .extracted_data import ExtractedData
@@ -12,6 +13,7 @@ from .processing_log import ProcessingLog
 from .document_job import DocumentJob
 
 __all__ = [
+    "Base",
     "Application",
     "Document", 
     "ExtractedData",
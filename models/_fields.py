@@ -0,0 +1,94 @@
+"""
+Model Field Getters
+Getter factories used to build each model's precomputed to_dict field table
+"""
+
+from collections import OrderedDict
+from operator import attrgetter
+from typing import Any, Callable, Dict, Optional, Tuple
+
+Getter = Callable[[Any], Any]
+
+# Bound once so getters resolve it from their closure rather than builtins
+_to_float = float
+
+# Per-process LRU of to_dict output keyed by (model, id, column values)
+ROW_CACHE_SIZE = 10_000
+_row_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_column_names_by_model: Dict[type, Tuple[str, ...]] = {}
+
+
+def as_is(name: str) -> Getter:
+    """Return the attribute unchanged"""
+    return attrgetter(name)
+
+
+def as_str(name: str) -> Getter:
+    """Return the attribute converted to str"""
+    get = attrgetter(name)
+    
+    def getter(obj: Any) -> str:
+        return str(get(obj))
+    return getter
+
+
+def as_optional_str(name: str) -> Getter:
+    """Return the attribute converted to str, or None when unset"""
+    get = attrgetter(name)
+    
+    def getter(obj: Any) -> Optional[str]:
+        value = get(obj)
+        return str(value) if value else None
+    return getter
+
+
+def as_float(name: str) -> Getter:
+    """Return the attribute converted to float"""
+    get = attrgetter(name)
+    to_float = _to_float
+    
+    def getter(obj: Any) -> float:
+        return to_float(get(obj))
+    return getter
+
+
+def as_optional_float(name: str, default: Optional[float] = None) -> Getter:
+    """Return the attribute converted to float, or default when None (zero is kept as 0.0)"""
+    get = attrgetter(name)
+    to_float = _to_float
+    
+    def getter(obj: Any) -> Optional[float]:
+        value = get(obj)
+        return to_float(value) if value is not None else default
+    return getter
+
+
+def _column_names(model: type) -> Tuple[str, ...]:
+    """Names of a model's mapped columns (other than id), resolved once per model"""
+    names = _column_names_by_model.get(model)
+    if names is None:
+        names = tuple(attr.key for attr in model.__mapper__.column_attrs if attr.key != 'id')
+        _column_names_by_model[model] = names
+    return names
+
+
+def cached_to_dict(obj: Any) -> Dict[str, Any]:
+    """Build to_dict output from obj._FIELDS, reusing it while none of obj's column values have changed"""
+    if obj.id is None:
+        return {key: getter(obj) for key, getter in obj._FIELDS}
+    
+    # Keyed by the current column values, not a version column: in-memory edits
+    # aren't reflected in updated_at until the row is flushed and refreshed
+    model = type(obj)
+    cache_key = (model.__name__, obj.id, tuple(getattr(obj, name) for name in _column_names(model)))
+    cached = _row_cache.get(cache_key)
+    if cached is None:
+        cached = {key: getter(obj) for key, getter in obj._FIELDS}
+        _row_cache[cache_key] = cached
+        if len(_row_cache) > ROW_CACHE_SIZE:
+            _row_cache.popitem(last=False)
+    else:
+        _row_cache.move_to_end(cache_key)
+    
+    # Shallow copy so callers can't mutate the cached entry
+    return dict(cached)
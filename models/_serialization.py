@@ -0,0 +1,23 @@
+"""
+Row Serialization
+Serializes Core result rows straight to JSON without hydrating ORM instances
+"""
+
+from typing import Any, Dict, Iterable
+
+import orjson
+from sqlalchemy.engine import Row
+
+
+def dump_rows(rows: Iterable[Row]) -> bytes:
+    """Serialize result rows to JSON bytes (UUIDs, datetimes and Decimals handled natively or via str)"""
+    return orjson.dumps(
+        [dict(row._mapping) for row in rows],
+        default=str,
+        option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+    )
+
+
+def dump_dict(data: Dict[str, Any]) -> bytes:
+    """Serialize a to_dict() result to JSON bytes, formatting datetimes in C"""
+    return orjson.dumps(data, default=str, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z)
@@ -3,48 +3,64 @@ Application Model
 Represents a mortgage application with its processing status
 """
 
-from sqlalchemy import Column, String, DateTime, Numeric, Text
+from sqlalchemy import String, DateTime, Numeric, Text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
+from datetime import datetime
+from decimal import Decimal
 import uuid
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 
-Base = declarative_base()
+from .base import Base
+from ._fields import as_is, as_float
+
+
+_STATUS_DISPLAY = MappingProxyType({
+    'document_upload': 'Document Upload',
+    'processing': 'Processing Documents',
+    'validation': 'Validating Data',
+    'completed': 'Completed',
+    'failed': 'Failed'
+})
 
 class Application(Base):
     __tablename__ = "applications"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    application_id = Column(String(255), unique=True, nullable=False, index=True)
-    applicant_name = Column(String(255))
-    co_applicant_name = Column(String(255))
-    application_type = Column(String(50), default='mortgage')
-    status = Column(String(50), default='document_upload')
-    completion_percentage = Column(Numeric(5, 2), default=0.00)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now())
-    processed_at = Column(DateTime(timezone=True))
-    meta_data = Column(JSONB, default={})
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    application_id: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
+    applicant_name: Mapped[Optional[str]] = mapped_column(String(255))
+    co_applicant_name: Mapped[Optional[str]] = mapped_column(String(255))
+    application_type: Mapped[Optional[str]] = mapped_column(String(50), default='mortgage')
+    status: Mapped[Optional[str]] = mapped_column(String(50), default='document_upload')
+    completion_percentage: Mapped[Optional[Decimal]] = mapped_column(Numeric(5, 2), default=0.00)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    meta_data: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, default={})
+    
+    # (key, getter) pairs built once at import time and reused by to_dict
+    _FIELDS = (
+        ('id', as_is('id_str')),
+        ('application_id', as_is('application_id')),
+        ('applicant_name', as_is('applicant_name')),
+        ('co_applicant_name', as_is('co_applicant_name')),
+        ('application_type', as_is('application_type')),
+        ('status', as_is('status')),
+        ('completion_percentage', as_float('completion_percentage')),
+        ('created_at', as_is('created_at')),
+        ('updated_at', as_is('updated_at')),
+        ('processed_at', as_is('processed_at')),
+        ('metadata', as_is('meta_data'))
+    )
     
-    def __repr__(self):
-        return f"<Application(application_id='{self.application_id}', status='{self.status}')>"
+    _REPR_TEMPLATE = "<Application(application_id='{}', status='{}')>"
+    _REPR_KEYS = ('application_id', 'status')
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
-            'id': str(self.id),
-            'application_id': self.application_id,
-            'applicant_name': self.applicant_name,
-            'co_applicant_name': self.co_applicant_name,
-            'application_type': self.application_type,
-            'status': self.status,
-            'completion_percentage': float(self.completion_percentage),
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'processed_at': self.processed_at.isoformat() if self.processed_at else None,
-            'metadata': self.meta_data
-        }
+        return {key: getter(self) for key, getter in self._FIELDS}
     
     def is_complete(self) -> bool:
         """Check if application processing is complete"""
@@ -52,11 +68,4 @@ class Application(Base):
     
     def get_processing_status(self) -> str:
         """Get human-readable processing status"""
-        status_map = {
-            'document_upload': 'Document Upload',
-            'processing': 'Processing Documents',
-            'validation': 'Validating Data',
-            'completed': 'Completed',
-            'failed': 'Failed'
-        }
-        return status_map.get(self.status, 'Unknown')
+        return _STATUS_DISPLAY.get(self.status, 'Unknown')
@@ -0,0 +1,38 @@
+"""
+Declarative Base
+Shared SQLAlchemy 2.0 declarative base for all document processor models
+"""
+
+from sqlalchemy.orm import DeclarativeBase
+
+from ._serialization import dump_dict
+
+
+class Base(DeclarativeBase):
+    """Single registry/metadata for every model so cross-model foreign keys resolve in one pass"""
+    
+    # Subclasses set a positional format template and the attributes that fill it
+    _REPR_TEMPLATE = "<{}>"
+    _REPR_KEYS = ()
+    
+    def __repr__(self):
+        if not self._REPR_KEYS:
+            return self._REPR_TEMPLATE.format(type(self).__name__)
+        return self._REPR_TEMPLATE.format(*[getattr(self, key) for key in self._REPR_KEYS])
+    
+    @property
+    def id_str(self) -> str:
+        """Get the canonical string form of id, formatted once per id value"""
+        id_value = self.id
+        if id_value is None:
+            # Not assigned until flush; don't pin a placeholder
+            return str(id_value)
+        cached = self.__dict__.get('_id_str')
+        if cached is None or cached[0] != id_value:
+            cached = (id_value, str(id_value))
+            self.__dict__['_id_str'] = cached
+        return cached[1]
+    
+    def to_json(self) -> bytes:
+        """Serialize to JSON bytes; datetimes in to_dict() are formatted by orjson"""
+        return dump_dict(self.to_dict())
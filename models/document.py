@@ -3,56 +3,78 @@ Document Model
 Represents a raw document uploaded for processing
 """
 
-from sqlalchemy import Column, String, DateTime, Numeric, BigInteger, ForeignKey
+from sqlalchemy import CHAR, String, DateTime, SmallInteger, BigInteger, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
+from datetime import datetime
 import uuid
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 
-Base = declarative_base()
+from .base import Base
+from ._fields import as_is, as_optional_float
+
+
+_PROCESSING_STATUS_DISPLAY = MappingProxyType({
+    'pending': 'Pending Processing',
+    'processing': 'Processing',
+    'completed': 'Completed',
+    'failed': 'Failed',
+    'skipped': 'Skipped'
+})
 
 class Document(Base):
     __tablename__ = "documents"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    application_id = Column(String(255), ForeignKey("applications.application_id"), nullable=False, index=True)
-    document_id = Column(String(255), nullable=False)
-    filename = Column(String(255), nullable=False)
-    document_type = Column(String(100), nullable=False)
-    applicant_type = Column(String(20), nullable=False, default='applicant')
-    file_size = Column(BigInteger)
-    mime_type = Column(String(100))
-    storage_path = Column(String(500))
-    upload_status = Column(String(50), default='uploaded')
-    processing_status = Column(String(50), default='pending')
-    confidence = Column(Numeric(3, 2), default=0.0)
-    uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
-    processed_at = Column(DateTime(timezone=True))
-    meta_data = Column(JSONB, default={})
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    application_id: Mapped[str] = mapped_column(String(255), ForeignKey("applications.application_id"), nullable=False, index=True)
+    document_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    document_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    applicant_type: Mapped[str] = mapped_column(String(20), nullable=False, default='applicant')
+    file_size: Mapped[Optional[int]] = mapped_column(BigInteger)
+    mime_type: Mapped[Optional[str]] = mapped_column(String(100))
+    storage_path: Mapped[Optional[str]] = mapped_column(String(500))
+    content_sha256: Mapped[Optional[str]] = mapped_column(CHAR(64), index=True)
+    upload_status: Mapped[Optional[str]] = mapped_column(String(50), default='uploaded')
+    processing_status: Mapped[Optional[str]] = mapped_column(String(50), default='pending')
+    confidence_pct: Mapped[Optional[int]] = mapped_column(SmallInteger, default=0)  # 0-100
+    uploaded_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    meta_data: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, default={})
     
-    def __repr__(self):
-        return f"<Document(document_id='{self.document_id}', type='{self.document_type}', status='{self.processing_status}')>"
+    # (key, getter) pairs built once at import time and reused by to_dict
+    _FIELDS = (
+        ('id', as_is('id_str')),
+        ('application_id', as_is('application_id')),
+        ('document_id', as_is('document_id')),
+        ('filename', as_is('filename')),
+        ('document_type', as_is('document_type')),
+        ('applicant_type', as_is('applicant_type')),
+        ('file_size', as_is('file_size')),
+        ('mime_type', as_is('mime_type')),
+        ('storage_path', as_is('storage_path')),
+        ('content_sha256', as_is('content_sha256')),
+        ('upload_status', as_is('upload_status')),
+        ('processing_status', as_is('processing_status')),
+        ('confidence', as_optional_float('confidence', 0.0)),
+        ('uploaded_at', as_is('uploaded_at')),
+        ('processed_at', as_is('processed_at')),
+        ('metadata', as_is('meta_data'))
+    )
+    
+    _REPR_TEMPLATE = "<Document(document_id='{}', type='{}', status='{}')>"
+    _REPR_KEYS = ('document_id', 'document_type', 'processing_status')
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
-            'id': str(self.id),
-            'application_id': self.application_id,
-            'document_id': self.document_id,
-            'filename': self.filename,
-            'document_type': self.document_type,
-            'applicant_type': self.applicant_type,
-            'file_size': self.file_size,
-            'mime_type': self.mime_type,
-            'storage_path': self.storage_path,
-            'upload_status': self.upload_status,
-            'processing_status': self.processing_status,
-            'confidence': float(self.confidence) if self.confidence else 0.0,
-            'uploaded_at': self.uploaded_at.isoformat() if self.uploaded_at else None,
-            'processed_at': self.processed_at.isoformat() if self.processed_at else None,
-            'metadata': self.meta_data
-        }
+        return {key: getter(self) for key, getter in self._FIELDS}
+    
+    @property
+    def confidence(self) -> Optional[float]:
+        """Get confidence as a 0-1 fraction"""
+        return self.confidence_pct / 100.0 if self.confidence_pct is not None else None
     
     def is_processed(self) -> bool:
         """Check if document has been processed"""
@@ -64,11 +86,4 @@ class Document(Base):
     
     def get_processing_status_display(self) -> str:
         """Get human-readable processing status"""
-        status_map = {
-            'pending': 'Pending Processing',
-            'processing': 'Processing',
-            'completed': 'Completed',
-            'failed': 'Failed',
-            'skipped': 'Skipped'
-        }
-        return status_map.get(self.processing_status, 'Unknown')
+        return _PROCESSING_STATUS_DISPLAY.get(self.processing_status, 'Unknown')
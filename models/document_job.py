@@ -3,70 +3,116 @@ Document Job Model
 Represents jobs in the processing queue
 """
 
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey
+from sqlalchemy import String, CHAR, DateTime, Integer, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
+from datetime import datetime
 import uuid
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 
-Base = declarative_base()
+from .base import Base
+from ._fields import as_is, as_str, cached_to_dict
+from .models_fast import get_priority_display_fast
+
+
+# Single-character status codes stored in document_jobs.status
+STATUS_PENDING = 'P'
+STATUS_PROCESSING = 'R'
+STATUS_COMPLETED = 'C'
+STATUS_FAILED = 'F'
+
+JOB_STATUS_CODES = MappingProxyType({
+    'pending': STATUS_PENDING,
+    'processing': STATUS_PROCESSING,
+    'completed': STATUS_COMPLETED,
+    'failed': STATUS_FAILED
+})
+JOB_STATUS_NAMES = MappingProxyType({code: name for name, code in JOB_STATUS_CODES.items()})
+
+_STATUS_COLOR = MappingProxyType({
+    STATUS_PENDING: 'yellow',
+    STATUS_PROCESSING: 'blue',
+    STATUS_COMPLETED: 'green',
+    STATUS_FAILED: 'red'
+})
+
+_JOB_TYPE_DISPLAY = MappingProxyType({
+    'ingestion': 'Document Ingestion',
+    'extraction': 'Data Extraction',
+    'validation': 'Data Validation',
+})
+
+_STATUS_DISPLAY = MappingProxyType({
+    STATUS_PENDING: 'Pending',
+    STATUS_PROCESSING: 'Processing',
+    STATUS_COMPLETED: 'Completed',
+    STATUS_FAILED: 'Failed'
+})
 
 class DocumentJob(Base):
     __tablename__ = "document_jobs"
+    __table_args__ = (
+        Index('idx_document_jobs_pending', 'priority', 'created_at', postgresql_where=text("status = 'P'")),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+    
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    application_id: Mapped[str] = mapped_column(String(255), ForeignKey("applications.application_id"), nullable=False, index=True)
+    document_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("documents.id"), nullable=False, index=True)
+    job_type: Mapped[str] = mapped_column(String(50), nullable=False)  # 'ingestion', 'extraction', 'validation'
+    status: Mapped[Optional[str]] = mapped_column(CHAR(1), default=STATUS_PENDING)  # see JOB_STATUS_CODES
+    priority: Mapped[Optional[int]] = mapped_column(Integer, default=5)
+    retry_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    max_retries: Mapped[Optional[int]] = mapped_column(Integer, default=3)
+    error_message: Mapped[Optional[str]] = mapped_column(String(500))
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, server_default=func.now())  # Partition key
+    
+    # (key, getter) pairs built once at import time and reused by to_dict
+    _FIELDS = (
+        ('id', as_is('id_str')),
+        ('application_id', as_is('application_id')),
+        ('document_id', as_str('document_id')),
+        ('job_type', as_is('job_type')),
+        ('status', as_is('status')),
+        ('priority', as_is('priority')),
+        ('retry_count', as_is('retry_count')),
+        ('max_retries', as_is('max_retries')),
+        ('error_message', as_is('error_message')),
+        ('started_at', as_is('started_at')),
+        ('completed_at', as_is('completed_at')),
+        ('created_at', as_is('created_at'))
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    application_id = Column(String(255), ForeignKey("applications.application_id"), nullable=False, index=True)
-    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id"), nullable=False, index=True)
-    job_type = Column(String(50), nullable=False)  # 'ingestion', 'extraction', 'validation'
-    status = Column(String(20), default='pending', index=True)  # 'pending', 'processing', 'completed', 'failed'
-    priority = Column(Integer, default=5)
-    retry_count = Column(Integer, default=0)
-    max_retries = Column(Integer, default=3)
-    error_message = Column(String(500))
-    started_at = Column(DateTime(timezone=True))
-    completed_at = Column(DateTime(timezone=True))
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    
-    def __repr__(self):
-        return f"<DocumentJob(type='{self.job_type}', status='{self.status}', priority={self.priority})>"
+    _REPR_TEMPLATE = "<DocumentJob(type='{}', status='{}', priority={})>"
+    _REPR_KEYS = ('job_type', 'status', 'priority')
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
-            'id': str(self.id),
-            'application_id': self.application_id,
-            'document_id': str(self.document_id),
-            'job_type': self.job_type,
-            'status': self.status,
-            'priority': self.priority,
-            'retry_count': self.retry_count,
-            'max_retries': self.max_retries,
-            'error_message': self.error_message,
-            'started_at': self.started_at.isoformat() if self.started_at else None,
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+        return cached_to_dict(self)
     
     def is_pending(self) -> bool:
         """Check if job is pending"""
-        return self.status == 'pending'
+        return self.status == STATUS_PENDING
     
     def is_processing(self) -> bool:
         """Check if job is processing"""
-        return self.status == 'processing'
+        return self.status == STATUS_PROCESSING
     
     def is_completed(self) -> bool:
         """Check if job is completed"""
-        return self.status == 'completed'
+        return self.status == STATUS_COMPLETED
     
     def is_failed(self) -> bool:
         """Check if job is failed"""
-        return self.status == 'failed'
+        return self.status == STATUS_FAILED
     
     def can_retry(self) -> bool:
         """Check if job can be retried"""
-        return self.status == 'failed' and self.retry_count < self.max_retries
+        return self.status == STATUS_FAILED and self.retry_count < self.max_retries
     
     def is_high_priority(self) -> bool:
         """Check if job is high priority"""
@@ -82,38 +128,16 @@ class DocumentJob(Base):
     
     def get_status_color(self) -> str:
         """Get color code for status display"""
-        color_map = {
-            'pending': 'yellow',
-            'processing': 'blue',
-            'completed': 'green',
-            'failed': 'red'
-        }
-        return color_map.get(self.status, 'gray')
+        return _STATUS_COLOR.get(self.status, 'gray')
     
     def get_job_type_display(self) -> str:
         """Get human-readable job type"""
-        type_map = {
-            'ingestion': 'Document Ingestion',
-            'extraction': 'Data Extraction',
-            'validation': 'Data Validation',
-        }
-        return type_map.get(self.job_type, self.job_type.title())
+        return _JOB_TYPE_DISPLAY.get(self.job_type, self.job_type.title())
     
     def get_status_display(self) -> str:
         """Get human-readable status"""
-        status_map = {
-            'pending': 'Pending',
-            'processing': 'Processing',
-            'completed': 'Completed',
-            'failed': 'Failed'
-        }
-        return status_map.get(self.status, 'Unknown')
+        return _STATUS_DISPLAY.get(self.status, 'Unknown')
     
     def get_priority_display(self) -> str:
         """Get human-readable priority"""
-        if self.is_high_priority():
-            return 'High'
-        elif self.is_medium_priority():
-            return 'Medium'
-        else:
-            return 'Low'
+        return get_priority_display_fast(self.priority)
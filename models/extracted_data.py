@@ -3,77 +3,89 @@ Extracted Data Model
 Represents data extracted from documents by the Data Extraction Agent
 """
 
-from sqlalchemy import Column, String, DateTime, Numeric, Text, ForeignKey
+from sqlalchemy import String, DateTime, SmallInteger, Integer, Text, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
+from datetime import datetime
 import uuid
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 
-Base = declarative_base()
+from .base import Base
+from ._fields import as_is, as_str, as_float
+from .models_fast import get_confidence_level_fast
+
+
+_FIELD_TYPE_DISPLAY = MappingProxyType({
+    'text': 'Text',
+    'currency': 'Currency',
+    'date': 'Date',
+    'number': 'Number',
+    'percentage': 'Percentage'
+})
 
 class ExtractedData(Base):
     __tablename__ = "extracted_data"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id"), nullable=False, index=True)
-    application_id = Column(String(255), ForeignKey("applications.application_id"), nullable=False, index=True)
-    field_name = Column(String(100), nullable=False, index=True)
-    field_value = Column(Text)
-    field_type = Column(String(50), nullable=False)  # 'text', 'currency', 'date', 'number'
-    confidence = Column(Numeric(3, 2), nullable=False)
-    extraction_method = Column(String(50), default='textract')
-    raw_response = Column(JSONB)
-    extracted_at = Column(DateTime(timezone=True), server_default=func.now())
-    agent_version = Column(String(20), default='1.0')
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    document_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("documents.id"), nullable=False, index=True)
+    application_id: Mapped[str] = mapped_column(String(255), ForeignKey("applications.application_id"), nullable=False, index=True)
+    field_name: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    field_value: Mapped[Optional[str]] = mapped_column(Text)
+    field_type: Mapped[str] = mapped_column(String(50), nullable=False)  # 'text', 'currency', 'date', 'number'
+    confidence_pct: Mapped[int] = mapped_column(SmallInteger, nullable=False)  # 0-100
+    extraction_method: Mapped[Optional[str]] = mapped_column(String(50), default='textract')
+    raw_response: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, deferred=True)  # Only loaded when accessed explicitly
+    raw_response_block_count: Mapped[Optional[int]] = mapped_column(Integer)  # Promoted from raw_response['Blocks']
+    raw_response_page_count: Mapped[Optional[int]] = mapped_column(Integer)  # Promoted from raw_response['DocumentMetadata']['Pages']
+    extracted_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    agent_version: Mapped[Optional[str]] = mapped_column(String(20), default='1.0')
     
-    def __repr__(self):
-        return f"<ExtractedData(field='{self.field_name}', value='{self.field_value}', confidence={self.confidence})>"
+    # (key, getter) pairs built once at import time and reused by to_dict
+    _FIELDS = (
+        ('id', as_is('id_str')),
+        ('document_id', as_str('document_id')),
+        ('application_id', as_is('application_id')),
+        ('field_name', as_is('field_name')),
+        ('field_value', as_is('field_value')),
+        ('field_type', as_is('field_type')),
+        ('confidence', as_float('confidence')),
+        ('extraction_method', as_is('extraction_method')),
+        ('raw_response_block_count', as_is('raw_response_block_count')),
+        ('raw_response_page_count', as_is('raw_response_page_count')),
+        ('extracted_at', as_is('extracted_at')),
+        ('agent_version', as_is('agent_version'))
+    )
+    
+    _REPR_TEMPLATE = "<ExtractedData(field='{}', value='{}', confidence={})>"
+    _REPR_KEYS = ('field_name', 'field_value', 'confidence')
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
-            'id': str(self.id),
-            'document_id': str(self.document_id),
-            'application_id': self.application_id,
-            'field_name': self.field_name,
-            'field_value': self.field_value,
-            'field_type': self.field_type,
-            'confidence': float(self.confidence),
-            'extraction_method': self.extraction_method,
-            'raw_response': self.raw_response,
-            'extracted_at': self.extracted_at.isoformat() if self.extracted_at else None,
-            'agent_version': self.agent_version
-        }
+        return {key: getter(self) for key, getter in self._FIELDS}
+    
+    @property
+    def confidence(self) -> float:
+        """Get confidence as a 0-1 fraction"""
+        return self.confidence_pct / 100.0
     
     def is_high_confidence(self) -> bool:
         """Check if extraction has high confidence"""
-        return self.confidence >= 0.8
+        return self.confidence_pct >= 80
     
     def is_medium_confidence(self) -> bool:
         """Check if extraction has medium confidence"""
-        return 0.5 <= self.confidence < 0.8
+        return 50 <= self.confidence_pct < 80
     
     def is_low_confidence(self) -> bool:
         """Check if extraction has low confidence"""
-        return self.confidence < 0.5
+        return self.confidence_pct < 50
     
     def get_confidence_level(self) -> str:
         """Get confidence level as string"""
-        if self.is_high_confidence():
-            return 'high'
-        elif self.is_medium_confidence():
-            return 'medium'
-        else:
-            return 'low'
+        return get_confidence_level_fast(self.confidence_pct)
     
     def get_field_type_display(self) -> str:
         """Get human-readable field type"""
-        type_map = {
-            'text': 'Text',
-            'currency': 'Currency',
-            'date': 'Date',
-            'number': 'Number',
-            'percentage': 'Percentage'
-        }
-        return type_map.get(self.field_type, 'Unknown')
+        return _FIELD_TYPE_DISPLAY.get(self.field_type, 'Unknown')
@@ -3,62 +3,97 @@ Golden Data Model
 Represents the final validated data from the Data Validation Agent
 """
 
-from sqlalchemy import Column, String, DateTime, Numeric, Text, Boolean, ForeignKey
+from sqlalchemy import String, DateTime, SmallInteger, Text, Boolean, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
+from datetime import datetime
 import uuid
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 
-Base = declarative_base()
+from .base import Base
+from ._fields import as_is, as_optional_str, as_optional_float, cached_to_dict
+from .models_fast import get_confidence_level_fast
+
+
+_DATA_SOURCE_DISPLAY = MappingProxyType({
+    'application_form': 'Application Form',
+    'document_extraction': 'Document Extraction',
+    'manual_input': 'Manual Input'
+})
+
+_FIELD_TYPE_DISPLAY = MappingProxyType({
+    'text': 'Text',
+    'currency': 'Currency',
+    'date': 'Date',
+    'number': 'Number',
+    'percentage': 'Percentage',
+    'boolean': 'Boolean'
+})
+
+_VALIDATION_STATUS_DISPLAY = MappingProxyType({
+    'validated': 'Validated',
+    'mismatch': 'Mismatch',
+    'missing': 'Missing',
+    'pending': 'Pending'
+})
 
 class GoldenData(Base):
     __tablename__ = "golden_data"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    application_id = Column(String(255), ForeignKey("applications.application_id"), nullable=False, index=True)
-    field_name = Column(String(100), nullable=False, index=True)
-    field_value = Column(Text, nullable=False)
-    field_type = Column(String(50), nullable=False)
-    data_source = Column(String(100), nullable=False)  # 'application_form', 'document_extraction', 'manual_input'
-    source_document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id"))
-    validation_status = Column(String(20), nullable=False, index=True)
-    confidence_score = Column(Numeric(3, 2))
-    is_verified = Column(Boolean, default=False)
-    verification_notes = Column(Text)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now())
-    agent_version = Column(String(20), default='1.0')
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    application_id: Mapped[str] = mapped_column(String(255), ForeignKey("applications.application_id"), nullable=False, index=True)
+    field_name: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    field_value: Mapped[str] = mapped_column(Text, nullable=False)
+    field_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    data_source: Mapped[str] = mapped_column(String(100), nullable=False)  # 'application_form', 'document_extraction', 'manual_input'
+    source_document_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("documents.id"))
+    validation_status: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
+    confidence_score_pct: Mapped[Optional[int]] = mapped_column(SmallInteger)  # 0-100
+    is_verified: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    verification_notes: Mapped[Optional[str]] = mapped_column(Text)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    agent_version: Mapped[Optional[str]] = mapped_column(String(20), default='1.0')
+    
+    # (key, getter) pairs built once at import time and reused by to_dict
+    _FIELDS = (
+        ('id', as_is('id_str')),
+        ('application_id', as_is('application_id')),
+        ('field_name', as_is('field_name')),
+        ('field_value', as_is('field_value')),
+        ('field_type', as_is('field_type')),
+        ('data_source', as_is('data_source')),
+        ('source_document_id', as_optional_str('source_document_id')),
+        ('validation_status', as_is('validation_status')),
+        ('confidence_score', as_optional_float('confidence_score')),
+        ('is_verified', as_is('is_verified')),
+        ('verification_notes', as_is('verification_notes')),
+        ('created_at', as_is('created_at')),
+        ('updated_at', as_is('updated_at')),
+        ('agent_version', as_is('agent_version'))
+    )
     
-    def __repr__(self):
-        return f"<GoldenData(field='{self.field_name}', value='{self.field_value}', source='{self.data_source}')>"
+    _REPR_TEMPLATE = "<GoldenData(field='{}', value='{}', source='{}')>"
+    _REPR_KEYS = ('field_name', 'field_value', 'data_source')
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
-            'id': str(self.id),
-            'application_id': self.application_id,
-            'field_name': self.field_name,
-            'field_value': self.field_value,
-            'field_type': self.field_type,
-            'data_source': self.data_source,
-            'source_document_id': str(self.source_document_id) if self.source_document_id else None,
-            'validation_status': self.validation_status,
-            'confidence_score': float(self.confidence_score) if self.confidence_score else None,
-            'is_verified': self.is_verified,
-            'verification_notes': self.verification_notes,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'agent_version': self.agent_version
-        }
+        return cached_to_dict(self)
+    
+    @property
+    def confidence_score(self) -> Optional[float]:
+        """Get confidence score as a 0-1 fraction"""
+        return self.confidence_score_pct / 100.0 if self.confidence_score_pct is not None else None
     
-    def is_verified(self) -> bool:
+    def check_verified(self) -> bool:
         """Check if data is verified"""
-        return self.is_verified
+        return bool(self.is_verified)
     
     def is_high_confidence(self) -> bool:
         """Check if data has high confidence"""
-        return self.confidence_score and self.confidence_score >= 0.8
+        return self.confidence_score_pct and self.confidence_score_pct >= 80
     
     def is_from_application(self) -> bool:
         """Check if data comes from application form"""
@@ -74,42 +109,18 @@ class GoldenData(Base):
     
     def get_data_source_display(self) -> str:
         """Get human-readable data source"""
-        source_map = {
-            'application_form': 'Application Form',
-            'document_extraction': 'Document Extraction',
-            'manual_input': 'Manual Input'
-        }
-        return source_map.get(self.data_source, 'Unknown')
+        return _DATA_SOURCE_DISPLAY.get(self.data_source, 'Unknown')
     
     def get_field_type_display(self) -> str:
         """Get human-readable field type"""
-        type_map = {
-            'text': 'Text',
-            'currency': 'Currency',
-            'date': 'Date',
-            'number': 'Number',
-            'percentage': 'Percentage',
-            'boolean': 'Boolean'
-        }
-        return type_map.get(self.field_type, 'Unknown')
+        return _FIELD_TYPE_DISPLAY.get(self.field_type, 'Unknown')
     
     def get_validation_status_display(self) -> str:
         """Get human-readable validation status"""
-        status_map = {
-            'validated': 'Validated',
-            'mismatch': 'Mismatch',
-            'missing': 'Missing',
-            'pending': 'Pending'
-        }
-        return status_map.get(self.validation_status, 'Unknown')
+        return _VALIDATION_STATUS_DISPLAY.get(self.validation_status, 'Unknown')
     
     def get_confidence_level(self) -> str:
         """Get confidence level as string"""
-        if not self.confidence_score:
+        if not self.confidence_score_pct:
             return 'unknown'
-        elif self.confidence_score >= 0.8:
-            return 'high'
-        elif self.confidence_score >= 0.5:
-            return 'medium'
-        else:
-            return 'low'
+        return get_confidence_level_fast(self.confidence_score_pct)
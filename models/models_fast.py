@@ -0,0 +1,48 @@
+"""
+Fast Model Helpers
+Fully typed, SQLAlchemy-free helpers behind the models' per-row display methods.
+Compiled with mypyc in the Docker image; runs as plain Python everywhere else.
+"""
+
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+
+_NOT_AVAILABLE = 'N/A'
+
+# Upper bounds (exclusive) of the ms and seconds display buckets; larger values display as minutes
+_TIME_THRESHOLDS_MS: List[int] = [1000, 60_000]
+_TIME_FORMATS: List[Tuple[str, int]] = [('{:.0f}ms', 1), ('{:.1f}s', 1000)]
+
+
+def get_processing_time_display_fast(processing_time_ms: Optional[int]) -> str:
+    """Get human-readable processing time"""
+    if not processing_time_ms:
+        return _NOT_AVAILABLE
+    
+    bucket = bisect_right(_TIME_THRESHOLDS_MS, processing_time_ms)
+    if bucket < len(_TIME_FORMATS):
+        fmt, divisor = _TIME_FORMATS[bucket]
+        return fmt.format(processing_time_ms / divisor)
+    
+    minutes, remainder_ms = divmod(processing_time_ms, 60_000)
+    return f"{minutes}m {remainder_ms / 1000:.1f}s"
+
+
+def get_priority_display_fast(priority: int) -> str:
+    """Get human-readable priority (1-3 high, 4-7 medium, 8+ low)"""
+    if priority <= 3:
+        return 'High'
+    elif priority <= 7:
+        return 'Medium'
+    else:
+        return 'Low'
+
+
+def get_confidence_level_fast(confidence_pct: int) -> str:
+    """Get confidence level for a 0-100 confidence percentage"""
+    if confidence_pct >= 80:
+        return 'high'
+    elif confidence_pct >= 50:
+        return 'medium'
+    else:
+        return 'low'
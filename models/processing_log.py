@@ -1,48 +1,90 @@
 """
 Processing Log Model
 Represents audit trail logs from all agents
+
+Storage: range-partitioned by month on created_at. Closed months are moved to
+Citus columnar storage by compress_old_log_partitions() when the extension is
+installed, which keeps agent/day analytic scans cheap; no model changes needed.
 """
 
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Text
+from sqlalchemy import String, DateTime, Integer, Text, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
+from datetime import datetime
 import uuid
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 
-Base = declarative_base()
+from .base import Base
+from ._fields import as_is, as_optional_str
+from .models_fast import get_processing_time_display_fast
+
+
+_STATUS_COLOR = MappingProxyType({
+    'started': 'blue',
+    'completed': 'green',
+    'failed': 'red',
+    'skipped': 'yellow'
+})
+
+_AGENT_DISPLAY = MappingProxyType({
+    'ingestion': 'Document Ingestion Agent',
+    'extraction': 'Data Extraction Agent',
+    'validation': 'Data Validation Agent',
+})
+
+_STATUS_DISPLAY = MappingProxyType({
+    'started': 'Started',
+    'completed': 'Completed',
+    'failed': 'Failed',
+    'skipped': 'Skipped'
+})
 
 class ProcessingLog(Base):
     __tablename__ = "processing_logs"
+    __table_args__ = (
+        Index('idx_processing_logs_failed', 'application_id', 'created_at', postgresql_where=text("status = 'failed'")),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+    
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Plain columns without foreign keys: logs are append-only and must never fail on
+    # referential checks; the agents only log against applications/documents they hold
+    application_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    document_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True))
+    agent_name: Mapped[str] = mapped_column(String(50), nullable=False, index=True)  # 'ingestion', 'extraction', 'validation'
+    step_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)  # 'started', 'completed', 'failed', 'skipped'
+    message: Mapped[Optional[str]] = mapped_column(Text)
+    error_code: Mapped[Optional[str]] = mapped_column(String(64))  # Promoted from error_details['code']
+    error_stack_hash: Mapped[Optional[str]] = mapped_column(String(16))  # Fingerprint of error code + message
+    error_details: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB)  # Remaining free-form error context
+    processing_time_ms: Mapped[Optional[int]] = mapped_column(Integer)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, server_default=func.now())  # Partition key
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    application_id = Column(String(255), ForeignKey("applications.application_id"), nullable=False, index=True)
-    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id"))
-    agent_name = Column(String(50), nullable=False, index=True)  # 'ingestion', 'extraction', 'validation'
-    step_name = Column(String(100), nullable=False)
-    status = Column(String(20), nullable=False)  # 'started', 'completed', 'failed', 'skipped'
-    message = Column(Text)
-    error_details = Column(JSONB)
-    processing_time_ms = Column(Integer)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # (key, getter) pairs built once at import time and reused by to_dict
+    _FIELDS = (
+        ('id', as_is('id_str')),
+        ('application_id', as_is('application_id')),
+        ('document_id', as_optional_str('document_id')),
+        ('agent_name', as_is('agent_name')),
+        ('step_name', as_is('step_name')),
+        ('status', as_is('status')),
+        ('message', as_is('message')),
+        ('error_code', as_is('error_code')),
+        ('error_stack_hash', as_is('error_stack_hash')),
+        ('error_details', as_is('error_details')),
+        ('processing_time_ms', as_is('processing_time_ms')),
+        ('created_at', as_is('created_at'))
+    )
     
-    def __repr__(self):
-        return f"<ProcessingLog(agent='{self.agent_name}', step='{self.step_name}', status='{self.status}')>"
+    _REPR_TEMPLATE = "<ProcessingLog(agent='{}', step='{}', status='{}')>"
+    _REPR_KEYS = ('agent_name', 'step_name', 'status')
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
-            'id': str(self.id),
-            'application_id': self.application_id,
-            'document_id': str(self.document_id) if self.document_id else None,
-            'agent_name': self.agent_name,
-            'step_name': self.step_name,
-            'status': self.status,
-            'message': self.message,
-            'error_details': self.error_details,
-            'processing_time_ms': self.processing_time_ms,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+        return {key: getter(self) for key, getter in self._FIELDS}
     
     def is_successful(self) -> bool:
         """Check if log represents successful operation"""
@@ -58,43 +100,16 @@ class ProcessingLog(Base):
     
     def get_status_color(self) -> str:
         """Get color code for status display"""
-        color_map = {
-            'started': 'blue',
-            'completed': 'green',
-            'failed': 'red',
-            'skipped': 'yellow'
-        }
-        return color_map.get(self.status, 'gray')
+        return _STATUS_COLOR.get(self.status, 'gray')
     
     def get_agent_display_name(self) -> str:
         """Get human-readable agent name"""
-        agent_map = {
-            'ingestion': 'Document Ingestion Agent',
-            'extraction': 'Data Extraction Agent',
-            'validation': 'Data Validation Agent',
-        }
-        return agent_map.get(self.agent_name, self.agent_name.title())
+        return _AGENT_DISPLAY.get(self.agent_name, self.agent_name.title())
     
     def get_status_display(self) -> str:
         """Get human-readable status"""
-        status_map = {
-            'started': 'Started',
-            'completed': 'Completed',
-            'failed': 'Failed',
-            'skipped': 'Skipped'
-        }
-        return status_map.get(self.status, 'Unknown')
+        return _STATUS_DISPLAY.get(self.status, 'Unknown')
     
     def get_processing_time_display(self) -> str:
         """Get human-readable processing time"""
-        if not self.processing_time_ms:
-            return 'N/A'
-        
-        if self.processing_time_ms < 1000:
-            return f"{self.processing_time_ms}ms"
-        elif self.processing_time_ms < 60000:
-            return f"{self.processing_time_ms / 1000:.1f}s"
-        else:
-            minutes = self.processing_time_ms // 60000
-            seconds = (self.processing_time_ms % 60000) / 1000
-            return f"{minutes}m {seconds:.1f}s"
+        return get_processing_time_display_fast(self.processing_time_ms)
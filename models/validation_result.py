@@ -3,58 +3,112 @@ Validation Result Model
 Represents validation results from the Data Validation Agent
 """
 
-from sqlalchemy import Column, String, DateTime, Numeric, Text, Boolean, ForeignKey
+from sqlalchemy import String, DateTime, Numeric, SmallInteger, Text, Boolean, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Mapped, mapped_column, validates
 from sqlalchemy.sql import func
+from datetime import datetime
+from decimal import Decimal
 import uuid
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 
-Base = declarative_base()
+from .base import Base
+from ._fields import as_is, as_optional_str, as_optional_float, cached_to_dict
+
+
+# Ordered severity levels stored in severity_level; index = level
+SEVERITY_LOW = 0
+SEVERITY_MEDIUM = 1
+SEVERITY_HIGH = 2
+SEVERITY_CRITICAL = 3
+_SEVERITY_NAMES = ('low', 'medium', 'high', 'critical')
+_SEVERITY_LEVELS = MappingProxyType({name: level for level, name in enumerate(_SEVERITY_NAMES)})
+
+_STATUS_COLOR = MappingProxyType({
+    'validated': 'green',
+    'mismatch': 'red',
+    'missing': 'orange',
+    'pending': 'yellow'
+})
+
+_SEVERITY_COLOR = MappingProxyType({
+    'critical': 'red',
+    'high': 'orange',
+    'medium': 'yellow',
+    'low': 'blue'
+})
+
+_STATUS_DISPLAY = MappingProxyType({
+    'validated': 'Validated',
+    'mismatch': 'Mismatch Found',
+    'missing': 'Missing Document',
+    'pending': 'Pending Validation'
+})
+
+_SEVERITY_DISPLAY = MappingProxyType({
+    'critical': 'Critical',
+    'high': 'High',
+    'medium': 'Medium',
+    'low': 'Low'
+})
 
 class ValidationResult(Base):
     __tablename__ = "validation_results"
+    __table_args__ = (
+        Index('idx_validation_results_flagged', 'application_id', postgresql_where=text("flag_for_review = true")),
+    )
+    
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    application_id: Mapped[str] = mapped_column(String(255), ForeignKey("applications.application_id"), nullable=False, index=True)
+    field_name: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    application_value: Mapped[Optional[str]] = mapped_column(Text)
+    document_value: Mapped[Optional[str]] = mapped_column(Text)
+    document_type: Mapped[Optional[str]] = mapped_column(String(100))
+    document_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("documents.id"))
+    validation_status: Mapped[str] = mapped_column(String(20), nullable=False, index=True)  # 'validated', 'mismatch', 'missing', 'pending'
+    mismatch_type: Mapped[Optional[str]] = mapped_column(String(50))  # 'value_difference', 'format_difference', 'missing_document'
+    mismatch_severity: Mapped[Optional[str]] = mapped_column(String(20))  # 'low', 'medium', 'high', 'critical'
+    severity_level: Mapped[Optional[int]] = mapped_column(SmallInteger, index=True)  # SEVERITY_* level derived from mismatch_severity
+    discrepancy_percentage: Mapped[Optional[Decimal]] = mapped_column(Numeric(5, 2))
+    confidence_score_pct: Mapped[Optional[int]] = mapped_column(SmallInteger)  # 0-100
+    flag_for_review: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    validation_notes: Mapped[Optional[str]] = mapped_column(Text)
+    validated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    agent_version: Mapped[Optional[str]] = mapped_column(String(20), default='1.0')
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    application_id = Column(String(255), ForeignKey("applications.application_id"), nullable=False, index=True)
-    field_name = Column(String(100), nullable=False, index=True)
-    application_value = Column(Text)
-    document_value = Column(Text)
-    document_type = Column(String(100))
-    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id"))
-    validation_status = Column(String(20), nullable=False, index=True)  # 'validated', 'mismatch', 'missing', 'pending'
-    mismatch_type = Column(String(50))  # 'value_difference', 'format_difference', 'missing_document'
-    mismatch_severity = Column(String(20), index=True)  # 'low', 'medium', 'high', 'critical'
-    discrepancy_percentage = Column(Numeric(5, 2))
-    confidence_score = Column(Numeric(3, 2))
-    flag_for_review = Column(Boolean, default=False, index=True)
-    validation_notes = Column(Text)
-    validated_at = Column(DateTime(timezone=True), server_default=func.now())
-    agent_version = Column(String(20), default='1.0')
+    # (key, getter) pairs built once at import time and reused by to_dict
+    _FIELDS = (
+        ('id', as_is('id_str')),
+        ('application_id', as_is('application_id')),
+        ('field_name', as_is('field_name')),
+        ('application_value', as_is('application_value')),
+        ('document_value', as_is('document_value')),
+        ('document_type', as_is('document_type')),
+        ('document_id', as_optional_str('document_id')),
+        ('validation_status', as_is('validation_status')),
+        ('mismatch_type', as_is('mismatch_type')),
+        ('mismatch_severity', as_is('mismatch_severity')),
+        ('severity_level', as_is('severity_level')),
+        ('discrepancy_percentage', as_optional_float('discrepancy_percentage')),
+        ('confidence_score', as_optional_float('confidence_score')),
+        ('flag_for_review', as_is('flag_for_review')),
+        ('validation_notes', as_is('validation_notes')),
+        ('validated_at', as_is('validated_at')),
+        ('agent_version', as_is('agent_version'))
+    )
     
-    def __repr__(self):
-        return f"<ValidationResult(field='{self.field_name}', status='{self.validation_status}', severity='{self.mismatch_severity}')>"
+    _REPR_TEMPLATE = "<ValidationResult(field='{}', status='{}', severity='{}')>"
+    _REPR_KEYS = ('field_name', 'validation_status', 'mismatch_severity')
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
-            'id': str(self.id),
-            'application_id': self.application_id,
-            'field_name': self.field_name,
-            'application_value': self.application_value,
-            'document_value': self.document_value,
-            'document_type': self.document_type,
-            'document_id': str(self.document_id) if self.document_id else None,
-            'validation_status': self.validation_status,
-            'mismatch_type': self.mismatch_type,
-            'mismatch_severity': self.mismatch_severity,
-            'discrepancy_percentage': float(self.discrepancy_percentage) if self.discrepancy_percentage else None,
-            'confidence_score': float(self.confidence_score) if self.confidence_score else None,
-            'flag_for_review': self.flag_for_review,
-            'validation_notes': self.validation_notes,
-            'validated_at': self.validated_at.isoformat() if self.validated_at else None,
-            'agent_version': self.agent_version
-        }
+        return cached_to_dict(self)
+    
+    @property
+    def confidence_score(self) -> Optional[float]:
+        """Get confidence score as a 0-1 fraction"""
+        return self.confidence_score_pct / 100.0 if self.confidence_score_pct is not None else None
     
     def is_validated(self) -> bool:
         """Check if validation passed"""
@@ -64,50 +118,36 @@ class ValidationResult(Base):
         """Check if there's a mismatch"""
         return self.validation_status == 'mismatch'
     
+    @validates('mismatch_severity')
+    def _sync_severity_level(self, key: str, mismatch_severity: Optional[str]) -> Optional[str]:
+        """Keep severity_level in step with the mismatch_severity name"""
+        self.severity_level = _SEVERITY_LEVELS.get(mismatch_severity)
+        return mismatch_severity
+    
+    def get_severity_name(self) -> Optional[str]:
+        """Get severity name from severity_level"""
+        return _SEVERITY_NAMES[self.severity_level] if self.severity_level is not None else None
+    
     def is_critical_mismatch(self) -> bool:
         """Check if mismatch is critical"""
-        return self.mismatch_severity == 'critical'
+        return self.severity_level == SEVERITY_CRITICAL
     
     def is_high_priority_mismatch(self) -> bool:
         """Check if mismatch is high priority"""
-        return self.mismatch_severity in ['critical', 'high']
+        return self.severity_level is not None and self.severity_level >= SEVERITY_HIGH
     
     def get_status_color(self) -> str:
         """Get color code for status display"""
-        color_map = {
-            'validated': 'green',
-            'mismatch': 'red',
-            'missing': 'orange',
-            'pending': 'yellow'
-        }
-        return color_map.get(self.validation_status, 'gray')
+        return _STATUS_COLOR.get(self.validation_status, 'gray')
     
     def get_severity_color(self) -> str:
         """Get color code for severity display"""
-        color_map = {
-            'critical': 'red',
-            'high': 'orange',
-            'medium': 'yellow',
-            'low': 'blue'
-        }
-        return color_map.get(self.mismatch_severity, 'gray')
+        return _SEVERITY_COLOR.get(self.mismatch_severity, 'gray')
     
     def get_status_display(self) -> str:
         """Get human-readable validation status"""
-        status_map = {
-            'validated': 'Validated',
-            'mismatch': 'Mismatch Found',
-            'missing': 'Missing Document',
-            'pending': 'Pending Validation'
-        }
-        return status_map.get(self.validation_status, 'Unknown')
+        return _STATUS_DISPLAY.get(self.validation_status, 'Unknown')
     
     def get_severity_display(self) -> str:
         """Get human-readable severity level"""
-        severity_map = {
-            'critical': 'Critical',
-            'high': 'High',
-            'medium': 'Medium',
-            'low': 'Low'
-        }
-        return severity_map.get(self.mismatch_severity, 'Unknown')
+        return _SEVERITY_DISPLAY.get(self.mismatch_severity, 'Unknown')
@@ -3,6 +3,12 @@ Document Processing Orchestrator
 Main orchestrator that coordinates all four agents in the document processing pipeline
 """
 
+import asyncio
+import heapq
+import logging
+import time
+from operator import itemgetter
+from types import MappingProxyType
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
@@ -11,10 +17,28 @@ from agents.data_extraction_agent import DataExtractionAgent
 from agents.data_validation_agent import DataValidationAgent
 from services.database_service import DatabaseService
 from services.job_queue_service import JobQueueService
+from services.textract_service import shutdown_executor as shutdown_textract_executor
+from config.document_config import get_compiled_document_config
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# How long get_processing_metrics serves a cached snapshot
+METRICS_CACHE_TTL_SECONDS = 5
+
+# Extraction job priority per document type (1 = highest)
+_PRIORITY_MAP = MappingProxyType({
+    'mortgage_application': 1,
+    't4_form': 2,
+    'employment_letter': 2,
+    'bank_statement': 3,
+    'pay_stub': 3,
+    'credit_report': 4,
+    'property_assessment': 4,
+    'insurance_document': 5,
+    'generic_document': 6
+})
+
 class DocumentProcessingOrchestrator:
     """
     Main orchestrator that coordinates the four-agent document processing pipeline:
@@ -25,43 +49,21 @@ class DocumentProcessingOrchestrator:
     
     def __init__(self):
         try:
-            logger.info("=== ORCHESTRATOR DEBUG: Initializing orchestrator ===")
-            print("=== ORCHESTRATOR DEBUG: Initializing orchestrator ===")
-            
-            logger.info("=== ORCHESTRATOR DEBUG: Initializing database service ===")
-            print("=== ORCHESTRATOR DEBUG: Initializing database service ===")
+            logger.debug("Initializing orchestrator")
             self.db_service = DatabaseService()
-            
-            logger.info("=== ORCHESTRATOR DEBUG: Initializing ingestion agent ===")
-            print("=== ORCHESTRATOR DEBUG: Initializing ingestion agent ===")
             self.ingestion_agent = DocumentIngestionAgent()
-            
-            logger.info("=== ORCHESTRATOR DEBUG: Initializing extraction agent ===")
-            print("=== ORCHESTRATOR DEBUG: Initializing extraction agent ===")
             self.extraction_agent = DataExtractionAgent()
-            
-            logger.info("=== ORCHESTRATOR DEBUG: Initializing validation agent ===")
-            print("=== ORCHESTRATOR DEBUG: Initializing validation agent ===")
             self.validation_agent = DataValidationAgent()
-            
-            
-            logger.info("=== ORCHESTRATOR DEBUG: Initializing job queue service ===")
-            print("=== ORCHESTRATOR DEBUG: Initializing job queue service ===")
             self.job_queue_service = JobQueueService(
                 ingestion_agent=self.ingestion_agent,
                 extraction_agent=self.extraction_agent,
                 validation_agent=self.validation_agent
             )
-            
-            logger.info("=== ORCHESTRATOR DEBUG: Orchestrator initialized successfully ===")
-            print("=== ORCHESTRATOR DEBUG: Orchestrator initialized successfully ===")
+            self._metrics_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+            logger.info("Orchestrator initialized successfully")
             
         except Exception as e:
-            logger.error(f"=== ORCHESTRATOR ERROR: Failed to initialize orchestrator: {str(e)} ===")
-            print(f"=== ORCHESTRATOR ERROR: Failed to initialize orchestrator: {str(e)} ===")
-            import traceback
-            logger.error(f"=== ORCHESTRATOR TRACEBACK: {traceback.format_exc()} ===")
-            print(f"=== ORCHESTRATOR TRACEBACK: {traceback.format_exc()} ===")
+            logger.exception("Failed to initialize orchestrator: %s", e)
             raise
     
     async def create_application(self, application_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -75,7 +77,7 @@ class DocumentProcessingOrchestrator:
             Dict with creation result
         """
         try:
-            logger.info(f"Creating application: {application_data['application_id']}")
+            logger.info("Creating application: %s", application_data['application_id'])
             
             # Create application record in database
             app_id = await self.db_service.create_application(application_data)
@@ -96,7 +98,7 @@ class DocumentProcessingOrchestrator:
             }
             
         except Exception as e:
-            logger.error(f"Error creating application: {str(e)}")
+            logger.error("Error creating application: %s", e, exc_info=True)
             return {
                 "success": False,
                 "error": str(e),
@@ -116,7 +118,7 @@ class DocumentProcessingOrchestrator:
         try:
             return await self.db_service.get_application(application_id)
         except Exception as e:
-            logger.error(f"Error getting application: {str(e)}")
+            logger.error("Error getting application: %s", e, exc_info=True)
             return None
         
     async def process_application_documents(
@@ -139,28 +141,26 @@ class DocumentProcessingOrchestrator:
         start_time = datetime.now()
         
         try:
-            logger.info(f"Starting document processing for application {application_id}")
+            logger.info("Starting document processing for application %s", application_id)
             
             # Step 0: Create application if it doesn't exist
-            existing_app = await self.db_service.get_application(application_id)
-            if not existing_app:
-                logger.info(f"Creating new application: {application_id}")
-                app_data = {
-                    "application_id": application_id,
-                    "applicant_name": "Unknown",  # Will be updated when we extract data
-                    "application_type": "mortgage",
-                    "status": "document_upload",
-                    "meta_data": {"created_via": "document_upload"}
-                }
-                await self.db_service.create_application(app_data)
-                logger.info(f"Application {application_id} created successfully")
+            app_data = {
+                "application_id": application_id,
+                "applicant_name": "Unknown",  # Will be updated when we extract data
+                "application_type": "mortgage",
+                "status": "document_upload",
+                "meta_data": {"created_via": "document_upload"}
+            }
+            _, created = await self.db_service.get_or_create_application(app_data)
+            if created:
+                logger.info("Application %s created successfully", application_id)
             
             # Step 1: Document Ingestion
-            logger.info(f"Calling ingestion agent with {len(files)} files for application {application_id}")
+            logger.info("Calling ingestion agent with %s files for application %s", len(files), application_id)
             ingestion_result = await self.ingestion_agent.process_multiple_documents(
                 files, application_id, applicant_type
             )
-            logger.info(f"Ingestion result: {ingestion_result}")
+            logger.info("Ingestion result: %s", ingestion_result)
             
             if not ingestion_result["success"]:
                 return {
@@ -186,7 +186,7 @@ class DocumentProcessingOrchestrator:
             processing_time = (datetime.now() - start_time).total_seconds() * 1000
             error_msg = f"Document processing failed: {str(e)}"
             
-            logger.error(f"Orchestrator error: {error_msg}")
+            logger.error("Orchestrator error: %s", error_msg, exc_info=True)
             return {
                 "success": False,
                 "error": error_msg,
@@ -200,50 +200,55 @@ class DocumentProcessingOrchestrator:
             # Get documents for the application
             documents = await self.db_service.get_documents_by_application(application_id)
             
-            # Create extraction jobs for each document
-            for document in documents:
-                if document["processing_status"] == "pending":
-                    await self.job_queue_service.add_extraction_job(
-                        application_id, 
-                        document["id"], 
-                        priority=self._get_document_priority(document["document_type"])
-                    )
+            # Create extraction jobs for the pending documents in one insert
+            jobs = [
+                (application_id, document["id"], self._get_document_priority(document["document_type"]))
+                for document in documents
+                if document["processing_status"] == "pending"
+            ]
+            if jobs:
+                await self.job_queue_service.add_extraction_jobs_bulk(jobs)
             
-            logger.info(f"Started background processing for application {application_id}")
+            logger.info("Started background processing for application %s", application_id)
             
         except Exception as e:
-            logger.error(f"Error starting background processing: {str(e)}")
+            logger.error("Error starting background processing: %s", e, exc_info=True)
     
     def _get_document_priority(self, document_type: str) -> int:
         """Get priority for document processing"""
-        priority_map = {
-            'mortgage_application': 1,  # Highest priority
-            't4_form': 2,
-            'employment_letter': 2,
-            'bank_statement': 3,
-            'pay_stub': 3,
-            'credit_report': 4,
-            'property_assessment': 4,
-            'insurance_document': 5,
-            'generic_document': 6  # Lowest priority
-        }
-        return priority_map.get(document_type, 5)
+        return _PRIORITY_MAP.get(document_type, 5)
     
     async def get_processing_status(self, application_id: str) -> Dict[str, Any]:
         """Get comprehensive processing status for an application"""
         try:
-            # Get application status
-            application = await self.db_service.get_application(application_id)
+            # Fetch application, per-agent and job status concurrently
+            application, ingestion_status, extraction_status, validation_status, job_status = await asyncio.gather(
+                self.db_service.get_application(application_id),
+                self.ingestion_agent.get_upload_status(application_id),
+                self.extraction_agent.get_extraction_status(application_id),
+                self.validation_agent.get_validation_status(application_id),
+                self.job_queue_service.get_job_status(application_id),
+                return_exceptions=True
+            )
+            
+            if isinstance(application, BaseException):
+                raise application
             if not application:
                 return {"error": "Application not found"}
             
-            # Get status from each agent
-            ingestion_status = await self.ingestion_agent.get_upload_status(application_id)
-            extraction_status = await self.extraction_agent.get_extraction_status(application_id)
-            validation_status = await self.validation_agent.get_validation_status(application_id)
-            
-            # Get job status
-            job_status = await self.job_queue_service.get_job_status(application_id)
+            # A failing status source degrades to an empty status instead of failing the whole call
+            statuses = []
+            for name, status in (
+                ("ingestion", ingestion_status),
+                ("extraction", extraction_status),
+                ("validation", validation_status),
+                ("job", job_status)
+            ):
+                if isinstance(status, BaseException):
+                    logger.error("Error getting %s status: %s", name, status, exc_info=status)
+                    status = {}
+                statuses.append(status)
+            ingestion_status, extraction_status, validation_status, job_status = statuses
             
             # Calculate overall progress
             overall_progress = self._calculate_overall_progress(
@@ -264,7 +269,7 @@ class DocumentProcessingOrchestrator:
             }
             
         except Exception as e:
-            logger.error(f"Error getting processing status: {str(e)}")
+            logger.error("Error getting processing status: %s", e, exc_info=True)
             return {
                 "application_id": application_id,
                 "error": str(e)
@@ -311,7 +316,7 @@ class DocumentProcessingOrchestrator:
             }
             
         except Exception as e:
-            logger.error(f"Error calculating overall progress: {str(e)}")
+            logger.error("Error calculating overall progress: %s", e, exc_info=True)
             return {
                 "completion_percentage": 0,
                 "current_stage": "error",
@@ -323,52 +328,31 @@ class DocumentProcessingOrchestrator:
             }
     
     
-    async def get_field_status(self, application_id: str) -> Dict[str, Any]:
-        """Get detailed field extraction and validation status"""
-        print(f"DEBUG: get_field_status called for application_id: {application_id}")
+    async def _compute_field_state(self, application_id: str, refresh: bool = False) -> Dict[str, Any]:
+        """Get the (briefly cached) field summary, rebuilding it when asked or not yet written"""
+        summary = None if refresh else await self.db_service.get_field_summary(application_id)
+        if summary is None:
+            summary = await self.db_service.refresh_field_summary(application_id)
+        return summary
+    
+    async def get_field_status(self, application_id: str, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Get detailed field extraction and validation status
+        
+        Args:
+            application_id: Application identifier
+            refresh: Rebuild the materialized field summary from extracted_data first
+            
+        Returns:
+            Dict with field statistics, extracted fields and their sources
+        """
         try:
-            print(f"DEBUG: Starting get_field_status for {application_id}")
-            # Get all extracted data for the application
-            print(f"DEBUG: Getting extracted data for {application_id}")
-            extracted_data = await self.db_service.get_extracted_data_by_application(application_id)
-            print(f"DEBUG: Extracted data count: {len(extracted_data) if extracted_data else 0}")
-            
-            # Skip golden data for now - focus on extracted fields
-            print(f"DEBUG: Skipping golden data for now")
-            golden_data = None
-            
-            # Get validation results
-            validation_query = """
-            SELECT * FROM validation_results 
-            WHERE application_id = :application_id 
-            ORDER BY validated_at DESC LIMIT 1
-            """
-            validation_results = await self.db_service.execute_query(validation_query, {"application_id": application_id})
-            
-            # Aggregate all extracted fields
-            all_extracted_fields = {}
-            field_sources = {}
-            
-            for data in extracted_data:
-                if data.get('extracted_fields'):
-                    # Parse extracted_fields JSON string
-                    import json
-                    if isinstance(data['extracted_fields'], str):
-                        fields_list = json.loads(data['extracted_fields'])
-                    else:
-                        fields_list = data['extracted_fields']
-                    
-                    # extracted_fields is stored as a list of field objects
-                    for field_data in fields_list:
-                        field_name = field_data.get('field_name')
-                        if field_name:
-                            all_extracted_fields[field_name] = field_data
-                            field_sources[field_name] = {
-                                'document_type': data['document_type'],
-                                'document_id': data['document_id'],
-                                'confidence': field_data.get('confidence', 0),
-                                'extraction_method': data['extraction_method']
-                            }
+            summary = await self._compute_field_state(application_id, refresh)
+            
+            all_extracted_fields = summary['extracted_fields']
+            field_sources = summary['field_sources']
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Extracted field count for %s: %s", application_id, summary['total_extracted'])
             
             # Skip golden fields for now
             golden_fields = {}
@@ -377,7 +361,7 @@ class DocumentProcessingOrchestrator:
             validation_summary = {}
             
             # Calculate field statistics
-            total_extracted = len(all_extracted_fields)
+            total_extracted = summary['total_extracted']
             total_golden = 0  # Skip golden fields for now
             
             # Skip validation for now - focus on extracted fields
@@ -400,7 +384,7 @@ class DocumentProcessingOrchestrator:
             }
             
         except Exception as e:
-            logger.error(f"Error getting field status: {str(e)}")
+            logger.error("Error getting field status: %s", e, exc_info=True)
             return {
                 "application_id": application_id,
                 "error": str(e)
@@ -411,44 +395,41 @@ class DocumentProcessingOrchestrator:
         try:
             # Get uploaded documents
             uploaded_docs = await self.db_service.get_documents_by_application(application_id)
-            uploaded_types = {doc['document_type'] for doc in uploaded_docs}
+            # Earliest upload per type (rows are ordered by uploaded_at, so later ones are overwritten)
+            uploaded_by_type = {doc['document_type']: doc for doc in reversed(uploaded_docs)}
             
-            # Get required document types from config
-            from config.document_config import DocumentConfig
-            doc_config = DocumentConfig()
+            # Get required document types from the compiled config
+            compiled_config = get_compiled_document_config()
             
             required_docs = []
-            document_types = doc_config.yaml_loader.get_document_types()
-            for doc_type, config in document_types.items():
-                if config.get('mandatory_for_applicant', False):
-                    status = "uploaded" if doc_type in uploaded_types else "missing"
-                    
-                    # Get fields that this document type can provide
-                    queries = config.get('field_extraction', {}).get('queries', [])
-                    available_fields = [query.get('alias') for query in queries if query.get('alias')]
-                    
-                    required_docs.append({
-                        "document_type": doc_type,
-                        "display_name": config.get('display_name', doc_type),
-                        "status": status,
-                        "uploaded_at": next((doc['uploaded_at'] for doc in uploaded_docs if doc['document_type'] == doc_type), None),
-                        "available_fields": available_fields,
-                        "description": config.get('description', ''),
-                        "file_types": config.get('accepted_file_types', ['.pdf', '.jpg', '.png'])
-                    })
+            uploaded_count = 0
+            for template in compiled_config.required_template:
+                doc_type = template["document_type"]
+                uploaded_doc = uploaded_by_type.get(doc_type)
+                if uploaded_doc:
+                    uploaded_count += 1
+                required_docs.append({
+                    "document_type": doc_type,
+                    "display_name": template["display_name"],
+                    "status": "uploaded" if uploaded_doc else "missing",
+                    "uploaded_at": uploaded_doc['uploaded_at'] if uploaded_doc else None,
+                    "available_fields": list(template["available_fields"]),
+                    "description": template["description"],
+                    "file_types": list(template["file_types"])
+                })
             
             return {
                 "application_id": application_id,
                 "required_documents": required_docs,
                 "summary": {
                     "total_required": len(required_docs),
-                    "uploaded": len([doc for doc in required_docs if doc['status'] == 'uploaded']),
-                    "missing": len([doc for doc in required_docs if doc['status'] == 'missing'])
+                    "uploaded": uploaded_count,
+                    "missing": len(required_docs) - uploaded_count
                 }
             }
             
         except Exception as e:
-            logger.error(f"Error getting required documents: {str(e)}")
+            logger.error("Error getting required documents: %s", e, exc_info=True)
             return {
                 "application_id": application_id,
                 "error": str(e)
@@ -457,67 +438,50 @@ class DocumentProcessingOrchestrator:
     async def get_missing_fields(self, application_id: str) -> Dict[str, Any]:
         """Get list of missing fields and which documents can provide them"""
         try:
-            # Get current field status
-            field_status = await self.get_field_status(application_id)
-            if "error" in field_status:
-                return field_status
-            
-            # Get all possible fields from config
-            from config.document_config import DocumentConfig
-            doc_config = DocumentConfig()
-            
-            all_possible_fields = set()
-            field_to_documents = {}
-            document_types = doc_config.yaml_loader.get_document_types()
-            
-            for doc_type, config in document_types.items():
-                queries = config.get('field_extraction', {}).get('queries', [])
-                for query in queries:
-                    field_name = query.get('alias')
-                    if field_name:
-                        all_possible_fields.add(field_name)
-                        if field_name not in field_to_documents:
-                            field_to_documents[field_name] = []
-                        field_to_documents[field_name].append({
-                            'document_type': doc_type,
-                            'display_name': config.get('display_name', doc_type),
-                            'priority': 'high' if config.get('mandatory_for_applicant', False) else 'medium'
-                        })
+            # Get current field state (shared with get_field_status)
+            field_state = await self._compute_field_state(application_id)
+            
+            # Get all possible fields from the compiled config
+            compiled_config = get_compiled_document_config()
+            all_possible_fields = compiled_config.all_possible_fields
+            field_to_documents = compiled_config.field_to_documents
             
             # Find missing fields
-            extracted_fields = field_status.get('extracted_fields', {})
+            extracted_fields = field_state['extracted_fields']
             missing_fields = []
+            critical_count = 0
             
-            for field_name in all_possible_fields:
-                if field_name not in extracted_fields:
-                    # Get documents that can provide this field
-                    available_documents = field_to_documents.get(field_name, [])
-                    
-                    missing_fields.append({
-                        "field_name": field_name,
-                        "field_display_name": field_name.replace('_', ' ').title(),
-                        "field_type": "text",  # Could be enhanced to get from config
-                        "available_documents": available_documents,
-                        "priority": "high" if any(doc['priority'] == 'high' for doc in available_documents) else "medium",
-                        "is_critical": any(doc['priority'] == 'high' for doc in available_documents)
-                    })
+            for field_name in all_possible_fields - extracted_fields.keys():
+                # Get documents that can provide this field (high priority first)
+                available_documents = list(field_to_documents.get(field_name, ()))
+                is_critical = bool(available_documents) and available_documents[0]['priority'] == 'high'
+                critical_count += is_critical
+                
+                missing_fields.append({
+                    "field_name": field_name,
+                    "field_display_name": field_name.replace('_', ' ').title(),
+                    "field_type": "text",  # Could be enhanced to get from config
+                    "available_documents": available_documents,
+                    "priority": "high" if is_critical else "medium",
+                    "is_critical": is_critical
+                })
             
             # Sort by priority
-            missing_fields.sort(key=lambda x: (x['priority'] == 'high', x['is_critical']), reverse=True)
+            missing_fields.sort(key=itemgetter('is_critical'), reverse=True)
             
             return {
                 "application_id": application_id,
                 "missing_fields": missing_fields,
                 "summary": {
                     "total_missing_fields": len(missing_fields),
-                    "critical_missing_fields": len([f for f in missing_fields if f['is_critical']]),
+                    "critical_missing_fields": critical_count,
                     "completion_percentage": ((len(all_possible_fields) - len(missing_fields)) / len(all_possible_fields)) * 100
                 },
                 "recommended_documents": self._get_recommended_documents(missing_fields)
             }
             
         except Exception as e:
-            logger.error(f"Error getting missing fields: {str(e)}")
+            logger.error("Error getting missing fields: %s", e, exc_info=True)
             return {
                 "application_id": application_id,
                 "error": str(e)
@@ -542,11 +506,15 @@ class DocumentProcessingOrchestrator:
                 doc_priority[doc_type]['missing_fields_count'] += 1
                 doc_priority[doc_type]['missing_fields'].append(field['field_name'])
         
-        # Sort by priority and field count
-        recommended = list(doc_priority.values())
-        recommended.sort(key=lambda x: (x['priority'] == 'high', x['missing_fields_count']), reverse=True)
+        # Top 5 by priority, then field count, using one integer rank per document:
+        # the high-priority bonus exceeds any possible field count
+        high_priority_bonus = len(missing_fields) + 1
+        ranked = [
+            (doc['missing_fields_count'] + (high_priority_bonus if doc['priority'] == 'high' else 0), doc)
+            for doc in doc_priority.values()
+        ]
         
-        return recommended[:5]  # Top 5 recommendations
+        return [doc for _, doc in heapq.nlargest(5, ranked, key=itemgetter(0))]
     
     async def retry_processing(self, application_id: str) -> Dict[str, Any]:
         """Retry processing for an application"""
@@ -569,7 +537,7 @@ class DocumentProcessingOrchestrator:
             }
             
         except Exception as e:
-            logger.error(f"Error retrying processing: {str(e)}")
+            logger.error("Error retrying processing: %s", e, exc_info=True)
             return {
                 "success": False,
                 "application_id": application_id,
@@ -581,43 +549,49 @@ class DocumentProcessingOrchestrator:
         try:
             await self.job_queue_service.start_job_processor()
         except Exception as e:
-            logger.error(f"Error starting job processor: {str(e)}")
+            logger.error("Error starting job processor: %s", e, exc_info=True)
     
     async def stop_job_processor(self):
         """Stop the background job processor"""
         try:
             await self.job_queue_service.stop_job_processor()
         except Exception as e:
-            logger.error(f"Error stopping job processor: {str(e)}")
+            logger.error("Error stopping job processor: %s", e, exc_info=True)
+        
+        # No more jobs will run; release the shared Textract I/O threads
+        shutdown_textract_executor()
     
     async def get_processing_metrics(self) -> Dict[str, Any]:
         """Get system-wide processing metrics"""
         try:
-            # Get all applications
-            applications = await self.db_service.get_all_applications()
+            # Serve a recent snapshot; metrics are polled far more often than they change
+            now = time.monotonic()
+            if self._metrics_cache is not None and now - self._metrics_cache[0] < METRICS_CACHE_TTL_SECONDS:
+                return self._metrics_cache[1]
+            
+            # Per-status counts are aggregated in SQL
+            application_counts, job_counts = await asyncio.gather(
+                self.db_service.get_application_status_counts(),
+                self.db_service.get_job_status_counts()
+            )
             
             # Calculate metrics
-            total_applications = len(applications)
-            completed_applications = len([app for app in applications if app["status"] == "completed"])
-            processing_applications = len([app for app in applications if app["status"] == "processing"])
-            failed_applications = len([app for app in applications if app["status"] == "failed"])
-            
-            # Get job metrics
-            pending_jobs = await self.db_service.get_pending_jobs()
-            processing_jobs = len([job for job in pending_jobs if job["status"] == "processing"])
-            failed_jobs = len([job for job in pending_jobs if job["status"] == "failed"])
+            total_applications = sum(application_counts.values())
+            completed_applications = application_counts.get("completed", 0)
             
-            return {
+            metrics = {
                 "total_applications": total_applications,
                 "completed_applications": completed_applications,
-                "processing_applications": processing_applications,
-                "failed_applications": failed_applications,
+                "processing_applications": application_counts.get("processing", 0),
+                "failed_applications": application_counts.get("failed", 0),
                 "completion_rate": (completed_applications / total_applications * 100) if total_applications > 0 else 0,
-                "pending_jobs": len(pending_jobs),
-                "processing_jobs": processing_jobs,
-                "failed_jobs": failed_jobs
+                "pending_jobs": job_counts.get("pending", 0),
+                "processing_jobs": job_counts.get("processing", 0),
+                "failed_jobs": job_counts.get("failed", 0)
             }
+            self._metrics_cache = (now, metrics)
+            return metrics
             
         except Exception as e:
-            logger.error(f"Error getting processing metrics: {str(e)}")
+            logger.error("Error getting processing metrics: %s", e, exc_info=True)
             return {"error": str(e)}
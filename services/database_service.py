@@ -4,15 +4,312 @@ Handles database operations using SQLAlchemy with PostgreSQL
 """
 
 import os
-import json
-from typing import Dict, List, Any, Optional
-from sqlalchemy import create_engine, text
+import asyncio
+import hashlib
+import time
+import functools
+import orjson
+from contextlib import asynccontextmanager
+from typing import Dict, List, Any, AsyncIterator, Optional, Iterable, Iterator, Sequence, Tuple, Union
+from uuid import UUID
+from sqlalchemy import RowMapping, create_engine, event, text, select
+from sqlalchemy.sql.elements import TextClause
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from models.document_job import JOB_STATUS_CODES, JOB_STATUS_NAMES, STATUS_FAILED, STATUS_PENDING, STATUS_PROCESSING
+from models.processing_log import ProcessingLog
+from models._serialization import dump_rows
 from utils.logger import get_logger
+from utils.request_cache import clear_request_cache, request_cached
 
 logger = get_logger(__name__)
 
+# Latest value of every extracted field of an application, one row per field name
+_LATEST_FIELDS_QUERY = """
+SELECT DISTINCT ON (f.field_data ->> 'field_name')
+       f.field_data ->> 'field_name' AS field_name,
+       f.field_data,
+       ed.document_type,
+       ed.document_id,
+       ed.extraction_method
+FROM extracted_data ed
+CROSS JOIN LATERAL jsonb_array_elements(
+    CASE WHEN jsonb_typeof(ed.extracted_fields) = 'array' THEN ed.extracted_fields ELSE '[]'::jsonb END
+) WITH ORDINALITY AS f(field_data, position)
+WHERE ed.application_id = :application_id
+  AND f.field_data ->> 'field_name' <> ''
+ORDER BY f.field_data ->> 'field_name', ed.extracted_at DESC, f.position DESC
+"""
+
+# Column lists for the hot getters. They leave out the JSONB blobs no caller
+# reads (documents.meta_data, extracted_data.raw_response) so those are neither
+# sent over the wire nor decoded.
+_DOCUMENT_COLUMNS = (
+    "id, application_id, document_id, filename, document_type, applicant_type, file_size, "
+    "mime_type, storage_path, content_sha256, upload_status, processing_status, confidence_pct, "
+    "uploaded_at, processed_at"
+)
+_EXTRACTED_DATA_COLUMNS = (
+    "id, document_id, application_id, document_type, extracted_fields, field_count, "
+    "average_confidence_pct, extraction_method, raw_response_block_count, raw_response_page_count, "
+    "page_number, extracted_at, agent_version"
+)
+
+# INSERTs run on every pipeline pass, built once so text() bind parsing is not repeated per call
+_INSERT_APPLICATION = text("""
+INSERT INTO applications (application_id, applicant_name, application_type, status, meta_data)
+VALUES (:application_id, :applicant_name, :application_type, :status, :meta_data)
+RETURNING id
+""")
+
+_INSERT_DOCUMENT = text("""
+INSERT INTO documents (application_id, document_id, filename, document_type, 
+                     applicant_type, file_size, mime_type, storage_path, content_sha256, meta_data)
+VALUES (:application_id, :document_id, :filename, :document_type,
+        :applicant_type, :file_size, :mime_type, :storage_path, :content_sha256, :meta_data)
+RETURNING id
+""")
+
+_INSERT_EXTRACTED_DATA = text("""
+INSERT INTO extracted_data (document_id, application_id, document_type, 
+                          extracted_fields, field_count, average_confidence_pct,
+                          extraction_method, raw_response, raw_response_block_count,
+                          raw_response_page_count, page_number, agent_version)
+VALUES (:document_id, :application_id, :document_type,
+        :extracted_fields, :field_count, :average_confidence_pct,
+        :extraction_method, :raw_response, :raw_response_block_count,
+        :raw_response_page_count, :page_number, :agent_version)
+RETURNING id
+""")
+
+_INSERT_VALIDATION_RESULT = text("""
+INSERT INTO validation_results (application_id, validation_summary, total_fields,
+                              validated_fields, mismatched_fields, missing_fields,
+                              critical_mismatches, high_mismatches, medium_mismatches,
+                              low_mismatches, overall_validation_score, flag_for_review,
+                              validation_notes, agent_version)
+VALUES (:application_id, :validation_summary, :total_fields,
+        :validated_fields, :mismatched_fields, :missing_fields,
+        :critical_mismatches, :high_mismatches, :medium_mismatches,
+        :low_mismatches, :overall_validation_score, :flag_for_review,
+        :validation_notes, :agent_version)
+RETURNING id
+""")
+
+_INSERT_GOLDEN_DATA = text("""
+INSERT INTO golden_data (application_id, golden_fields, field_count,
+                       verified_fields, high_confidence_fields, data_quality_score,
+                       ready_for_decision_engine, data_sources, validation_summary,
+                       agent_version)
+VALUES (:application_id, :golden_fields, :field_count,
+        :verified_fields, :high_confidence_fields, :data_quality_score,
+        :ready_for_decision_engine, :data_sources, :validation_summary,
+        :agent_version)
+RETURNING id
+""")
+
+_INSERT_PROCESSING_LOG = text("""
+INSERT INTO processing_logs (application_id, document_id, agent_name, step_name,
+                           status, message, processing_time_ms, error_code,
+                           error_stack_hash, error_details)
+VALUES (:application_id, :document_id, :agent_name, :step_name,
+        :status, :message, :processing_time_ms, :error_code,
+        :error_stack_hash, :error_details)
+RETURNING id
+""")
+
+_INSERT_DOCUMENT_JOB = text("""
+INSERT INTO document_jobs (application_id, document_id, job_type, status, priority)
+VALUES (:application_id, :document_id, :job_type, :status, :priority)
+RETURNING id
+""")
+
+# Status UPDATEs with one fixed text each; a NULL optional parameter keeps the
+# column's current value, so every call reuses the same prepared statement
+_UPDATE_APPLICATION_STATUS = text("""
+UPDATE applications
+SET status = :status,
+    completion_percentage = COALESCE(:completion_percentage, completion_percentage)
+WHERE application_id = :application_id
+""")
+
+_UPDATE_DOCUMENT_STATUS = text("""
+UPDATE documents
+SET processing_status = :status,
+    meta_data = CASE WHEN CAST(:message AS TEXT) IS NULL THEN meta_data
+                     ELSE jsonb_set(COALESCE(meta_data, '{}'::jsonb), '{status_message}', to_jsonb(CAST(:message AS TEXT)), true)
+                END
+WHERE id = :document_id
+""")
+
+_UPDATE_JOB_STATUS = text("""
+UPDATE document_jobs
+SET status = :status,
+    error_message = COALESCE(:result_data, error_message)
+WHERE id = :job_id
+""")
+
+_FINALIZE_JOBS = text("""
+UPDATE document_jobs j
+SET status = r.status,
+    error_message = COALESCE(r.error_message, j.error_message),
+    completed_at = NOW()
+FROM unnest(
+    CAST(:job_ids AS UUID[]),
+    CAST(:statuses AS CHAR(1)[]),
+    CAST(:errors AS TEXT[])
+) AS r(id, status, error_message)
+WHERE j.id = r.id
+""")
+
+# Job queue pop: lock the next pending jobs (skipping any another worker holds)
+# and flip them to processing. Status literals are inlined so the subquery can
+# use the partial idx_document_jobs_pending index.
+_CLAIM_PENDING_JOBS = text(f"""
+WITH claimed AS (
+    UPDATE document_jobs
+    SET status = '{STATUS_PROCESSING}', started_at = NOW()
+    WHERE (id, created_at) IN (
+        SELECT id, created_at FROM document_jobs
+        WHERE status = '{STATUS_PENDING}'
+        ORDER BY priority ASC, created_at ASC
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING *
+)
+SELECT * FROM claimed ORDER BY priority ASC, created_at ASC
+""")
+
+# Multi-row INSERTs fed with one array parameter per column
+_INSERT_EXTRACTED_DATA_BULK = text("""
+INSERT INTO extracted_data (document_id, application_id, document_type, extracted_fields,
+                            field_count, average_confidence_pct, extraction_method, raw_response,
+                            raw_response_block_count, raw_response_page_count, page_number, agent_version)
+SELECT document_id, application_id, document_type, extracted_fields,
+       field_count, average_confidence_pct, extraction_method, raw_response,
+       raw_response_block_count, raw_response_page_count, page_number, agent_version
+FROM unnest(
+    CAST(:document_ids AS UUID[]),
+    CAST(:application_ids AS VARCHAR[]),
+    CAST(:document_types AS VARCHAR[]),
+    CAST(:extracted_fields AS JSONB[]),
+    CAST(:field_counts AS INTEGER[]),
+    CAST(:average_confidence_pcts AS SMALLINT[]),
+    CAST(:extraction_methods AS VARCHAR[]),
+    CAST(:raw_responses AS JSONB[]),
+    CAST(:raw_response_block_counts AS INTEGER[]),
+    CAST(:raw_response_page_counts AS INTEGER[]),
+    CAST(:page_numbers AS INTEGER[]),
+    CAST(:agent_versions AS VARCHAR[])
+) WITH ORDINALITY AS records(document_id, application_id, document_type, extracted_fields,
+                             field_count, average_confidence_pct, extraction_method, raw_response,
+                             raw_response_block_count, raw_response_page_count, page_number,
+                             agent_version, position)
+ORDER BY position
+RETURNING id
+""")
+
+_INSERT_DOCUMENT_JOBS_BULK = text("""
+INSERT INTO document_jobs (application_id, document_id, job_type, status, priority)
+SELECT application_id, document_id, job_type, status, priority
+FROM unnest(
+    CAST(:application_ids AS VARCHAR[]),
+    CAST(:document_ids AS UUID[]),
+    CAST(:job_types AS VARCHAR[]),
+    CAST(:statuses AS CHAR(1)[]),
+    CAST(:priorities AS INTEGER[])
+) AS jobs(application_id, document_id, job_type, status, priority)
+RETURNING id
+""")
+
+# Rebuilds an application's field summary from its latest extracted values
+_REFRESH_FIELD_SUMMARY = text("""
+INSERT INTO application_field_summary (application_id, extracted_fields, field_sources, total_extracted, updated_at)
+SELECT :application_id,
+       COALESCE(jsonb_object_agg(latest.field_name, latest.field_data), '{}'::jsonb),
+       COALESCE(jsonb_object_agg(latest.field_name, jsonb_build_object(
+           'document_type', latest.document_type,
+           'document_id', latest.document_id,
+           'confidence', COALESCE(latest.field_data -> 'confidence', '0'::jsonb),
+           'extraction_method', latest.extraction_method
+       )), '{}'::jsonb),
+       COUNT(*),
+       NOW()
+FROM (""" + _LATEST_FIELDS_QUERY + """) latest
+ON CONFLICT (application_id) DO UPDATE
+SET extracted_fields = EXCLUDED.extracted_fields,
+    field_sources = EXCLUDED.field_sources,
+    total_extracted = EXCLUDED.total_extracted,
+    updated_at = EXCLUDED.updated_at
+RETURNING *
+""")
+
+# Recently read application_field_summary rows, application_id -> (monotonic time, row).
+# Status pollers and get_missing_fields read the same row back to back.
+FIELD_SUMMARY_CACHE_TTL_SECONDS = 2
+_field_summary_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+def _json_dumps(value: Any) -> str:
+    """Serialize a value bound to a text column as JSON with orjson"""
+    return orjson.dumps(value).decode()
+
+def _encode_jsonb(value: Any) -> bytes:
+    """Encode a JSONB parameter in the binary wire format (version byte + JSON)"""
+    return b'\x01' + orjson.dumps(value)
+
+def _decode_jsonb(data: bytes) -> Any:
+    """Decode a binary-format JSONB value"""
+    return orjson.loads(data[1:])
+
+def _register_jsonb_codec(dbapi_connection, connection_record) -> None:
+    """Let every new asyncpg connection bind dicts/lists to JSONB directly and decode it with orjson"""
+    dbapi_connection.run_async(
+        lambda conn: conn.set_type_codec(
+            'jsonb', encoder=_encode_jsonb, decoder=_decode_jsonb, schema='pg_catalog', format='binary'
+        )
+    )
+
+@functools.lru_cache(maxsize=512)
+def _text(query: str) -> TextClause:
+    """text() for a SQL string, built once per distinct string so repeat calls
+    reuse the same TextClause (and its entry in the compiled-statement cache)"""
+    return text(query)
+
+def _as_statement(query: Union[str, TextClause]) -> TextClause:
+    """Wrap raw SQL in text(), passing prebuilt statements through"""
+    return _text(query) if isinstance(query, str) else query
+
+# One pooled engine per database URL, shared by every DatabaseService
+# instance (orchestrator, agents and job queue each create their own)
+_engines: Dict[str, Any] = {}
+
+def _get_engine(database_url: str):
+    """Get the shared async engine for a database URL, creating it on first use"""
+    engine = _engines.get(database_url)
+    if engine is None:
+        engine = create_async_engine(
+            database_url,
+            echo=False,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "30")),
+            pool_pre_ping=True,
+            pool_recycle=1800,
+            pool_use_lifo=True,  # Reuse the warmest connection; idle extras age out via recycle
+            query_cache_size=2000,  # Compiled-statement cache; room for every distinct statement
+            connect_args={
+                "statement_cache_size": 1024,  # asyncpg server-side prepared statements
+                "prepared_statement_cache_size": 1024,  # SQLAlchemy adapter's per-connection cache
+                "server_settings": {"jit": "off"}  # JIT compile time dominates these short queries
+            }
+        )
+        # Runs after the dialect's own connect setup, replacing its str-only JSONB codec
+        event.listen(engine.sync_engine, "connect", _register_jsonb_codec)
+        _engines[database_url] = engine
+    return engine
+
 class DatabaseService:
     """Service for database operations"""
     
@@ -25,329 +322,666 @@ class DatabaseService:
         if self.database_url.startswith("postgresql://"):
             self.database_url = self.database_url.replace("postgresql://", "postgresql+asyncpg://")
         
-        self.engine = create_async_engine(self.database_url, echo=False)
+        self.engine = _get_engine(self.database_url)
         self.async_session = sessionmaker(
             self.engine, 
             class_=AsyncSession, 
             expire_on_commit=False
         )
     
+    def get_pool_status(self) -> Dict[str, Any]:
+        """Get connection pool usage for the shared engine"""
+        pool = self.engine.pool
+        return {
+            "status": pool.status(),
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow()
+        }
+    
+    @asynccontextmanager
     async def get_session(self):
-        """Get database session"""
+        """Get a database session, closed (connection returned to the pool) when the block exits"""
+        async with self.async_session() as session:
+            yield session
+    
+    @asynccontextmanager
+    async def transaction(self):
+        """Run several operations in one session and transaction; commits on success, rolls back on error"""
         async with self.async_session() as session:
+            async with session.begin():
+                yield session
+    
+    @asynccontextmanager
+    async def listen(self, channel: str, callback):
+        """Keep a pooled connection LISTENing on a NOTIFY channel while the block runs
+        
+        callback(connection, pid, channel, payload) is called by asyncpg for each notification.
+        """
+        async with self.engine.connect() as conn:
+            raw_conn = await conn.get_raw_connection()
+            driver_conn = raw_conn.driver_connection
+            await driver_conn.add_listener(channel, callback)
+            try:
+                yield
+            finally:
+                await driver_conn.remove_listener(channel, callback)
+    
+    @asynccontextmanager
+    async def _use_session(self, session: Optional[AsyncSession] = None):
+        """Yield the caller's session, or a new one scoped to a single call"""
+        if session is not None:
             yield session
+        else:
+            async with self.async_session() as own_session:
+                yield own_session
     
-    async def execute_query(self, query: str, params: Dict = None) -> List[Dict]:
-        """Execute a raw SQL query"""
+    async def execute_query(self, query: Union[str, TextClause], params: Dict = None,
+                            session: Optional[AsyncSession] = None) -> Sequence[RowMapping]:
+        """Execute a raw SQL query and return read-only row mappings (copy with dict() to modify)"""
         try:
-            async with self.async_session() as session:
-                result = await session.execute(text(query), params or {})
-                rows = result.fetchall()
-                return [dict(row._mapping) for row in rows]
+            async with self._use_session(session) as db_session:
+                result = await db_session.execute(_as_statement(query), params or {})
+                return result.mappings().all()
         except Exception as e:
             logger.error(f"Database query error: {str(e)}")
             raise
     
-    async def execute_insert(self, query: str, params: Dict = None) -> Any:
-        """Execute an insert query and return the result"""
+    async def iter_query(self, query: Union[str, TextClause], params: Dict = None) -> AsyncIterator[RowMapping]:
+        """Stream row mappings from a server-side cursor instead of buffering the whole result"""
+        async with self.async_session() as session:
+            result = await session.stream(_as_statement(query), params or {})
+            async for row in result.mappings():
+                yield row
+    
+    async def execute_insert(self, query: Union[str, TextClause], params: Dict = None, session: Optional[AsyncSession] = None) -> Any:
+        """Execute an insert query and return the result; commits unless run in the caller's session"""
         try:
-            async with self.async_session() as session:
-                result = await session.execute(text(query), params or {})
-                await session.commit()
-                # For PostgreSQL with RETURNING clause, get the first row
-                if result.returns_rows:
-                    return result.fetchone()[0]
-                return result.rowcount
+            async with self._use_session(session) as db_session:
+                result = await db_session.execute(_as_statement(query), params or {})
+                # RETURNING id: take the first column without building a Row
+                value = result.scalar() if result.returns_rows else result.rowcount
+                if session is None:
+                    await db_session.commit()
+                clear_request_cache()
+                return value
         except Exception as e:
             logger.error(f"Database insert error: {str(e)}")
             raise
     
-    async def execute_update(self, query: str, params: Dict = None) -> int:
-        """Execute an update query and return affected rows"""
+    async def execute_update(self, query: Union[str, TextClause], params: Dict = None, session: Optional[AsyncSession] = None) -> int:
+        """Execute an update query and return affected rows; commits unless run in the caller's session"""
         try:
-            async with self.async_session() as session:
-                result = await session.execute(text(query), params or {})
-                await session.commit()
+            async with self._use_session(session) as db_session:
+                result = await db_session.execute(_as_statement(query), params or {})
+                if session is None:
+                    await db_session.commit()
+                clear_request_cache()
                 return result.rowcount
         except Exception as e:
             logger.error(f"Database update error: {str(e)}")
             raise
     
+    async def ensure_partitions(self, months_ahead: int = 2) -> None:
+        """Create upcoming monthly partitions and move closed log months to columnar storage"""
+        for table_name in ("processing_logs", "document_jobs"):
+            await self.execute_update(
+                "SELECT ensure_monthly_partitions(:table_name, :months_ahead)",
+                {"table_name": table_name, "months_ahead": months_ahead}
+            )
+        await self.execute_update("SELECT compress_old_log_partitions()")
+    
+    async def run_partition_maintenance(self, interval_seconds: int = 24 * 60 * 60) -> None:
+        """Keep monthly partitions created ahead of time until cancelled"""
+        while True:
+            try:
+                await self.ensure_partitions()
+            except Exception as e:
+                logger.error(f"Partition maintenance error: {str(e)}")
+            await asyncio.sleep(interval_seconds)
+    
     # Application operations
-    async def create_application(self, application_data: Dict[str, Any]) -> str:
+    async def create_application(self, application_data: Dict[str, Any], session: Optional[AsyncSession] = None) -> UUID:
         """Create a new application"""
-        import json
-        
-        # Convert meta_data dict to JSON string
-        params = application_data.copy()
-        if 'meta_data' in params and isinstance(params['meta_data'], dict):
-            params['meta_data'] = json.dumps(params['meta_data'])
-        
+        result = await self.execute_insert(_INSERT_APPLICATION, application_data, session)
+        return result
+    
+    async def get_or_create_application(self, application_data: Dict[str, Any]) -> Tuple[UUID, bool]:
+        """Create an application unless it already exists, in one round trip; returns (id, created)"""
+        # DO NOTHING keeps existing rows untouched (no updated_at trigger); the
+        # second branch returns the existing id when the insert was skipped
         query = """
-        INSERT INTO applications (application_id, applicant_name, application_type, status, meta_data)
-        VALUES (:application_id, :applicant_name, :application_type, :status, :meta_data)
-        RETURNING id
+        WITH inserted AS (
+            INSERT INTO applications (application_id, applicant_name, application_type, status, meta_data)
+            VALUES (:application_id, :applicant_name, :application_type, :status, :meta_data)
+            ON CONFLICT (application_id) DO NOTHING
+            RETURNING id
+        )
+        SELECT id, TRUE AS created FROM inserted
+        UNION ALL
+        SELECT id, FALSE AS created FROM applications
+        WHERE application_id = :application_id AND NOT EXISTS (SELECT 1 FROM inserted)
         """
-        result = await self.execute_insert(query, params)
-        return str(result)
+        try:
+            async with self.async_session() as session:
+                result = await session.execute(_as_statement(query), application_data)
+                row = result.fetchone()
+                if row is None:
+                    # A concurrent insert of the same application_id committed while ours
+                    # waited on the conflict; the statement's snapshot predates it, so
+                    # read the winner's id with a fresh statement
+                    result = await session.execute(
+                        _as_statement("SELECT id, FALSE AS created FROM applications WHERE application_id = :application_id"),
+                        {"application_id": application_data["application_id"]}
+                    )
+                    row = result.fetchone()
+                await session.commit()
+                clear_request_cache()
+                return row[0], bool(row[1])
+        except Exception as e:
+            logger.error(f"Database insert error: {str(e)}")
+            raise
     
+    @request_cached
     async def get_application(self, application_id: str) -> Optional[Dict[str, Any]]:
         """Get application by ID"""
         query = "SELECT * FROM applications WHERE application_id = :application_id"
         results = await self.execute_query(query, {"application_id": application_id})
         return results[0] if results else None
     
-    async def update_application_status(self, application_id: str, status: str, completion_percentage: float = None) -> int:
-        """Update application status"""
-        query = """
-        UPDATE applications 
-        SET status = :status
-        """
-        params = {"application_id": application_id, "status": status}
-        
-        if completion_percentage is not None:
-            query += ", completion_percentage = :completion_percentage"
-            params["completion_percentage"] = completion_percentage
-        
-        query += " WHERE application_id = :application_id"
-        return await self.execute_update(query, params)
+    async def update_application_status(self, application_id: str, status: str, completion_percentage: float = None,
+                                        session: Optional[AsyncSession] = None) -> int:
+        """Update application status (completion_percentage is left unchanged when None)"""
+        params = {
+            "application_id": application_id,
+            "status": status,
+            "completion_percentage": completion_percentage
+        }
+        return await self.execute_update(_UPDATE_APPLICATION_STATUS, params, session)
+    
+    async def get_application_status_counts(self) -> Dict[str, int]:
+        """Get the number of applications per status"""
+        query = "SELECT status, COUNT(*) AS count FROM applications GROUP BY status"
+        rows = await self.execute_query(query)
+        return {row['status']: row['count'] for row in rows}
     
     # Document operations
-    async def create_document(self, document_data: Dict[str, Any]) -> str:
+    async def create_document(self, document_data: Dict[str, Any], session: Optional[AsyncSession] = None) -> UUID:
         """Create a new document record"""
-        import json
+        logger.debug("Creating document with data: %s", document_data)
         
-        logger.info(f"Creating document with data: {document_data}")
-        
-        # Convert metadata dict to JSON string if needed
+        # Accept the legacy 'metadata' key for meta_data
         params = document_data.copy()
-        if 'meta_data' in params and isinstance(params['meta_data'], dict):
-            params['meta_data'] = json.dumps(params['meta_data'])
-        elif 'metadata' in params and isinstance(params['metadata'], dict):
-            params['meta_data'] = json.dumps(params['metadata'])
-            del params['metadata']  # Remove the old key
+        if 'meta_data' not in params and 'metadata' in params:
+            params['meta_data'] = params.pop('metadata')
         
-        query = """
-        INSERT INTO documents (application_id, document_id, filename, document_type, 
-                             applicant_type, file_size, mime_type, storage_path, meta_data)
-        VALUES (:application_id, :document_id, :filename, :document_type,
-                :applicant_type, :file_size, :mime_type, :storage_path, :meta_data)
-        RETURNING id
-        """
+        params.setdefault('content_sha256', None)
         
-        logger.info(f"Executing document insert query with params: {params}")
-        result = await self.execute_insert(query, params)
+        logger.debug("Executing document insert query with params: %s", params)
+        result = await self.execute_insert(_INSERT_DOCUMENT, params, session)
         logger.info(f"Document created successfully with ID: {result}")
-        return str(result)
+        return result
     
+    @request_cached
     async def get_document(self, document_id: str) -> Optional[Dict[str, Any]]:
-        """Get document by ID"""
-        logger.info(f"Looking for document with ID: {document_id}")
-        query = "SELECT * FROM documents WHERE id = :document_id"
-        results = await self.execute_query(query, {"document_id": str(document_id)})
-        logger.info(f"Document lookup result: {len(results)} documents found")
+        """Get document by ID (without meta_data)"""
+        query = f"SELECT {_DOCUMENT_COLUMNS} FROM documents WHERE id = :document_id"
+        results = await self.execute_query(query, {"document_id": document_id})
         if results:
-            logger.info(f"Found document: {results[0]}")
+            logger.debug("Found document: %s", results[0])
         else:
-            logger.warning(f"No document found with ID: {document_id}")
+            logger.warning("No document found with ID: %s", document_id)
         return results[0] if results else None
     
     async def update_document_status(self, document_id: str, status: str, message: str = None) -> int:
-        """Update document processing status"""
-        query = """
-        UPDATE documents 
-        SET processing_status = :status
-        """
-        params = {"document_id": str(document_id), "status": status}
-        
-        if message:
-            query += ", meta_data = meta_data || :message"
-            params["message"] = json.dumps({"status_message": message})
-        
-        query += " WHERE id = :document_id"
-        return await self.execute_update(query, params)
+        """Update document processing status, setting meta_data.status_message when a message is given"""
+        params = {"document_id": document_id, "status": status, "message": message or None}
+        return await self.execute_update(_UPDATE_DOCUMENT_STATUS, params)
     
     async def get_documents_by_application(self, application_id: str) -> List[Dict[str, Any]]:
-        """Get all documents for an application"""
-        query = "SELECT * FROM documents WHERE application_id = :application_id ORDER BY uploaded_at"
+        """Get all documents for an application (without meta_data)"""
+        query = f"SELECT {_DOCUMENT_COLUMNS} FROM documents WHERE application_id = :application_id ORDER BY uploaded_at"
         return await self.execute_query(query, {"application_id": application_id})
     
+    async def clone_extracted_data_by_hash(self, document_id: str) -> int:
+        """
+        Reuse the extraction of an identical, already-processed upload
+        
+        Args:
+            document_id: Document (documents.id) that has not been extracted yet
+            
+        Returns:
+            Number of extracted_data rows cloned; 0 when no earlier upload has the same content hash
+        """
+        # Clone every extracted_data row (one per page for page-by-page
+        # extractions) of the most recent completed twin into a document that
+        # has none yet, then mark it completed and retire its pending extraction jobs
+        query = """
+        WITH target AS (
+            SELECT id, application_id, content_sha256 FROM documents
+            WHERE id = :document_id AND content_sha256 IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM extracted_data e WHERE e.document_id = documents.id)
+        ),
+        source AS (
+            SELECT d.id FROM documents d
+            JOIN target t ON d.content_sha256 = t.content_sha256 AND d.id <> t.id
+            WHERE d.processing_status = 'completed'
+              AND EXISTS (SELECT 1 FROM extracted_data e WHERE e.document_id = d.id)
+            ORDER BY d.processed_at DESC NULLS LAST, d.uploaded_at DESC
+            LIMIT 1
+        ),
+        cloned AS (
+            INSERT INTO extracted_data (document_id, application_id, document_type, extracted_fields,
+                                        field_count, average_confidence_pct, extraction_method, raw_response,
+                                        raw_response_block_count, raw_response_page_count, page_number, agent_version)
+            SELECT t.id, t.application_id, e.document_type, e.extracted_fields,
+                   e.field_count, e.average_confidence_pct, e.extraction_method, e.raw_response,
+                   e.raw_response_block_count, e.raw_response_page_count, e.page_number, e.agent_version
+            FROM extracted_data e
+            JOIN source s ON e.document_id = s.id
+            CROSS JOIN target t
+            RETURNING id
+        ),
+        completed_document AS (
+            UPDATE documents
+            SET processing_status = 'completed',
+                processed_at = NOW(),
+                meta_data = meta_data || jsonb_build_object('reused_extraction_from', (SELECT id FROM source))
+            WHERE id = :document_id AND EXISTS (SELECT 1 FROM cloned)
+        ),
+        retired_jobs AS (
+            UPDATE document_jobs
+            SET status = :completed_status, completed_at = NOW()
+            WHERE document_id = :document_id AND job_type = 'extraction'
+              AND status = :pending_status AND EXISTS (SELECT 1 FROM cloned)
+        )
+        SELECT COUNT(*) FROM cloned
+        """
+        params = {
+            "document_id": document_id,
+            "pending_status": STATUS_PENDING,
+            "completed_status": JOB_STATUS_CODES["completed"]
+        }
+        try:
+            async with self.async_session() as session:
+                result = await session.execute(_as_statement(query), params)
+                cloned_count = result.scalar_one()
+                await session.commit()
+                clear_request_cache()
+                return cloned_count
+        except Exception as e:
+            logger.error(f"Database insert error: {str(e)}")
+            raise
+    
     # Extracted data operations
-    async def create_extracted_data(self, extracted_data: Dict[str, Any]) -> str:
+    async def create_extracted_data(self, extracted_data: Dict[str, Any]) -> UUID:
         """Create extracted data record"""
-        import json
-        
-        # Convert extracted_fields and raw_response to JSON strings
         params = extracted_data.copy()
-        print(f"=== DB DEBUG: raw_response type: {type(params.get('raw_response'))}, value: {str(params.get('raw_response'))[:100]}... ===")
-        if 'extracted_fields' in params and isinstance(params['extracted_fields'], (list, dict)):
-            params['extracted_fields'] = json.dumps(params['extracted_fields'])
-        if 'raw_response' in params and isinstance(params['raw_response'], (list, dict)):
-            print(f"=== DB DEBUG: Converting raw_response to JSON ===")
-            params['raw_response'] = json.dumps(params['raw_response'])
-        print(f"=== DB DEBUG: After conversion, raw_response type: {type(params.get('raw_response'))} ===")
         
-        query = """
-        INSERT INTO extracted_data (document_id, application_id, document_type, 
-                                  extracted_fields, field_count, average_confidence,
-                                  extraction_method, raw_response, page_number, agent_version)
-        VALUES (:document_id, :application_id, :document_type,
-                :extracted_fields, :field_count, :average_confidence,
-                :extraction_method, :raw_response, :page_number, :agent_version)
-        RETURNING id
+        # Promote hot raw_response subfields to their own columns
+        block_count, page_count = self._summarize_raw_response(extracted_data.get('raw_response'))
+        params['raw_response_block_count'] = block_count
+        params['raw_response_page_count'] = page_count
+        params['average_confidence_pct'] = self._to_pct(params.pop('average_confidence', None))
+        
+        result = await self.execute_insert(_INSERT_EXTRACTED_DATA, params)
+        return result
+    
+    async def create_extracted_data_bulk(self, records: List[Dict[str, Any]]) -> List[UUID]:
+        """
+        Create several extracted data records (e.g. one per page) in a single round trip
+        
+        Args:
+            records: Extracted data dicts shaped like create_extracted_data input
+            
+        Returns:
+            List of created record IDs, in input order
         """
-        result = await self.execute_insert(query, params)
-        return str(result)
+        if not records:
+            return []
+        
+        # One array parameter per column, unnested server-side into rows
+        columns = list(zip(*self._extracted_data_records(records)))
+        params = {
+            "document_ids": list(columns[0]),
+            "application_ids": list(columns[1]),
+            "document_types": list(columns[2]),
+            "extracted_fields": list(columns[3]),
+            "field_counts": list(columns[4]),
+            "average_confidence_pcts": list(columns[5]),
+            "extraction_methods": list(columns[6]),
+            "raw_responses": list(columns[7]),
+            "raw_response_block_counts": list(columns[8]),
+            "raw_response_page_counts": list(columns[9]),
+            "page_numbers": list(columns[10]),
+            "agent_versions": list(columns[11])
+        }
+        try:
+            async with self.async_session() as session:
+                result = await session.execute(_INSERT_EXTRACTED_DATA_BULK, params)
+                record_ids = list(result.scalars())
+                await session.commit()
+                return record_ids
+        except Exception as e:
+            logger.error(f"Database insert error: {str(e)}")
+            raise
+    
+    def _extracted_data_records(self, rows: Iterable[Dict[str, Any]]) -> Iterator[Tuple]:
+        """Convert extracted data dicts to row tuples in _INSERT_EXTRACTED_DATA_BULK column order"""
+        for row in rows:
+            raw_response = row.get('raw_response')
+            block_count, page_count = self._summarize_raw_response(raw_response)
+            yield (
+                row['document_id'],
+                row['application_id'],
+                row['document_type'],
+                row.get('extracted_fields', {}),
+                row.get('field_count', 0),
+                self._to_pct(row.get('average_confidence')),
+                row.get('extraction_method', 'textract'),
+                raw_response,
+                block_count,
+                page_count,
+                row.get('page_number'),
+                row.get('agent_version', '1.0')
+            )
     
     async def get_extracted_data_by_application(self, application_id: str) -> List[Dict[str, Any]]:
-        """Get all extracted data for an application"""
-        query = "SELECT * FROM extracted_data WHERE application_id = :application_id ORDER BY extracted_at"
+        """Get all extracted data for an application (without the raw Textract response)"""
+        query = f"SELECT {_EXTRACTED_DATA_COLUMNS} FROM extracted_data WHERE application_id = :application_id ORDER BY extracted_at"
         return await self.execute_query(query, {"application_id": application_id})
     
-    # Validation results operations
-    async def create_validation_result(self, validation_data: Dict[str, Any]) -> str:
-        """Create validation result record"""
-        # Convert JSONB fields to JSON strings
-        params = validation_data.copy()
-        if 'validation_summary' in params and isinstance(params['validation_summary'], (list, dict)):
-            params['validation_summary'] = json.dumps(params['validation_summary'])
-        if 'validated_fields' in params and isinstance(params['validated_fields'], (list, dict)):
-            params['validated_fields'] = json.dumps(params['validated_fields'])
-        if 'mismatched_fields' in params and isinstance(params['mismatched_fields'], (list, dict)):
-            params['mismatched_fields'] = json.dumps(params['mismatched_fields'])
-        if 'missing_fields' in params and isinstance(params['missing_fields'], (list, dict)):
-            params['missing_fields'] = json.dumps(params['missing_fields'])
-        if 'validation_notes' in params and isinstance(params['validation_notes'], (list, dict)):
-            params['validation_notes'] = json.dumps(params['validation_notes'])
+    def iter_extracted_data_by_application(self, application_id: str) -> AsyncIterator[RowMapping]:
+        """Stream extracted data for an application, for callers that make a single pass"""
+        query = f"SELECT {_EXTRACTED_DATA_COLUMNS} FROM extracted_data WHERE application_id = :application_id ORDER BY extracted_at"
+        return self.iter_query(query, {"application_id": application_id})
+    
+    async def get_latest_extracted_fields(self, application_id: str) -> List[Dict[str, Any]]:
+        """Get one row per extracted field name (latest extraction wins) with its source document"""
+        return await self.execute_query(_LATEST_FIELDS_QUERY, {"application_id": application_id})
+    
+    # Application field summary operations
+    async def get_field_summary(self, application_id: str) -> Optional[Dict[str, Any]]:
+        """Get the materialized field summary for an application, served from a short-lived cache"""
+        cached = _field_summary_cache.get(application_id)
+        if cached is not None and time.monotonic() - cached[0] < FIELD_SUMMARY_CACHE_TTL_SECONDS:
+            return cached[1]
         
-        query = """
-        INSERT INTO validation_results (application_id, validation_summary, total_fields,
-                                      validated_fields, mismatched_fields, missing_fields,
-                                      critical_mismatches, high_mismatches, medium_mismatches,
-                                      low_mismatches, overall_validation_score, flag_for_review,
-                                      validation_notes, agent_version)
-        VALUES (:application_id, :validation_summary, :total_fields,
-                :validated_fields, :mismatched_fields, :missing_fields,
-                :critical_mismatches, :high_mismatches, :medium_mismatches,
-                :low_mismatches, :overall_validation_score, :flag_for_review,
-                :validation_notes, :agent_version)
-        RETURNING id
+        query = "SELECT * FROM application_field_summary WHERE application_id = :application_id"
+        results = await self.execute_query(query, {"application_id": application_id})
+        if not results:
+            return None
+        self._cache_field_summary(application_id, results[0])
+        return results[0]
+    
+    def bust_field_summary_cache(self, application_id: str) -> None:
+        """Drop the cached field summary so the next read goes to the database"""
+        _field_summary_cache.pop(application_id, None)
+    
+    @staticmethod
+    def _cache_field_summary(application_id: str, row: Dict[str, Any]) -> None:
+        """Cache a field summary row, pruning expired entries as the cache grows"""
+        now = time.monotonic()
+        if len(_field_summary_cache) >= 1024:
+            for key in [key for key, (cached_at, _) in _field_summary_cache.items()
+                        if now - cached_at >= FIELD_SUMMARY_CACHE_TTL_SECONDS]:
+                del _field_summary_cache[key]
+        _field_summary_cache[application_id] = (now, row)
+    
+    async def refresh_field_summary(self, application_id: str) -> Dict[str, Any]:
         """
-        result = await self.execute_insert(query, params)
-        return str(result)
+        Rebuild the materialized field summary of an application from extracted_data
+        
+        Args:
+            application_id: Application identifier
+            
+        Returns:
+            The refreshed application_field_summary row
+        """
+        try:
+            async with self.async_session() as session:
+                result = await session.execute(_REFRESH_FIELD_SUMMARY, {"application_id": application_id})
+                row = dict(result.fetchone()._mapping)
+                await session.commit()
+                self._cache_field_summary(application_id, row)
+                return row
+        except Exception as e:
+            logger.error(f"Database insert error: {str(e)}")
+            raise
+    
+    async def invalidate_field_summary(self, application_id: str) -> None:
+        """Delete the materialized field summary so the next status read rebuilds it"""
+        self.bust_field_summary_cache(application_id)
+        await self.execute_update(
+            "DELETE FROM application_field_summary WHERE application_id = :application_id",
+            {"application_id": application_id}
+        )
+    
+    # Validation results operations
+    async def create_validation_result(self, validation_data: Dict[str, Any]) -> UUID:
+        """Create validation result record"""
+        result = await self.execute_insert(_INSERT_VALIDATION_RESULT, validation_data)
+        return result
     
     # Golden data operations
-    async def create_golden_data(self, golden_data: Dict[str, Any]) -> str:
+    async def create_golden_data(self, golden_data: Dict[str, Any]) -> UUID:
         """Create golden data record"""
-        # Convert JSONB fields to JSON strings
-        params = golden_data.copy()
-        if 'golden_fields' in params and isinstance(params['golden_fields'], (list, dict)):
-            params['golden_fields'] = json.dumps(params['golden_fields'])
-        if 'verified_fields' in params and isinstance(params['verified_fields'], (list, dict)):
-            params['verified_fields'] = json.dumps(params['verified_fields'])
-        if 'high_confidence_fields' in params and isinstance(params['high_confidence_fields'], (list, dict)):
-            params['high_confidence_fields'] = json.dumps(params['high_confidence_fields'])
-        if 'data_sources' in params and isinstance(params['data_sources'], (list, dict)):
-            params['data_sources'] = json.dumps(params['data_sources'])
-        if 'validation_summary' in params and isinstance(params['validation_summary'], (list, dict)):
-            params['validation_summary'] = json.dumps(params['validation_summary'])
-        
-        query = """
-        INSERT INTO golden_data (application_id, golden_fields, field_count,
-                               verified_fields, high_confidence_fields, data_quality_score,
-                               ready_for_decision_engine, data_sources, validation_summary,
-                               agent_version)
-        VALUES (:application_id, :golden_fields, :field_count,
-                :verified_fields, :high_confidence_fields, :data_quality_score,
-                :ready_for_decision_engine, :data_sources, :validation_summary,
-                :agent_version)
-        RETURNING id
-        """
-        result = await self.execute_insert(query, params)
-        return str(result)
+        result = await self.execute_insert(_INSERT_GOLDEN_DATA, golden_data)
+        return result
     
     
     # Processing logs operations
-    async def create_processing_log(self, log_data: Dict[str, Any]) -> str:
+    async def create_processing_log(self, log_data: Dict[str, Any]) -> UUID:
         """Create processing log record"""
         # Remove agent_version since the table doesn't have this column
         params = log_data.copy()
         params.pop('agent_version', None)
         
-        # Convert error_details to JSON string if it's a dict
-        if 'error_details' in params and isinstance(params['error_details'], dict):
-            params['error_details'] = json.dumps(params['error_details'])
+        # Promote error code/fingerprint to columns, keep the remainder as JSONB
+        error_code, error_stack_hash, error_details = self._split_error_details(params.get('error_details'))
+        params['error_code'] = error_code
+        params['error_stack_hash'] = error_stack_hash
+        params['error_details'] = error_details or None
         
-        query = """
-        INSERT INTO processing_logs (application_id, document_id, agent_name, step_name,
-                                   status, message, processing_time_ms, error_details)
-        VALUES (:application_id, :document_id, :agent_name, :step_name,
-                :status, :message, :processing_time_ms, :error_details)
-        RETURNING id
-        """
-        result = await self.execute_insert(query, params)
-        return str(result)
+        result = await self.execute_insert(_INSERT_PROCESSING_LOG, params)
+        return result
+    
+    async def get_processing_logs_json(self, application_id: str) -> bytes:
+        """Get processing logs for an application serialized as JSON bytes"""
+        table = ProcessingLog.__table__
+        query = (
+            select(table)
+            .where(table.c.application_id == application_id)
+            .order_by(table.c.created_at.desc())
+        )
+        try:
+            async with self.async_session() as session:
+                result = await session.execute(query)
+                return dump_rows(result.all())
+        except Exception as e:
+            logger.error(f"Database query error: {str(e)}")
+            raise
+    
+    @staticmethod
+    def _to_pct(fraction: Optional[float]) -> Optional[int]:
+        """Convert a 0-1 confidence fraction to a 0-100 integer percentage"""
+        if fraction is None:
+            return None
+        return int(round(float(fraction) * 100))
+    
+    @staticmethod
+    def _summarize_raw_response(raw_response: Any) -> tuple:
+        """Get (block_count, page_count) from a Textract response or list of page responses"""
+        if isinstance(raw_response, dict):
+            blocks = raw_response.get('Blocks')
+            pages = raw_response.get('DocumentMetadata', {}).get('Pages')
+            return (len(blocks) if isinstance(blocks, list) else None), pages
+        if isinstance(raw_response, list):
+            block_count = sum(len(page.get('results', {}).get('Blocks', [])) for page in raw_response)
+            return block_count, len(raw_response)
+        return None, None
+    
+    @staticmethod
+    def _split_error_details(error_details: Any) -> tuple:
+        """Split error details into (error_code, error_stack_hash, remaining details)"""
+        if not isinstance(error_details, dict):
+            return None, None, error_details
+        
+        remainder = dict(error_details)
+        error_code = remainder.pop('code', None)
+        fingerprint = f"{error_code or ''}:{remainder.get('exception', '')}"
+        error_stack_hash = hashlib.md5(fingerprint.encode('utf-8')).hexdigest()[:16]
+        return error_code, error_stack_hash, remainder
     
     async def get_pending_jobs(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get pending jobs"""
-        query = """
+        # The status is inlined, not bound, so cached generic plans still
+        # match the partial idx_document_jobs_pending index
+        query = f"""
         SELECT * FROM document_jobs 
-        WHERE status = 'pending' 
+        WHERE status = '{STATUS_PENDING}' 
         ORDER BY priority ASC, created_at ASC 
         LIMIT :limit
         """
-        return await self.execute_query(query, {"limit": limit})
+        jobs = await self.execute_query(query, {"limit": limit})
+        return self._decode_job_statuses(jobs)
+    
+    async def claim_pending_jobs(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Mark up to `limit` pending jobs as processing and return them, in one statement
+        
+        Rows locked by another worker's claim are skipped, so concurrent job
+        processors never receive the same job.
+        
+        Args:
+            limit: Maximum number of jobs to claim
+            
+        Returns:
+            Claimed jobs in priority order, with status names decoded
+        """
+        async with self.transaction() as session:
+            jobs = await self.execute_query(_CLAIM_PENDING_JOBS, {"limit": limit}, session)
+        return self._decode_job_statuses(jobs)
+    
+    async def get_job_status_counts(self) -> Dict[str, int]:
+        """Get the number of document jobs per status name"""
+        query = "SELECT status, COUNT(*) AS count FROM document_jobs GROUP BY status"
+        rows = await self.execute_query(query)
+        return {JOB_STATUS_NAMES.get(row['status'], row['status']): row['count'] for row in rows}
     
     async def update_job_status(self, job_id: str, status: str, result_data: Dict = None) -> int:
         """Update job status"""
-        query = """
-        UPDATE document_jobs 
-        SET status = :status
+        return await self.execute_update(_UPDATE_JOB_STATUS, self._job_status_params(job_id, status, result_data))
+    
+    async def requeue_stale_jobs(self, stale_after_seconds: int) -> int:
+        """
+        Recover jobs stuck in processing (their claimant died) in one pass
+        
+        Jobs with retries left go back to pending; the rest are marked failed so
+        they don't sit in processing forever. Returns how many rows were recovered.
+        """
+        query = f"""
+        UPDATE document_jobs
+        SET status = CASE WHEN retry_count < max_retries THEN '{STATUS_PENDING}' ELSE '{STATUS_FAILED}' END,
+            started_at = CASE WHEN retry_count < max_retries THEN NULL ELSE started_at END,
+            completed_at = CASE WHEN retry_count < max_retries THEN completed_at ELSE NOW() END,
+            error_message = CASE WHEN retry_count < max_retries THEN error_message
+                                 ELSE 'Abandoned by a stopped worker after max retries' END,
+            retry_count = CASE WHEN retry_count < max_retries THEN retry_count + 1 ELSE retry_count END
+        WHERE status = '{STATUS_PROCESSING}'
+          AND started_at < NOW() - make_interval(secs => :stale_after_seconds)
         """
-        params = {"job_id": job_id, "status": status}
+        return await self.execute_update(query, {"stale_after_seconds": stale_after_seconds})
+    
+    async def finalize_jobs(self, results: Sequence[Tuple[Any, str, Any]]) -> int:
+        """
+        Record the final status of several jobs in one UPDATE
         
-        if result_data:
-            query += ", error_message = :result_data"
-            params["result_data"] = json.dumps(result_data)
+        Args:
+            results: (job_id, status name, error or result data) tuples; a None error keeps error_message
+            
+        Returns:
+            Number of job rows updated
+        """
+        if not results:
+            return 0
         
-        query += " WHERE id = :job_id"
-        return await self.execute_update(query, params)
+        params = [self._job_status_params(job_id, status, error) for job_id, status, error in results]
+        return await self.execute_update(_FINALIZE_JOBS, {
+            "job_ids": [row["job_id"] for row in params],
+            "statuses": [row["status"] for row in params],
+            "errors": [row["result_data"] for row in params]
+        })
+    
+    @staticmethod
+    def _job_status_params(job_id: str, status: str, result_data: Any) -> Dict[str, Any]:
+        """Bind parameters for _UPDATE_JOB_STATUS; error_message is kept when there is no result data"""
+        if result_data and not isinstance(result_data, str):
+            result_data = _json_dumps(result_data)
+        return {"job_id": job_id, "status": JOB_STATUS_CODES[status], "result_data": result_data or None}
+    
+    @staticmethod
+    def _decode_job_statuses(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Copy job rows with single-character status codes replaced by their names"""
+        return [{**job, 'status': JOB_STATUS_NAMES.get(job['status'], job['status'])} for job in jobs]
     
     # Document job operations
-    async def create_document_job(self, job_data: Dict[str, Any]) -> str:
+    async def create_document_job(self, job_data: Dict[str, Any], session: Optional[AsyncSession] = None) -> UUID:
         """Create a new document job record"""
         # Remove any metadata fields since the table doesn't have a metadata column
         params = job_data.copy()
         params.pop('metadata', None)
         params.pop('meta_data', None)
+        params['status'] = JOB_STATUS_CODES[params.get('status') or 'pending']
         
-        query = """
-        INSERT INTO document_jobs (application_id, document_id, job_type, status, priority)
-        VALUES (:application_id, :document_id, :job_type, :status, :priority)
-        RETURNING id
+        result = await self.execute_insert(_INSERT_DOCUMENT_JOB, params, session)
+        return result
+    
+    async def create_document_jobs_bulk(self, jobs: List[Dict[str, Any]]) -> List[UUID]:
+        """Create several document job records with one INSERT"""
+        if not jobs:
+            return []
+        
+        params = {
+            "application_ids": [job["application_id"] for job in jobs],
+            "document_ids": [job.get("document_id") for job in jobs],
+            "job_types": [job["job_type"] for job in jobs],
+            "statuses": [JOB_STATUS_CODES[job.get("status") or "pending"] for job in jobs],
+            "priorities": [job.get("priority", 5) for job in jobs]
+        }
+        try:
+            async with self.async_session() as session:
+                result = await session.execute(_INSERT_DOCUMENT_JOBS_BULK, params)
+                job_ids = list(result.scalars())
+                await session.commit()
+                return job_ids
+        except Exception as e:
+            logger.error(f"Database insert error: {str(e)}")
+            raise
+    
+    async def retry_failed_jobs(self, application_id: Optional[str] = None) -> int:
+        """Return failed jobs with retries left to pending in one UPDATE (served by idx_document_jobs_failed); returns how many"""
+        query = f"""
+        UPDATE document_jobs
+        SET status = '{STATUS_PENDING}', retry_count = retry_count + 1,
+            started_at = NULL, completed_at = NULL, error_message = NULL
+        WHERE status = '{STATUS_FAILED}' AND retry_count < max_retries
         """
-        result = await self.execute_insert(query, params)
-        return str(result)
+        if application_id:
+            query += " AND application_id = :application_id"
+            return await self.execute_update(query, {"application_id": application_id})
+        return await self.execute_update(query)
     
     async def get_document_jobs(self, application_id: str) -> List[Dict[str, Any]]:
         """Get all document jobs for an application"""
         query = "SELECT * FROM document_jobs WHERE application_id = :application_id ORDER BY created_at"
-        return await self.execute_query(query, {"application_id": application_id})
+        jobs = await self.execute_query(query, {"application_id": application_id})
+        return self._decode_job_statuses(jobs)
     
     async def update_document_job_status(self, job_id: str, status: str, result_data: Dict[str, Any] = None) -> int:
         """Update document job status"""
-        query = """
-        UPDATE document_jobs 
-        SET status = :status
-        """
-        params = {"job_id": job_id, "status": status}
-        
-        if result_data:
-            query += ", error_message = :result_data"
-            params["result_data"] = json.dumps(result_data)
-        
-        query += " WHERE id = :job_id"
-        return await self.execute_update(query, params)
+        return await self.execute_update(_UPDATE_JOB_STATUS, self._job_status_params(job_id, status, result_data))
     
     # Validation results operations
     async def get_validation_results_by_application(self, application_id: str) -> List[Dict[str, Any]]:
@@ -372,35 +1006,36 @@ class DatabaseService:
     # Application form data operations
     async def get_application_form_data(self, application_id: str) -> Dict[str, Any]:
         """Get application form data for validation"""
-        # Get extracted data from mortgage application form
+        # Flatten the latest mortgage application form into {field_name: field_value}
+        # server-side; jsonb_object_agg keeps the last value for repeated names
         query = """
-        SELECT ed.extracted_fields 
-        FROM extracted_data ed
-        JOIN documents d ON ed.document_id = d.id
-        WHERE ed.application_id = :application_id 
-        AND d.document_type = 'mortgage_application'
-        ORDER BY ed.extracted_at DESC
-        LIMIT 1
+        SELECT jsonb_object_agg(f ->> 'field_name', f -> 'field_value') AS form
+        FROM (
+            SELECT ed.extracted_fields
+            FROM extracted_data ed
+            JOIN documents d ON ed.document_id = d.id
+            WHERE ed.application_id = :application_id 
+            AND d.document_type = 'mortgage_application'
+            ORDER BY ed.extracted_at DESC
+            LIMIT 1
+        ) latest
+        CROSS JOIN LATERAL jsonb_array_elements(
+            CASE WHEN jsonb_typeof(latest.extracted_fields) = 'array' THEN latest.extracted_fields ELSE '[]'::jsonb END
+        ) f
+        WHERE f ->> 'field_name' IS NOT NULL
         """
         results = await self.execute_query(query, {"application_id": application_id})
-        if results and results[0].get('extracted_fields'):
-            # Convert the list of field objects to a dictionary
-            extracted_fields = results[0]['extracted_fields']
-            form_data = {}
-            for field in extracted_fields:
-                form_data[field['field_name']] = field['field_value']
-            return form_data
-        return {}
+        return results[0]['form'] or {}
     
     
     # Golden data operations
     async def save_golden_data(self, application_id: str, validated_fields: dict, validation_stats: dict) -> bool:
         """Save validated fields and statistics to existing golden_data table"""
         try:
-            logger.info(f"=== SAVE GOLDEN DATA DEBUG ===")
-            logger.info(f"Application ID: {application_id}")
-            logger.info(f"Validated fields count: {len(validated_fields)}")
-            logger.info(f"Validation stats: {validation_stats}")
+            logger.debug(
+                "Saving golden data for application %s: %d validated fields, stats %s",
+                application_id, len(validated_fields), validation_stats
+            )
             
             # Calculate data quality score based on validation percentage
             data_quality_score = validation_stats.get("validation_percentage", 0.0) / 100.0
@@ -431,37 +1066,34 @@ class DatabaseService:
             
             params = {
                 "application_id": application_id,
-                "golden_fields": json.dumps(validated_fields),
+                "golden_fields": validated_fields,
                 "field_count": validation_stats.get("total_fields", 0),
                 "verified_fields": validation_stats.get("validated_fields", 0),
                 "high_confidence_fields": validation_stats.get("validated_fields", 0),  # All validated fields are high confidence
                 "data_quality_score": data_quality_score,
                 "ready_for_decision_engine": validation_stats.get("validation_percentage", 0.0) >= 80.0,  # Ready if 80%+ validated
-                "validation_summary": json.dumps(validation_stats)
+                "validation_summary": validation_stats
             }
             
-            logger.info(f"Query params: {params}")
+            logger.debug("Golden data query params: %s", params)
             
             # Try to update first
             update_result = await self.execute_update(update_query, params)
-            logger.info(f"Update result: {update_result}")
             
             if update_result and update_result > 0:
                 logger.info(f"Golden data updated successfully for application {application_id}")
                 return True
             else:
                 # No existing record, insert new one
-                insert_result = await self.execute_insert(insert_query, params)
-                logger.info(f"Insert result: {insert_result}")
+                await self.execute_insert(insert_query, params)
                 logger.info(f"Golden data inserted successfully for application {application_id}")
                 return True
             
         except Exception as e:
-            logger.error(f"Error saving golden data: {str(e)}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Error saving golden data: %s", e)
             return False
     
+    @request_cached
     async def get_golden_data(self, application_id: str) -> Optional[Dict[str, Any]]:
         """Get golden data for an application"""
         try:
@@ -474,17 +1106,8 @@ class DatabaseService:
             """
             
             results = await self.execute_query(query, {"application_id": application_id})
-            if results:
-                result = results[0]
-                # Parse the JSON fields
-                if result.get('golden_fields'):
-                    if isinstance(result['golden_fields'], str):
-                        result['golden_fields'] = json.loads(result['golden_fields'])
-                if result.get('validation_summary'):
-                    if isinstance(result['validation_summary'], str):
-                        result['validation_summary'] = json.loads(result['validation_summary'])
-                return result
-            return None
+            # JSONB columns arrive decoded by the connection codec
+            return dict(results[0]) if results else None
             
         except Exception as e:
             logger.error(f"Error getting golden data: {str(e)}")
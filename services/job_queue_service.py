@@ -3,14 +3,36 @@ Job Queue Service
 Handles job queue management and processing
 """
 
+import os
+import time
 import asyncio
-from typing import List, Dict, Any, Optional
+import contextlib
+import aiojobs
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from services.database_service import DatabaseService
 from utils.logger import get_logger
+from utils.request_cache import request_cache_scope
 
 logger = get_logger(__name__)
 
+# Jobs executed at once by the scheduler, and how long shutdown waits for them to drain
+MAX_CONCURRENT_JOBS = int(os.getenv("MAX_CONCURRENT_JOBS", "3"))
+JOB_SHUTDOWN_TIMEOUT_SECONDS = 60
+
+# NOTIFY channel fed by the document_jobs insert trigger, and the safety-net poll
+# interval for jobs that appear without a notification (retries, missed notifies)
+NEW_JOB_CHANNEL = "new_job"
+JOB_POLL_FALLBACK_SECONDS = 30
+# Claimed jobs still processing after this long are assumed orphaned by a dead
+# worker and are put back in the queue when a processor starts
+JOB_STALE_AFTER_SECONDS = int(os.getenv("JOB_STALE_AFTER_SECONDS", "900"))
+# How long a get_job_status result is served to repeated polls; job transitions
+# made by this processor drop cached entries immediately
+JOB_STATUS_CACHE_TTL_SECONDS = 0.5
+# Pause between back-to-back claims while the queue keeps returning full batches
+JOB_FETCH_COOLDOWN_SECONDS = 0.1
+
 class JobQueueService:
     """Service for managing job queue and processing"""
     
@@ -21,6 +43,29 @@ class JobQueueService:
         self.validation_agent = validation_agent
         self.is_running = False
         self.processing_tasks = {}
+        self._scheduler: Optional[aiojobs.Scheduler] = None
+        self._jobs_available = asyncio.Event()
+        # (job_id, status, error) for finished jobs, written in one UPDATE per loop pass
+        self._finished_jobs: List[Tuple[Any, str, Optional[str]]] = []
+        # application_id -> (monotonic time, get_job_status result)
+        self._status_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+    
+    @staticmethod
+    def _handle_job_exception(scheduler: aiojobs.Scheduler, context: Dict[str, Any]):
+        """Report exceptions that escaped a scheduled job"""
+        logger.error(f"Scheduled job failed: {context.get('message')}", exc_info=context.get('exception'))
+    
+    def _on_new_job_notify(self, connection, pid, channel, payload):
+        """asyncpg listener: wake the job processor loop"""
+        self._jobs_available.set()
+    
+    async def _wait_for_jobs(self):
+        """Sleep until jobs are announced, a job slot frees up, or the fallback poll interval passes"""
+        try:
+            await asyncio.wait_for(self._jobs_available.wait(), timeout=JOB_POLL_FALLBACK_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        self._jobs_available.clear()
     
     async def start_job_processor(self):
         """Start the job processor"""
@@ -29,90 +74,116 @@ class JobQueueService:
             return
         
         self.is_running = True
+        self._scheduler = aiojobs.Scheduler(
+            limit=MAX_CONCURRENT_JOBS,
+            exception_handler=self._handle_job_exception
+        )
         logger.info("Starting job processor")
         
         try:
-            while self.is_running:
+            recovered = await self.db_service.requeue_stale_jobs(JOB_STALE_AFTER_SECONDS)
+            if recovered:
+                logger.warning(f"Requeued or failed {recovered} jobs left in processing by a previous worker")
+        except Exception as e:
+            logger.error(f"Error requeueing stale jobs: {str(e)}")
+        
+        try:
+            async with contextlib.AsyncExitStack() as stack:
                 try:
-                    logger.info("=== LOOP DEBUG: Job processor loop iteration ===")
-                    print("=== LOOP DEBUG: Job processor loop iteration ===")
-                    await self._process_job_queue()
-                    logger.info("=== LOOP DEBUG: Finished processing job queue, sleeping 5 seconds ===")
-                    print("=== LOOP DEBUG: Finished processing job queue, sleeping 5 seconds ===")
-                    await asyncio.sleep(5)  # Check every 5 seconds
+                    await stack.enter_async_context(
+                        self.db_service.listen(NEW_JOB_CHANNEL, self._on_new_job_notify)
+                    )
                 except Exception as e:
-                    logger.error(f"=== LOOP ERROR: Error in job processor loop: {str(e)} ===")
-                    print(f"=== LOOP ERROR: Error in job processor loop: {str(e)} ===")
-                    import traceback
-                    logger.error(f"=== LOOP TRACEBACK: {traceback.format_exc()} ===")
-                    print(f"=== LOOP TRACEBACK: {traceback.format_exc()} ===")
-                    # Continue the loop even if there's an error
-                    await asyncio.sleep(5)
-        except Exception as e:
-            logger.error(f"=== MAIN ERROR: Job processor main error: {str(e)} ===")
-            print(f"=== MAIN ERROR: Job processor main error: {str(e)} ===")
-            import traceback
-            logger.error(f"=== MAIN TRACEBACK: {traceback.format_exc()} ===")
-            print(f"=== MAIN TRACEBACK: {traceback.format_exc()} ===")
+                    logger.warning(f"LISTEN {NEW_JOB_CHANNEL} unavailable, polling every {JOB_POLL_FALLBACK_SECONDS}s: {str(e)}")
+                
+                while self.is_running:
+                    try:
+                        more_available = await self._process_job_queue()
+                        if more_available:
+                            # A full batch means more jobs are likely waiting; re-claim
+                            # as soon as slots allow instead of waiting for a wakeup
+                            await asyncio.sleep(JOB_FETCH_COOLDOWN_SECONDS)
+                            continue
+                        await self._wait_for_jobs()
+                    except Exception:
+                        logger.exception("Error in job processor loop")
+                        # Continue the loop even if there's an error
+                        await asyncio.sleep(5)
+        except Exception:
+            logger.exception("Job processor stopped unexpectedly")
         finally:
             self.is_running = False
+            # No-op after a graceful stop; cancels in-flight jobs if the loop itself was cancelled
+            await self._scheduler.close()
+            await self._flush_finished_jobs()
             logger.info("Job processor stopped")
-            print("=== JOB PROCESSOR STOPPED ===")
     
     async def stop_job_processor(self):
-        """Stop the job processor"""
+        """Stop polling for new jobs and let the in-flight ones finish"""
         self.is_running = False
+        self._jobs_available.set()
         logger.info("Stopping job processor")
+        if self._scheduler is not None and not self._scheduler.closed:
+            await self._scheduler.wait_and_close(timeout=JOB_SHUTDOWN_TIMEOUT_SECONDS)
+        await self._flush_finished_jobs()
     
-    async def _process_job_queue(self):
-        """Process pending jobs"""
+    async def _flush_finished_jobs(self):
+        """Write the final status of every job finished since the last flush in one statement"""
+        if not self._finished_jobs:
+            return
+        
+        finished, self._finished_jobs = self._finished_jobs, []
         try:
-            # Get pending jobs
-            logger.info("=== QUEUE DEBUG: Starting _process_job_queue ===")
-            print("=== QUEUE DEBUG: Starting _process_job_queue ===")
+            await self.db_service.finalize_jobs(finished)
+            self._status_cache.clear()
+        except Exception as e:
+            # Keep them for the next pass rather than leaving the jobs marked processing
+            self._finished_jobs = finished + self._finished_jobs
+            logger.error(f"Error recording {len(finished)} finished jobs: {str(e)}")
+    
+    async def _process_job_queue(self) -> bool:
+        """Claim and spawn pending jobs; returns True when a full batch was claimed (more may be waiting)"""
+        try:
+            await self._flush_finished_jobs()
+            
+            # Only claim what the scheduler can start now; claimed jobs leave
+            # the pending state, so no other processor will pick them up
+            free_slots = MAX_CONCURRENT_JOBS - len(self.processing_tasks)
+            if free_slots <= 0:
+                logger.debug("All %d job slots busy", MAX_CONCURRENT_JOBS)
+                return False
             
             try:
-                pending_jobs = await self.db_service.get_pending_jobs()
-                logger.info(f"=== QUEUE DEBUG: Found {len(pending_jobs)} pending jobs ===")
-                print(f"=== QUEUE DEBUG: Found {len(pending_jobs)} pending jobs ===")
+                pending_jobs = await self.db_service.claim_pending_jobs(free_slots)
             except Exception as db_error:
-                logger.error(f"=== QUEUE DEBUG: Database error getting pending jobs: {str(db_error)} ===")
-                print(f"=== QUEUE DEBUG: Database error getting pending jobs: {str(db_error)} ===")
+                logger.error("Database error claiming pending jobs: %s", db_error)
                 # Continue without processing jobs if database is unavailable
-                return
+                return False
             
             if not pending_jobs:
-                logger.info("=== QUEUE DEBUG: No pending jobs, returning ===")
-                print("=== QUEUE DEBUG: No pending jobs, returning ===")
-                return
-            
-            logger.info(f"=== QUEUE DEBUG: About to process {len(pending_jobs)} jobs ===")
-            print(f"=== QUEUE DEBUG: About to process {len(pending_jobs)} jobs ===")
-            
-            # Process jobs concurrently (with limit)
-            semaphore = asyncio.Semaphore(3)  # Max 3 concurrent jobs
-            
-            async def process_job(job):
-                logger.info(f"=== QUEUE DEBUG: About to process job {job['id']} (type: {job['job_type']}) ===")
-                print(f"=== QUEUE DEBUG: About to process job {job['id']} (type: {job['job_type']}) ===")
-                async with semaphore:
-                    await self._process_single_job(job)
-                logger.info(f"=== QUEUE DEBUG: Finished processing job {job['id']} ===")
-                print(f"=== QUEUE DEBUG: Finished processing job {job['id']} ===")
-            
-            tasks = [process_job(job) for job in pending_jobs[:10]]  # Process up to 10 jobs at a time
-            logger.info(f"=== QUEUE DEBUG: Created {len(tasks)} tasks, about to gather ===")
-            print(f"=== QUEUE DEBUG: Created {len(tasks)} tasks, about to gather ===")
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            logger.info(f"=== QUEUE DEBUG: Gather completed, results: {results} ===")
-            print(f"=== QUEUE DEBUG: Gather completed, results: {results} ===")
+                return False
             
-        except Exception as e:
-            logger.error(f"=== QUEUE DEBUG: Error processing job queue: {str(e)} ===")
-            print(f"=== QUEUE DEBUG: Error processing job queue: {str(e)} ===")
-            import traceback
-            logger.error(f"=== QUEUE DEBUG: Traceback: {traceback.format_exc()} ===")
-            print(f"=== QUEUE DEBUG: Traceback: {traceback.format_exc()} ===")
+            logger.debug("Claimed %d pending jobs", len(pending_jobs))
+            
+            # Hand the claimed jobs to the scheduler, which caps concurrency
+            self._status_cache.clear()
+            for job in pending_jobs:
+                self.processing_tasks[job['id']] = await self._scheduler.spawn(self._run_scheduled_job(job))
+            return len(pending_jobs) >= free_slots
+        
+        except Exception:
+            logger.exception("Error processing job queue")
+            return False
+    
+    async def _run_scheduled_job(self, job: Dict[str, Any]):
+        """Process a job spawned on the scheduler and release its in-flight slot"""
+        try:
+            with request_cache_scope():
+                await self._process_single_job(job)
+        finally:
+            self.processing_tasks.pop(job['id'], None)
+            # A slot is free again; let the loop claim more without waiting for a poll
+            self._jobs_available.set()
     
     async def _process_single_job(self, job: Dict[str, Any]):
         """Process a single job"""
@@ -122,66 +193,67 @@ class JobQueueService:
         document_id = job.get("document_id")
         
         try:
-            logger.info(f"Starting job processing: {job_id} (type: {job_type}, document: {document_id})")
-            
-            # Update job status to processing
-            await self.db_service.update_job_status(job_id, "processing")
+            # Already marked processing when it was claimed
+            logger.debug("Starting job %s (type: %s, document: %s)", job_id, job_type, document_id)
             
             # Process based on job type
             if job_type == "extraction":
-                print(f"=== JOB DEBUG: Processing extraction job for document {document_id} ===")
-                logger.info(f"=== JOB DEBUG: Processing extraction job for document {document_id} ===")
-                print(f"=== JOB DEBUG: About to call extraction_agent.extract_document_data ===")
-                logger.info(f"=== JOB DEBUG: About to call extraction_agent.extract_document_data ===")
                 try:
-                    print(f"=== JOB DEBUG: Calling extraction_agent.extract_document_data({document_id}, {application_id}) ===")
                     result = await self.extraction_agent.extract_document_data(document_id, application_id)
-                    print(f"=== JOB DEBUG: Extraction result: {result} ===")
-                    logger.info(f"=== JOB DEBUG: Extraction result: {result} ===")
-                    print(f"=== JOB DEBUG: Extraction success: {result.get('success', False)} ===")
-                    logger.info(f"=== JOB DEBUG: Extraction success: {result.get('success', False)} ===")
                 except Exception as e:
-                    print(f"=== JOB DEBUG: Exception in extraction agent: {str(e)} ===")
-                    logger.error(f"=== JOB DEBUG: Exception in extraction agent: {str(e)} ===")
-                    import traceback
-                    print(f"=== JOB DEBUG: Traceback: {traceback.format_exc()} ===")
-                    logger.error(f"=== JOB DEBUG: Traceback: {traceback.format_exc()} ===")
+                    logger.exception("Extraction agent raised for document %s", document_id)
                     result = {"success": False, "error": str(e)}
             elif job_type == "validation":
-                logger.info(f"Processing validation job for application {application_id}")
                 result = await self.validation_agent.validate_application_data(application_id)
             else:
                 raise Exception(f"Unknown job type: {job_type}")
             
             if result.get("success"):
-                await self.db_service.update_job_status(job_id, "completed")
-                logger.info(f"Job {job_id} completed successfully")
+                self._finished_jobs.append((job_id, "completed", None))
+                logger.info("Job %s (%s) completed successfully", job_id, job_type)
             else:
-                await self.db_service.update_job_status(job_id, "failed", result.get("error"))
-                logger.error(f"Job {job_id} failed: {result.get('error')}")
-                
+                self._finished_jobs.append((job_id, "failed", result.get("error")))
+                logger.error("Job %s (%s) failed: %s", job_id, job_type, result.get("error"))
+        
         except Exception as e:
-            error_msg = str(e)
-            await self.db_service.update_job_status(job_id, "failed", error_msg)
-            logger.error(f"Job {job_id} failed with exception: {error_msg}")
+            self._finished_jobs.append((job_id, "failed", str(e)))
+            logger.exception("Job %s failed with exception", job_id)
     
     async def add_extraction_job(self, application_id: str, document_id: str, priority: int = 5):
         """Add extraction job to queue"""
+        job_ids = await self.add_extraction_jobs_bulk([(application_id, document_id, priority)])
+        return job_ids[0]
+    
+    async def add_extraction_jobs_bulk(self, jobs: List[Tuple[str, str, int]]) -> List[str]:
+        """
+        Add extraction jobs to queue in a single insert
+        
+        Args:
+            jobs: List of (application_id, document_id, priority) tuples
+            
+        Returns:
+            List of created job IDs
+        """
         try:
-            job_data = {
-                "application_id": application_id,
-                "document_id": document_id,
-                "job_type": "extraction",
-                "status": "pending",
-                "priority": priority
-            }
+            job_data = [
+                {
+                    "application_id": application_id,
+                    "document_id": document_id,
+                    "job_type": "extraction",
+                    "status": "pending",
+                    "priority": priority
+                }
+                for application_id, document_id, priority in jobs
+            ]
             
-            result = await self.db_service.create_document_job(job_data)
-            logger.info(f"Added extraction job for document {document_id}")
+            result = await self.db_service.create_document_jobs_bulk(job_data)
+            for application_id, _, _ in jobs:
+                self._status_cache.pop(application_id, None)
+            logger.info(f"Added {len(result)} extraction jobs")
             return result
             
         except Exception as e:
-            logger.error(f"Error adding extraction job: {str(e)}")
+            logger.error(f"Error adding extraction jobs: {str(e)}")
             raise
     
     async def add_validation_job(self, application_id: str, priority: int = 3):
@@ -196,6 +268,7 @@ class JobQueueService:
             }
             
             result = await self.db_service.create_document_job(job_data)
+            self._status_cache.pop(application_id, None)
             logger.info(f"Added validation job for application {application_id}")
             return result
             
@@ -206,22 +279,27 @@ class JobQueueService:
     
     async def get_job_status(self, application_id: str) -> Dict[str, Any]:
         """Get job status for an application"""
+        cached = self._status_cache.get(application_id)
+        if cached and time.monotonic() - cached[0] < JOB_STATUS_CACHE_TTL_SECONDS:
+            return cached[1]
+        
         try:
-            # Get all jobs for application
-            jobs = await self.db_service.get_pending_jobs()
-            application_jobs = [job for job in jobs if job["application_id"] == application_id]
+            # Get all jobs for application (filtered in SQL)
+            application_jobs = await self.db_service.get_document_jobs(application_id)
             
             # Count by status
             status_counts = {"pending": 0, "processing": 0, "completed": 0, "failed": 0}
             for job in application_jobs:
                 status_counts[job["status"]] += 1
             
-            return {
+            job_status = {
                 "application_id": application_id,
                 "total_jobs": len(application_jobs),
                 "status_counts": status_counts,
                 "jobs": application_jobs
             }
+            self._status_cache[application_id] = (time.monotonic(), job_status)
+            return job_status
             
         except Exception as e:
             logger.error(f"Error getting job status: {str(e)}")
@@ -233,19 +311,12 @@ class JobQueueService:
     async def retry_failed_jobs(self, application_id: str = None):
         """Retry failed jobs"""
         try:
-            # Get failed jobs
-            failed_jobs = await self.db_service.get_pending_jobs()
-            failed_jobs = [job for job in failed_jobs if job["status"] == "failed"]
-            
-            if application_id:
-                failed_jobs = [job for job in failed_jobs if job["application_id"] == application_id]
-            
-            retry_count = 0
-            for job in failed_jobs:
-                if job["retry_count"] < job["max_retries"]:
-                    # Reset job status to pending
-                    await self.db_service.update_job_status(job["id"], "pending")
-                    retry_count += 1
+            # Reset every failed job with retries left in one statement
+            retry_count = await self.db_service.retry_failed_jobs(application_id)
+            self._status_cache.clear()
+            if retry_count:
+                # Claim the requeued jobs now rather than after the fallback poll
+                self._jobs_available.set()
             
             logger.info(f"Retried {retry_count} failed jobs")
             return {"retried_jobs": retry_count}
@@ -3,28 +3,95 @@ Storage Service
 Handles file storage operations - local storage with temporary S3 uploads for Textract
 """
 
+import io
 import os
+import json
+import errno
+import asyncio
 import time
 import shutil
 import boto3
-from typing import Optional, Dict, Any
+from boto3.s3.transfer import TransferConfig
+from typing import Optional, Dict, Any, Tuple
 from botocore.exceptions import ClientError
 from pathlib import Path
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Local storage root, resolved once: /app/storage in Docker, ./storage when running locally
+_STORAGE_ROOT = Path("/app/storage") if os.path.exists("/app") else Path("storage")
+_STORAGE_ROOT.mkdir(exist_ok=True)
+
+# Uploads above the threshold go up as multipart, several parts in parallel
+S3_MULTIPART_CHUNK_BYTES = 8 * 1024 * 1024
+S3_UPLOAD_MAX_CONCURRENCY = 8
+
+# Temporary Textract inputs live under this prefix. When the bucket has a lifecycle
+# rule expiring it (AWS_S3_TEMP_LIFECYCLE=true), the per-job DELETE is skipped.
+S3_TEMP_PREFIX = "temp/textract/"
+S3_TEMP_LIFECYCLE = os.getenv("AWS_S3_TEMP_LIFECYCLE", "false").lower() == "true"
+
+# Extended attribute holding a stored file's metadata. Filesystems without
+# user xattrs (tmpfs on older kernels, FAT, some bind mounts) fall back to a
+# '.meta' sidecar file next to the stored file.
+_METADATA_XATTR = "user.doc_metadata"
+_XATTRS_SUPPORTED = hasattr(os, "setxattr")
+
+def _metadata_path(full_path: Path) -> Path:
+    """Sidecar file holding a stored file's metadata"""
+    return full_path.with_name(full_path.name + '.meta')
+
+def _write_file(full_path: Path, file_content: bytes, metadata: Optional[Dict[str, Any]]) -> None:
+    """Write a file and its metadata (blocking; run in a worker thread)"""
+    full_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(full_path, 'wb') as f:
+        f.write(file_content)
+        if metadata and _XATTRS_SUPPORTED:
+            try:
+                os.setxattr(f.fileno(), _METADATA_XATTR, json.dumps(metadata).encode())
+                return
+            except OSError:
+                pass  # Unsupported here or value too large; use the sidecar
+        if _XATTRS_SUPPORTED:
+            # Truncating keeps xattrs; drop a previous write's metadata so it can't shadow the sidecar
+            try:
+                os.removexattr(f.fileno(), _METADATA_XATTR)
+            except OSError as e:
+                if e.errno not in (errno.ENODATA, errno.ENOTSUP, errno.EOPNOTSUPP):
+                    raise
+    
+    if metadata:
+        with open(_metadata_path(full_path), 'w') as f:
+            json.dump(metadata, f)
+    else:
+        _metadata_path(full_path).unlink(missing_ok=True)
+
+def _read_metadata(full_path: Path) -> Dict[str, Any]:
+    """Read a stored file's metadata, or {} if it has none (blocking)"""
+    if _XATTRS_SUPPORTED:
+        try:
+            return json.loads(os.getxattr(full_path, _METADATA_XATTR))
+        except OSError:
+            pass  # No attribute (stored via sidecar) or unsupported filesystem
+    
+    metadata_file = _metadata_path(full_path)
+    if not metadata_file.exists():
+        return {}
+    with open(metadata_file, 'r') as f:
+        return json.load(f)
+
+def _read_file(full_path: Path) -> Tuple[bytes, Dict[str, Any]]:
+    """Read a file and its metadata (blocking; run in a worker thread)"""
+    with open(full_path, 'rb') as f:
+        file_content = f.read()
+    return file_content, _read_metadata(full_path)
+
 class StorageService:
     """Service for file storage operations - local storage with temporary S3 uploads"""
     
     def __init__(self):
-        # Use local storage path that works both in Docker and locally
-        if os.path.exists("/app"):  # Running in Docker
-            self.local_storage_path = Path("/app/storage")
-        else:  # Running locally
-            self.local_storage_path = Path("storage")
-        
-        self.local_storage_path.mkdir(exist_ok=True)
+        self.local_storage_path = _STORAGE_ROOT
         
         # AWS credentials for temporary Textract uploads
         self.aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID")
@@ -34,6 +101,12 @@ class StorageService:
         
         # Initialize S3 client for temporary uploads
         self.s3_client = None
+        self.transfer_config = TransferConfig(
+            multipart_threshold=S3_MULTIPART_CHUNK_BYTES,
+            multipart_chunksize=S3_MULTIPART_CHUNK_BYTES,
+            max_concurrency=S3_UPLOAD_MAX_CONCURRENCY,
+            use_threads=True
+        )
         if all([self.aws_access_key_id, self.aws_secret_access_key, self.s3_bucket]):
             try:
                 self.s3_client = boto3.client(
@@ -63,18 +136,9 @@ class StorageService:
         try:
             # Create full local path
             full_path = self.local_storage_path / file_path
-            full_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Write file to local storage
-            with open(full_path, 'wb') as f:
-                f.write(file_content)
             
-            # Store metadata
-            metadata_file = full_path.with_suffix(full_path.suffix + '.meta')
-            if metadata:
-                import json
-                with open(metadata_file, 'w') as f:
-                    json.dump(metadata, f)
+            # Write file and metadata to local storage without blocking the event loop
+            await asyncio.to_thread(_write_file, full_path, file_content, metadata)
             
             logger.info(f"File stored locally: {full_path}")
             
@@ -94,6 +158,15 @@ class StorageService:
                 "error": error_msg
             }
     
+    def temporary_s3_key(self, filename: str) -> str:
+        """Build an S3 key under the temporary Textract prefix"""
+        return f"{S3_TEMP_PREFIX}{int(time.time())}/{filename}"
+    
+    def _upload_file_to_s3(self, file_path: str, s3_key: str):
+        """Stream a local file to S3 through a single open handle (blocking)"""
+        with open(file_path, 'rb') as fp:
+            self.s3_client.upload_fileobj(fp, self.s3_bucket, s3_key, Config=self.transfer_config)
+    
     async def upload_to_s3_temporary(self, file_path: str, s3_key: str = None) -> Dict[str, Any]:
         """
         Upload file to S3 temporarily for Textract processing
@@ -111,14 +184,13 @@ class StorageService:
             
             # Generate S3 key if not provided
             if not s3_key:
-                timestamp = int(time.time())
-                filename = Path(file_path).name
-                s3_key = f"temp/textract/{timestamp}/{filename}"
+                s3_key = self.temporary_s3_key(Path(file_path).name)
             
-            # Upload to S3
-            self.s3_client.upload_file(
+            # Upload to S3 on a worker thread so the transfer doesn't block the event loop
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                self._upload_file_to_s3,
                 file_path,
-                self.s3_bucket,
                 s3_key
             )
             
@@ -149,6 +221,60 @@ class StorageService:
                 "error": error_msg
             }
     
+    async def upload_bytes_to_s3_temporary(self, file_content: bytes, s3_key: str) -> Dict[str, Any]:
+        """
+        Upload in-memory file content to S3 temporarily for Textract processing
+        
+        Avoids writing the content back to disk and re-reading it when the
+        caller already holds the bytes.
+        
+        Args:
+            file_content: File content as bytes
+            s3_key: S3 key to upload to
+            
+        Returns:
+            Dict with upload result
+        """
+        try:
+            if not self.s3_client:
+                raise Exception("S3 client not initialized")
+            
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                lambda: self.s3_client.upload_fileobj(
+                    io.BytesIO(file_content),
+                    self.s3_bucket,
+                    s3_key,
+                    Config=self.transfer_config
+                )
+            )
+            
+            s3_url = f"s3://{self.s3_bucket}/{s3_key}"
+            
+            logger.info(f"File uploaded to S3 temporarily: {s3_url}")
+            
+            return {
+                "success": True,
+                "s3_url": s3_url,
+                "s3_key": s3_key,
+                "bucket": self.s3_bucket
+            }
+            
+        except ClientError as e:
+            error_msg = f"S3 temporary upload failed: {str(e)}"
+            logger.error(error_msg)
+            return {
+                "success": False,
+                "error": error_msg
+            }
+        except Exception as e:
+            error_msg = f"Temporary upload failed: {str(e)}"
+            logger.error(error_msg)
+            return {
+                "success": False,
+                "error": error_msg
+            }
+    
     async def delete_from_s3_temporary(self, s3_key: str) -> Dict[str, Any]:
         """
         Delete temporary file from S3 after Textract processing
@@ -163,10 +289,21 @@ class StorageService:
             if not self.s3_client:
                 raise Exception("S3 client not initialized")
             
+            # The bucket lifecycle rule expires temporary uploads; no DELETE round trip
+            if S3_TEMP_LIFECYCLE and s3_key.startswith(S3_TEMP_PREFIX):
+                return {
+                    "success": True,
+                    "s3_key": s3_key,
+                    "skipped": True
+                }
+            
             # Delete from S3
-            self.s3_client.delete_object(
-                Bucket=self.s3_bucket,
-                Key=s3_key
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                lambda: self.s3_client.delete_object(
+                    Bucket=self.s3_bucket,
+                    Key=s3_key
+                )
             )
             
             logger.info(f"Temporary file deleted from S3: {s3_key}")
@@ -210,17 +347,8 @@ class StorageService:
                     "error": f"File not found: {file_path}"
                 }
             
-            # Read file content
-            with open(full_path, 'rb') as f:
-                file_content = f.read()
-            
-            # Read metadata if exists
-            metadata = {}
-            metadata_file = full_path.with_suffix(full_path.suffix + '.meta')
-            if metadata_file.exists():
-                import json
-                with open(metadata_file, 'r') as f:
-                    metadata = json.load(f)
+            # Read file content and metadata (if any) on a worker thread
+            file_content, metadata = await asyncio.to_thread(_read_file, full_path)
             
             logger.info(f"File retrieved from local storage: {full_path}")
             
@@ -262,8 +390,8 @@ class StorageService:
             # Delete file
             full_path.unlink()
             
-            # Delete metadata file if exists
-            metadata_file = full_path.with_suffix(full_path.suffix + '.meta')
+            # Delete metadata sidecar if exists (xattrs go with the file)
+            metadata_file = _metadata_path(full_path)
             if metadata_file.exists():
                 metadata_file.unlink()
             
@@ -317,12 +445,7 @@ class StorageService:
             stat = full_path.stat()
             
             # Read metadata if exists
-            metadata = {}
-            metadata_file = full_path.with_suffix(full_path.suffix + '.meta')
-            if metadata_file.exists():
-                import json
-                with open(metadata_file, 'r') as f:
-                    metadata = json.load(f)
+            metadata = await asyncio.to_thread(_read_metadata, full_path)
             
             return {
                 "success": True,
@@ -3,63 +3,274 @@ Textract Service
 Handles AWS Textract operations for document analysis
 """
 
+import io
 import os
+import re
+import hashlib
+import functools
+import json
+import uuid
 import boto3
+from boto3.s3.transfer import TransferConfig
+import PyPDF2
 import asyncio
-from typing import Dict, Any, List
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+@dataclass(frozen=True)
+class _AwsConfig:
+    """AWS settings, read from the environment once at import"""
+    region: str
+    bucket: Optional[str]
+    access_key_id: Optional[str]
+    secret_access_key: Optional[str]
+
+_AWS_CONFIG = _AwsConfig(
+    region=os.getenv("AWS_REGION", "us-east-1"),
+    bucket=os.getenv("AWS_S3_BUCKET"),
+    access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
+    secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY")
+)
+
+# Analysis job polling: start fast so short jobs return quickly, then back off
+# exponentially so long jobs don't hammer GetDocumentAnalysis
+TEXTRACT_POLL_INITIAL_DELAY_SECONDS = 1.0
+TEXTRACT_POLL_BACKOFF_FACTOR = 1.5
+TEXTRACT_POLL_MAX_DELAY_SECONDS = 10.0
+
+# Shared by the S3 and Textract clients: enough pooled, kept-alive connections for
+# concurrent jobs to reuse sockets instead of paying a TLS handshake per call
+AWS_MAX_POOL_CONNECTIONS = int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "50"))
+# Threads for the blocking boto3 calls; they mostly wait on the network, so size
+# well past the CPU count instead of sharing the loop's small default executor
+TEXTRACT_MAX_WORKERS = int(os.getenv("TEXTRACT_MAX_WORKERS", str((os.cpu_count() or 1) * 5)))
+# Optional completion notifications: with all three set, Textract publishes job
+# completion to the SNS topic, which feeds the SQS queue that waiters long-poll
+TEXTRACT_SNS_TOPIC_ARN = os.getenv("TEXTRACT_SNS_TOPIC_ARN")
+TEXTRACT_SNS_ROLE_ARN = os.getenv("TEXTRACT_SNS_ROLE_ARN")
+TEXTRACT_SQS_QUEUE_URL = os.getenv("TEXTRACT_SQS_QUEUE_URL")
+TEXTRACT_NOTIFICATIONS_ENABLED = all([TEXTRACT_SNS_TOPIC_ARN, TEXTRACT_SNS_ROLE_ARN, TEXTRACT_SQS_QUEUE_URL])
+# Tags this process's jobs so replicas sharing the queue only consume their own notifications
+TEXTRACT_JOB_TAG = f"docproc-{uuid.uuid4().hex[:12]}"
+# How long to wait for a notification before falling back to polling the job
+TEXTRACT_NOTIFICATION_WAIT_SECONDS = 120
+# Files past the threshold are uploaded as parallel multipart chunks
+S3_MULTIPART_CHUNK_BYTES = 8 * 1024 * 1024
+S3_UPLOAD_MAX_CONCURRENCY = 10
+
+# Textract answer keywords -> document type, checked in order (first match wins).
+# Each keyword list is compiled into one alternation so a check is a single regex scan.
+_DOCUMENT_TYPE_KEYWORDS = [
+    (["mortgage", "loan", "application"], "mortgage_application"),
+    (["t4", "tax", "income", "remuneration", "statement of remuneration"], "t4_form"),
+    (["employment", "job", "work", "salary", "letter"], "employment_letter"),
+    (["bank", "statement", "account"], "bank_statement"),
+    (["pay", "stub", "payslip", "wage"], "pay_stub"),
+    (["credit", "report", "score"], "credit_report"),
+    (["property", "assessment", "valuation"], "property_assessment"),
+    (["insurance", "policy", "coverage"], "insurance_document"),
+    (["drivers", "license", "licence", "dl"], "drivers_license"),
+    (["passport", "pass"], "passport"),
+    (["birth", "certificate"], "birth_certificate"),
+    (["marriage", "certificate", "wedding"], "marriage_certificate"),
+    (["utility", "bill", "electric", "gas", "water", "phone"], "utility_bill"),
+    (["rental", "lease", "agreement", "rent"], "rental_agreement"),
+    (["immigration", "visa", "green", "card", "prcard"], "immigration_document"),
+    (["financial", "statement", "balance"], "financial_statement"),
+    (["investment", "portfolio", "mutual", "fund"], "investment_statement"),
+]
+_DOCUMENT_TYPE_PATTERNS = [
+    (re.compile("|".join(re.escape(word) for word in words)), document_type)
+    for words, document_type in _DOCUMENT_TYPE_KEYWORDS
+]
+
+# Query answers by (sha256 of file bytes, query text), shared by every TextractService.
+# Retries and re-uploads of the same file skip the S3 upload and the Textract job;
+# "" records a query Textract had no answer for.
+ANSWER_CACHE_MAX_ENTRIES = 1024
+CLASSIFICATION_QUERY = "What is this document?"
+_answer_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+def _get_cached_answer(key: Tuple[str, str]) -> Optional[str]:
+    """Return a cached answer and mark it recently used"""
+    answer = _answer_cache.get(key)
+    if answer is not None:
+        _answer_cache.move_to_end(key)
+    return answer
+
+def _cache_answer(key: Tuple[str, str], answer: str):
+    """Store an answer, evicting the least recently used past the size cap"""
+    _answer_cache[key] = answer
+    _answer_cache.move_to_end(key)
+    if len(_answer_cache) > ANSWER_CACHE_MAX_ENTRIES:
+        _answer_cache.popitem(last=False)
+
+# Textract's synchronous AnalyzeDocument takes the bytes inline (no S3 upload or
+# polling) for single-page documents up to this size
+TEXTRACT_SYNC_MAX_BYTES = 5 * 1024 * 1024
+
+def _is_single_page(file_content: bytes) -> bool:
+    """Whether a file is a one-page PDF or a PNG/JPEG image (TIFFs may hold several pages)"""
+    if file_content.startswith((b"\x89PNG", b"\xff\xd8")):
+        return True
+    if file_content.startswith(b"%PDF"):
+        try:
+            return len(PyPDF2.PdfReader(io.BytesIO(file_content)).pages) == 1
+        except Exception:
+            return False
+    return False
+
+def _query_answers(blocks: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Map each QUERY block's alias (or text) to the text of its first QUERY_RESULT"""
+    results_by_id = {block["Id"]: block for block in blocks if block["BlockType"] == "QUERY_RESULT"}
+    answers = {}
+    for block in blocks:
+        if block["BlockType"] != "QUERY":
+            continue
+        query = block.get("Query", {})
+        alias = query.get("Alias", query.get("Text"))
+        for relationship in block.get("Relationships", []):
+            if relationship["Type"] != "ANSWER":
+                continue
+            for result_id in relationship["Ids"]:
+                if result_id in results_by_id and alias not in answers:
+                    answers[alias] = results_by_id[result_id].get("Text")
+    return answers
+
+# (access key, secret key, region) -> (session, s3, textract, sqs or None). Clients
+# are thread-safe and expensive to build, so every TextractService shares them.
+_aws_clients: Dict[Tuple[str, str, str], Tuple[Any, Any, Any, Any]] = {}
+
+def _get_aws_clients(aws_access_key: str, aws_secret_key: str, region: str) -> Tuple[Any, Any, Any, Any]:
+    """Get the shared boto3 session and S3/Textract/SQS clients, creating them on first use"""
+    key = (aws_access_key, aws_secret_key, region)
+    clients = _aws_clients.get(key)
+    if clients is None:
+        session = boto3.Session(
+            aws_access_key_id=aws_access_key,
+            aws_secret_access_key=aws_secret_key,
+            region_name=region
+        )
+        client_config = Config(
+            max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+            tcp_keepalive=True,
+            retries={"mode": "adaptive", "max_attempts": 5}
+        )
+        clients = (
+            session,
+            session.client('s3', config=client_config),
+            session.client('textract', config=client_config),
+            session.client('sqs', config=client_config) if TEXTRACT_NOTIFICATIONS_ENABLED else None
+        )
+        _aws_clients[key] = clients
+    return clients
+
+# Thread pool for the blocking boto3 calls, shared by every TextractService so the
+# process stays within TEXTRACT_MAX_WORKERS; created on first use
+_executor: Optional[ThreadPoolExecutor] = None
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the shared I/O thread pool, creating it on first use"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=TEXTRACT_MAX_WORKERS,
+            thread_name_prefix="textract"
+        )
+    return _executor
+
+def shutdown_executor():
+    """Release the shared I/O thread pool; call once at application shutdown"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+
+# Textract job id -> future resolved with the job status by the SQS consumer.
+# Shared by all TextractService instances so one consumer serves every waiter.
+_completion_waiters: Dict[str, asyncio.Future] = {}
+_completion_consumer: Optional[asyncio.Task] = None
+
+def _parse_completion_message(body: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Extract (JobId, Status, JobTag) from an SQS message carrying a Textract SNS notification"""
+    try:
+        message = json.loads(body)
+        # SNS wraps the notification unless raw message delivery is enabled
+        if "Message" in message:
+            message = json.loads(message["Message"])
+        return message.get("JobId"), message.get("Status"), message.get("JobTag")
+    except (ValueError, TypeError, AttributeError):
+        return None, None, None
+
 class TextractService:
     """Service for AWS Textract operations"""
     
     def __init__(self):
         try:
-            self.region = os.getenv("AWS_REGION", "us-east-1")
-            self.bucket = os.getenv("AWS_S3_BUCKET")
-            
-            logger.info(f"Initializing TextractService with region: {self.region}, bucket: {self.bucket}")
+            self.region = _AWS_CONFIG.region
+            self.bucket = _AWS_CONFIG.bucket
             
             if not self.bucket:
                 raise Exception("AWS S3 bucket not configured")
             
-            aws_access_key = os.getenv("AWS_ACCESS_KEY_ID")
-            aws_secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
-            
-            if not aws_access_key or not aws_secret_key:
+            if not _AWS_CONFIG.access_key_id or not _AWS_CONFIG.secret_access_key:
                 raise Exception("AWS credentials not configured")
             
-            self.session = boto3.Session(
-                aws_access_key_id=aws_access_key,
-                aws_secret_access_key=aws_secret_key,
-                region_name=self.region
+            self.session, self.s3_client, self.textract_client, self.sqs_client = _get_aws_clients(
+                _AWS_CONFIG.access_key_id, _AWS_CONFIG.secret_access_key, self.region
             )
+            self.transfer_config = TransferConfig(
+                multipart_threshold=S3_MULTIPART_CHUNK_BYTES,
+                multipart_chunksize=S3_MULTIPART_CHUNK_BYTES,
+                max_concurrency=S3_UPLOAD_MAX_CONCURRENCY,
+                use_threads=True
+            )
+            # In-flight background deletes of temporary uploads (kept referenced until done)
+            self._cleanup_tasks = set()
             
-            self.s3_client = self.session.client('s3')
-            self.textract_client = self.session.client('textract')
-            self.executor = None
-            
-            logger.info("TextractService initialized successfully")
+            logger.debug("TextractService initialized for region %s, bucket %s", self.region, self.bucket)
             
         except Exception as e:
             logger.error(f"Failed to initialize TextractService: {str(e)}")
             raise
     
+    async def _run_blocking(self, func, **kwargs):
+        """Run a blocking boto3 call on the shared I/O thread pool"""
+        return await asyncio.get_running_loop().run_in_executor(
+            _get_executor(), functools.partial(func, **kwargs)
+        )
+    
+    def _schedule_s3_cleanup(self, s3_key: str):
+        """Delete a temporary upload in the background"""
+        task = asyncio.create_task(self._delete_s3_object(s3_key))
+        self._cleanup_tasks.add(task)
+        task.add_done_callback(self._cleanup_tasks.discard)
+    
+    async def _delete_s3_object(self, s3_key: str):
+        """Delete an S3 object, logging rather than raising on failure"""
+        try:
+            await self._run_blocking(
+                self.s3_client.delete_object, Bucket=self.bucket, Key=s3_key
+            )
+        except Exception as cleanup_error:
+            logger.warning(f"Failed to cleanup S3 file {s3_key}: {cleanup_error}")
+    
     async def upload_file_to_s3(self, file_content: bytes, file_name: str) -> str:
         """Upload file to S3 and return the S3 key"""
         try:
-            if not self.executor:
-                self.executor = asyncio.get_event_loop().run_in_executor
-            
-            await self.executor(
-                None,
-                lambda: self.s3_client.put_object(
-                    Bucket=self.bucket,
-                    Key=file_name,
-                    Body=file_content
-                )
+            await self._run_blocking(
+                self.s3_client.upload_fileobj,
+                Fileobj=io.BytesIO(file_content),
+                Bucket=self.bucket,
+                Key=file_name,
+                Config=self.transfer_config
             )
             
             logger.info(f"File uploaded to S3: {file_name}")
@@ -72,76 +283,220 @@ class TextractService:
     async def start_document_analysis(self, file_name: str, queries_config: dict) -> str:
         """Start document analysis with Textract"""
         try:
-            if not self.executor:
-                self.executor = asyncio.get_event_loop().run_in_executor
+            logger.debug("Starting Textract analysis of s3://%s/%s with queries %s", self.bucket, file_name, queries_config)
             
-            logger.info(f"=== TEXTRACT SERVICE DEBUG: Starting analysis for {file_name} ===")
-            logger.info(f"=== TEXTRACT SERVICE DEBUG: Queries config: {queries_config} ===")
-            logger.info(f"=== TEXTRACT SERVICE DEBUG: Bucket: {self.bucket} ===")
+            request = {
+                "DocumentLocation": {
+                    'S3Object': {
+                        'Bucket': self.bucket,
+                        'Name': file_name
+                    }
+                },
+                "FeatureTypes": ["QUERIES"],
+                "QueriesConfig": queries_config
+            }
+            if self.sqs_client is not None:
+                request["NotificationChannel"] = {
+                    "SNSTopicArn": TEXTRACT_SNS_TOPIC_ARN,
+                    "RoleArn": TEXTRACT_SNS_ROLE_ARN
+                }
+                request["JobTag"] = TEXTRACT_JOB_TAG
             
-            response = await self.executor(
-                None,
-                lambda: self.textract_client.start_document_analysis(
-                    DocumentLocation={
-                        'S3Object': {
-                            'Bucket': self.bucket,
-                            'Name': file_name
-                        }
-                    },
-                    FeatureTypes=["QUERIES"],
-                    QueriesConfig=queries_config
-                )
+            response = await self._run_blocking(
+                self.textract_client.start_document_analysis, **request
             )
             
-            logger.info(f"=== TEXTRACT SERVICE DEBUG: Analysis started, Job ID: {response['JobId']} ===")
+            logger.info("Textract analysis started for %s: job %s", file_name, response['JobId'])
             return response['JobId']
             
         except ClientError as e:
-            logger.error(f"=== TEXTRACT SERVICE DEBUG: Failed to start document analysis: {str(e)} ===")
+            logger.error("Failed to start document analysis: %s", e)
             raise Exception(f"Failed to start document analysis: {str(e)}")
     
+    async def _wait_for_completion_notification(self, job_id: str, timeout: float):
+        """Wait for the SQS completion notification of a Textract job, up to timeout seconds"""
+        global _completion_consumer
+        
+        waiter = asyncio.get_running_loop().create_future()
+        _completion_waiters[job_id] = waiter
+        if _completion_consumer is None or _completion_consumer.done():
+            _completion_consumer = asyncio.create_task(self._consume_completion_notifications())
+        
+        try:
+            await asyncio.wait_for(waiter, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"No completion notification for Textract job {job_id} after {timeout}s, polling")
+        finally:
+            _completion_waiters.pop(job_id, None)
+    
+    async def _consume_completion_notifications(self):
+        """Long-poll the SQS queue and resolve waiters until none are left"""
+        while _completion_waiters:
+            try:
+                response = await self._run_blocking(
+                    self.sqs_client.receive_message,
+                    QueueUrl=TEXTRACT_SQS_QUEUE_URL,
+                    MaxNumberOfMessages=10,
+                    WaitTimeSeconds=20
+                )
+            except Exception as e:
+                logger.warning(f"Failed to receive Textract notifications: {str(e)}")
+                await asyncio.sleep(TEXTRACT_POLL_MAX_DELAY_SECONDS)
+                continue
+            
+            for message in response.get("Messages", []):
+                job_id, status, job_tag = _parse_completion_message(message["Body"])
+                if job_tag != TEXTRACT_JOB_TAG:
+                    # Another process's job; it becomes visible again after the
+                    # queue's visibility timeout for that process to consume
+                    continue
+                # Ours even without a waiter (it timed out and fell back to polling),
+                # so delete it either way rather than leaving it to redeliver forever
+                waiter = _completion_waiters.get(job_id)
+                if waiter is not None and not waiter.done():
+                    waiter.set_result(status)
+                try:
+                    await self._run_blocking(
+                        self.sqs_client.delete_message,
+                        QueueUrl=TEXTRACT_SQS_QUEUE_URL,
+                        ReceiptHandle=message["ReceiptHandle"]
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to delete Textract notification for job {job_id}: {str(e)}")
+    
+    def _collect_remaining_pages(self, job_id: str, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Follow NextToken and merge every result page's Blocks into the first response (blocking)"""
+        blocks = list(response.get('Blocks', []))
+        next_token = response.get('NextToken')
+        # Each page carries the token for the next one, so pages are fetched in order
+        while next_token:
+            page = self.textract_client.get_document_analysis(JobId=job_id, NextToken=next_token)
+            blocks.extend(page.get('Blocks', []))
+            next_token = page.get('NextToken')
+        
+        response = dict(response, Blocks=blocks)
+        response.pop('NextToken', None)
+        return response
+    
     async def get_document_analysis_results(self, job_id: str, max_wait_time: int = 300) -> Dict[str, Any]:
         """Get document analysis results from Textract"""
         try:
-            if not self.executor:
-                self.executor = asyncio.get_event_loop().run_in_executor
+            loop = asyncio.get_running_loop()
+            start_time = loop.time()
+            poll_delay = TEXTRACT_POLL_INITIAL_DELAY_SECONDS
             
-            logger.info(f"=== TEXTRACT SERVICE DEBUG: Getting results for job {job_id} ===")
-            start_time = asyncio.get_event_loop().time()
+            # Sleep until Textract announces completion; the loop below then fetches
+            # the results in one call (or keeps polling if no notification came)
+            if self.sqs_client is not None:
+                await self._wait_for_completion_notification(
+                    job_id, min(max_wait_time, TEXTRACT_NOTIFICATION_WAIT_SECONDS)
+                )
             
             while True:
-                response = await self.executor(
-                    None,
-                    lambda: self.textract_client.get_document_analysis(JobId=job_id)
+                response = await self._run_blocking(
+                    self.textract_client.get_document_analysis, JobId=job_id
                 )
                 
                 status = response['JobStatus']
-                logger.info(f"=== TEXTRACT SERVICE DEBUG: Job status: {status} ===")
+                logger.debug("Textract job %s status: %s", job_id, status)
                 
                 if status == 'SUCCEEDED':
-                    logger.info(f"=== TEXTRACT SERVICE DEBUG: Analysis succeeded, returning results ===")
-                    logger.info(f"=== TEXTRACT SERVICE DEBUG: Response keys: {list(response.keys())} ===")
-                    if 'Blocks' in response:
-                        logger.info(f"=== TEXTRACT SERVICE DEBUG: Found {len(response['Blocks'])} blocks ===")
+                    if response.get('NextToken'):
+                        response = await self._run_blocking(
+                            self._collect_remaining_pages, job_id=job_id, response=response
+                        )
+                    logger.debug("Textract job %s succeeded with %d blocks", job_id, len(response.get('Blocks', [])))
                     return response
                 elif status == 'FAILED':
                     error_message = response.get('StatusMessage', 'Unknown error')
-                    logger.error(f"=== TEXTRACT SERVICE DEBUG: Analysis failed: {error_message} ===")
+                    logger.error("Textract job %s failed: %s", job_id, error_message)
                     raise Exception(f"Document analysis failed: {error_message}")
                 
                 # Check timeout
-                elapsed_time = asyncio.get_event_loop().time() - start_time
+                elapsed_time = loop.time() - start_time
                 if elapsed_time > max_wait_time:
-                    logger.error(f"=== TEXTRACT SERVICE DEBUG: Analysis timed out after {max_wait_time} seconds ===")
+                    logger.error("Textract job %s timed out after %s seconds", job_id, max_wait_time)
                     raise Exception(f"Document analysis timeout after {max_wait_time} seconds")
                 
-                # Wait before next check
-                await asyncio.sleep(5)
+                # Wait before next check, backing off up to the cap
+                await asyncio.sleep(min(poll_delay, max_wait_time - elapsed_time))
+                poll_delay = min(poll_delay * TEXTRACT_POLL_BACKOFF_FACTOR, TEXTRACT_POLL_MAX_DELAY_SECONDS)
                 
         except ClientError as e:
             logger.error(f"Failed to get document analysis results: {str(e)}")
             raise Exception(f"Failed to get document analysis results: {str(e)}")
     
+    async def analyze_document_multi(
+        self, 
+        file_content: bytes, 
+        filename: str, 
+        queries: List[Dict[str, str]]
+    ) -> Dict[str, Optional[str]]:
+        """
+        Ask several queries of one file with a single upload and Textract job
+        
+        Args:
+            file_content: File content as bytes
+            filename: S3 key to upload the file under
+            queries: Textract queries ({"Text": ..., "Alias": ...}, at most 30, unique aliases)
+            
+        Returns:
+            Dict mapping each query's alias (or text) to its answer, None if unanswered
+        """
+        content_hash = hashlib.sha256(file_content).hexdigest()
+        answers = {}
+        uncached = []
+        for query in queries:
+            cached_answer = _get_cached_answer((content_hash, query["Text"]))
+            if cached_answer is None:
+                uncached.append(query)
+            else:
+                answers[query.get("Alias", query["Text"])] = cached_answer or None
+        
+        if not uncached:
+            return answers
+        
+        results = None
+        # Counting PDF pages parses the whole file, so keep it off the event loop
+        if len(file_content) <= TEXTRACT_SYNC_MAX_BYTES and await self._run_blocking(
+            _is_single_page, file_content=file_content
+        ):
+            try:
+                results = await self._run_blocking(
+                    self.textract_client.analyze_document,
+                    Document={'Bytes': file_content},
+                    FeatureTypes=["QUERIES"],
+                    QueriesConfig={"Queries": uncached}
+                )
+            except ClientError as e:
+                logger.warning(f"Synchronous analysis of {filename} failed, retrying via S3: {str(e)}")
+        
+        if results is None:
+            results = await self._analyze_via_s3(file_content, filename, uncached)
+        
+        found = _query_answers(results.get("Blocks", []))
+        for query in uncached:
+            alias = query.get("Alias", query["Text"])
+            answers[alias] = found.get(alias)
+            _cache_answer((content_hash, query["Text"]), answers[alias] or "")
+        
+        return answers
+    
+    async def _analyze_via_s3(
+        self, 
+        file_content: bytes, 
+        filename: str, 
+        queries: List[Dict[str, str]]
+    ) -> Dict[str, Any]:
+        """Run queries through an asynchronous Textract job on a temporary S3 upload"""
+        s3_key = await self.upload_file_to_s3(file_content, filename)
+        try:
+            job_id = await self.start_document_analysis(s3_key, {"Queries": queries})
+            return await self.get_document_analysis_results(job_id)
+        finally:
+            # Clean up S3 file without holding up the caller
+            self._schedule_s3_cleanup(s3_key)
+    
     async def analyze_document_with_query(
         self, 
         file_content: bytes, 
@@ -150,30 +505,10 @@ class TextractService:
     ) -> str:
         """Analyze document with a single query"""
         try:
-            # Upload file to S3
-            s3_key = await self.upload_file_to_s3(file_content, filename)
-            
-            # Start analysis
-            queries_config = {
-                "Queries": [
-                    {
-                        "Text": query,
-                        "Alias": "document_type"
-                    }
-                ]
-            }
-            
-            job_id = await self.start_document_analysis(s3_key, queries_config)
-            
-            # Get results
-            results = await self.get_document_analysis_results(job_id)
-            
-            # Extract answer
-            for block in results.get("Blocks", []):
-                if block["BlockType"] == "QUERY_RESULT":
-                    return block.get("Text", "Unknown document type")
-            
-            return "Unknown document type"
+            answers = await self.analyze_document_multi(
+                file_content, filename, [{"Text": query, "Alias": "document_type"}]
+            )
+            return answers["document_type"] or "Unknown document type"
             
         except Exception as e:
             logger.error(f"Error analyzing document: {str(e)}")
@@ -186,43 +521,15 @@ class TextractService:
     ) -> Dict[str, Any]:
         """Analyze document to classify its type using Textract"""
         try:
-            # Upload file to S3
-            s3_key = await self.upload_file_to_s3(file_content, filename)
-            
             # Ask Textract "What is this document?"
-            queries_config = {
-                "Queries": [
-                    {
-                        "Text": "What is this document?",
-                        "Alias": "document_type"
-                    }
-                ]
-            }
-            
-            job_id = await self.start_document_analysis(s3_key, queries_config)
-            
-            # Get results
-            results = await self.get_document_analysis_results(job_id)
-            
-            # Extract Textract's answer and map to our document types
-            textract_answer = "generic_document"
-            for block in results.get("Blocks", []):
-                if block["BlockType"] == "QUERY_RESULT":
-                    textract_answer = block.get("Text", "generic_document")
-                    break
+            answers = await self.analyze_document_multi(
+                file_content, filename, [{"Text": CLASSIFICATION_QUERY, "Alias": "document_type"}]
+            )
+            textract_answer = answers["document_type"] or "generic_document"
             
             # Map Textract's answer to our standardized document types
             detected_type = self._map_textract_answer_to_document_type(textract_answer)
             
-            # Clean up S3 file
-            try:
-                await self.executor(
-                    None,
-                    lambda: self.s3_client.delete_object(Bucket=self.bucket, Key=s3_key)
-                )
-            except Exception as cleanup_error:
-                logger.warning(f"Failed to cleanup S3 file {s3_key}: {cleanup_error}")
-            
             return {
                 "success": True,
                 "document_type": detected_type,
@@ -241,40 +548,11 @@ class TextractService:
         """Map Textract's answer to our standardized document types"""
         answer_lower = textract_answer.lower()
         
-        # Map Textract answers to our document types
-        if any(word in answer_lower for word in ["mortgage", "loan", "application"]):
-            return "mortgage_application"
-        elif any(word in answer_lower for word in ["t4", "tax", "income", "remuneration", "statement of remuneration"]):
-            return "t4_form"
-        elif any(word in answer_lower for word in ["employment", "job", "work", "salary", "letter"]):
-            return "employment_letter"
-        elif any(word in answer_lower for word in ["bank", "statement", "account"]) and "remuneration" not in answer_lower:
-            return "bank_statement"
-        elif any(word in answer_lower for word in ["pay", "stub", "payslip", "wage"]):
-            return "pay_stub"
-        elif any(word in answer_lower for word in ["credit", "report", "score"]):
-            return "credit_report"
-        elif any(word in answer_lower for word in ["property", "assessment", "valuation"]):
-            return "property_assessment"
-        elif any(word in answer_lower for word in ["insurance", "policy", "coverage"]):
-            return "insurance_document"
-        elif any(word in answer_lower for word in ["drivers", "license", "licence", "dl"]):
-            return "drivers_license"
-        elif any(word in answer_lower for word in ["passport", "pass"]):
-            return "passport"
-        elif any(word in answer_lower for word in ["birth", "certificate"]):
-            return "birth_certificate"
-        elif any(word in answer_lower for word in ["marriage", "certificate", "wedding"]):
-            return "marriage_certificate"
-        elif any(word in answer_lower for word in ["utility", "bill", "electric", "gas", "water", "phone"]):
-            return "utility_bill"
-        elif any(word in answer_lower for word in ["rental", "lease", "agreement", "rent"]):
-            return "rental_agreement"
-        elif any(word in answer_lower for word in ["immigration", "visa", "green", "card", "prcard"]):
-            return "immigration_document"
-        elif any(word in answer_lower for word in ["financial", "statement", "balance"]):
-            return "financial_statement"
-        elif any(word in answer_lower for word in ["investment", "portfolio", "mutual", "fund"]):
-            return "investment_statement"
-        else:
-            return "generic_document"
+        for pattern, document_type in _DOCUMENT_TYPE_PATTERNS:
+            if not pattern.search(answer_lower):
+                continue
+            if document_type == "bank_statement" and "remuneration" in answer_lower:
+                continue
+            return document_type
+        
+        return "generic_document"
\ No newline at end of file
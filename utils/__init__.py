@@ -3,8 +3,12 @@ Utility modules for the document processing system
 """
 
 from .logger import get_logger, setup_logging
+from .request_cache import clear_request_cache, request_cache_scope, request_cached
 
 __all__ = [
     "get_logger",
-    "setup_logging"
+    "setup_logging",
+    "clear_request_cache",
+    "request_cache_scope",
+    "request_cached"
 ]
@@ -0,0 +1,41 @@
+"""
+Request-scoped memoization for repeated database reads
+"""
+
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+# Results cached for the current request or job; None outside a scope (no caching)
+_request_cache: ContextVar[Optional[Dict[Any, Any]]] = ContextVar("request_cache", default=None)
+
+@contextmanager
+def request_cache_scope():
+    """Cache request_cached reads until the block exits (one API request or background job)"""
+    token = _request_cache.set({})
+    try:
+        yield
+    finally:
+        _request_cache.reset(token)
+
+def clear_request_cache() -> None:
+    """Drop every result cached in the current scope (called after writes)"""
+    cache = _request_cache.get()
+    if cache:
+        cache.clear()
+
+def request_cached(func: Callable) -> Callable:
+    """Memoize an async method on its arguments for the rest of the current scope"""
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        cache = _request_cache.get()
+        if cache is None:
+            return await func(self, *args, **kwargs)
+
+        key = (func.__qualname__, args, tuple(sorted(kwargs.items())))
+        if key not in cache:
+            cache[key] = await func(self, *args, **kwargs)
+        return cache[key]
+
+    return wrapper